@@ -1,11 +1,25 @@
+import time
+import asyncio
 import aiohttp
 import requests
 
 from dataclasses import dataclass, field
-from typing import Optional, TypeVar, Generic
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Optional, TypeVar, Generic, cast
 from datetime import datetime, timedelta
 
+from .Utils.http import HttpResponse, RequestLimiter
+from .Utils.http_cache import CacheMode, ResponseCache
+from .Utils.html_backends import HtmlBackend, get_html_backend
+from .Utils.progress import ProgressTracker
+from .Utils.metrics import ScraperMetrics
+from .Utils.request_timing import create_traced_session
+from .Utils.fixture_archive import FixtureArchive, rewrite_base_url
+from .Utils import parallel
+
 T= TypeVar("T")
+U = TypeVar("U")
+V = TypeVar("V")
 
 @dataclass
 class ItemPair(Generic[T]) :
@@ -16,15 +30,121 @@ class ItemPair(Generic[T]) :
 class BaseScraper(Generic[T]) :
     async_client : Optional[aiohttp.client.ClientSession] = None
     request_client : Optional[requests.Session] = None
-    treated_item : int = 0
+
+    # Counts treated items (scraped or rejected), whichever thread or task treats them. Progress reporting waits on it.
+    progress : ProgressTracker
+
+    # Treated/failed items, parsing warnings, downloaded bytes and time spent per phase (fetch, parse, ...). Reset along with the scraper.
+    metrics : ScraperMetrics
+
+    # Every http request made by scrapers goes through this limiter. Share the same instance across scrapers
+    # so that they all draw from the same budget.
+    limiter : RequestLimiter
+
+    # Optional on-disk cache sitting in front of both http clients
+    response_cache : Optional[ResponseCache] = None
+
+    # Called with every successfully scraped item as soon as it's complete (e.g. to stream it to disk, or checkpoint it).
+    # Might be called from several threads at once.
+    item_scraped_callbacks : list[Callable[[T], None]]
+
+    # When set (usually a ProcessPoolExecutor), html parsing is offloaded to this executor instead of running
+    # on the thread (or event loop) that performed the request.
+    parse_executor : Optional[Executor] = None
+
+    # Html parser used to read pages, see Utils/html_backends.py. All backends yield the same items.
+    html_backend : HtmlBackend = get_html_backend()
+
+    # Maximum number of concurrent requests issued on behalf of a single item (api calls, redirection probes, ...),
+    # see fetch_many(). Shared limiter still applies on top of it.
+    max_requests_per_item : int = 4
+
+    # When set, every response fetched (or read from the cache) is recorded, to be replayed later (see Benchmarks/replay_server.py)
+    recorder : Optional[FixtureArchive] = None
+
+    # When set (scheme://host:port), requests are sent there instead of the site itself, e.g. to a replay server.
+    # Responses keep the original urls.
+    base_url_override : Optional[str] = None
+
+    # Thread pools of the threads flavor, created on first use and reused by every following scrap() : one runs items,
+    # the other one runs their secondary requests (see map_per_item()). Kept apart so that items waiting on their
+    # secondary requests can't starve the pool those requests need. Call shutdown() once done with the scraper.
+    item_executor : Optional[ThreadPoolExecutor] = None
+    request_executor : Optional[ThreadPoolExecutor] = None
+    num_threads : int = 1
 
     def __init__(self, async_client : Optional[aiohttp.client.ClientSession],
-                       request_client : Optional[requests.Session]) -> None:
+                       request_client : Optional[requests.Session],
+                       limiter : Optional[RequestLimiter] = None,
+                       response_cache : Optional[ResponseCache] = None) -> None:
         self.async_client = async_client
         self.request_client = request_client
+        self.limiter = limiter if limiter != None else RequestLimiter()
+        self.response_cache = response_cache
+        self.item_scraped_callbacks = []
+        self.progress = ProgressTracker()
+        self.metrics = ScraperMetrics()
 
     def reset(self) :
-        self.treated_item = 0
+        self.progress.reset(self.progress.total)
+        self.metrics = ScraperMetrics()
+
+    def get_item_executor(self, num_threads : int) -> ThreadPoolExecutor :
+        """Bounded pool of num_threads threads running items, reused as long as the number of threads doesn't change."""
+        if self.item_executor == None or self.num_threads != num_threads :
+            self.shutdown()
+            self.num_threads = num_threads
+            self.item_executor = ThreadPoolExecutor(max_workers=num_threads, thread_name_prefix=f"{type(self).__name__}-item")
+            # Created right away, item threads would otherwise race to create it
+            self.get_request_executor()
+        return self.item_executor
+
+    def get_request_executor(self) -> ThreadPoolExecutor :
+        # Enough threads for every item thread to have max_requests_per_item requests in flight
+        if self.request_executor == None :
+            self.request_executor = ThreadPoolExecutor(max_workers=self.num_threads * max(1, self.max_requests_per_item),
+                                                       thread_name_prefix=f"{type(self).__name__}-request")
+        return self.request_executor
+
+    def scrap_links_threaded(self, links : list[str], out_error_item_list : list[T], out_item_list : list[T], num_threads : int) -> None :
+        """Runs scrap_single() on every link with the reusable item pool. Links are handed out one at a time as threads free up,
+           so a few slow pages can't hold the others back, and items are streamed out (item_scraped_callbacks) as soon as they complete."""
+        executor = self.get_item_executor(num_threads)
+        # A few more pending links than threads, so that a thread never waits for the next link to be submitted
+        completed = parallel.iter_completed(executor, links, lambda link : self.scrap_single(link, out_error_item_list, out_item_list), num_threads * 2)
+        for link, future in completed :
+            if future.exception() != None :
+                print(f"Caught exception while scraping {link} : {future.exception()}")
+
+    def create_async_session(self) -> aiohttp.ClientSession :
+        """Session recording per request timings (dns, connect, ttfb) into the metrics of the scraper issuing each request."""
+        return create_traced_session()
+
+    def parse_section(self, name : str, function : Callable[..., bool], *args : Any) -> bool :
+        """Runs a page section parser, timing it as the parse.<name> phase."""
+        with self.metrics.time(f"parse.{name}") :
+            return function(*args)
+
+    def shutdown(self) -> None :
+        """Stops the thread pools, they are created again if needed."""
+        for executor in [self.item_executor, self.request_executor] :
+            if executor != None :
+                executor.shutdown()
+        self.item_executor = None
+        self.request_executor = None
+
+    @property
+    def treated_item(self) -> int :
+        return self.progress.get()
+
+    def mark_treated(self, failed : bool = False, warnings : int = 0) -> None :
+        """To be called once per item, whether it's rejected (failed) or scraped (possibly with some parsing warnings)."""
+        self.metrics.add("treated")
+        if failed :
+            self.metrics.add("failed")
+        if warnings > 0 :
+            self.metrics.add("warnings", warnings)
+        self.progress.advance()
 
     def scrap(self, links : list[str], num_threads : int = -1) -> bool:
         return False
@@ -47,6 +167,114 @@ class BaseScraper(Generic[T]) :
            * out_item_list : list of item that could be parsed. Check for the internal error list to see non-critical parsing warnings"""
         return
 
+    def scrap_single(self, link : str, out_error_item_list : list[T], out_item_list : list[T]) -> None :
+        """Scraps a single link (threads flavor), used by the work queue consumers.
+           Populates the same output lists as atomic_scrap."""
+        return
+
+    async def scrap_single_async(self, link : str, out_error_item_list : list[T], out_item_list : list[T]) -> None :
+        """Scraps a single link (asyncio flavor), used by the work queue consumers.
+           Populates the same output lists as atomic_scrap_async."""
+        return
+
+    def fetch(self, url : str, allow_redirects : bool = True) -> HttpResponse :
+        """Performs a GET request using the synchronous client, throttled by the shared limiter.
+           If a response cache is set, cached responses are revalidated using conditional GETs."""
+        cached : Optional[HttpResponse] = None
+        if self.response_cache :
+            cached = self.response_cache.load(url, allow_redirects)
+            if cached != None and self.response_cache.mode == CacheMode.ReadOnly :
+                return self.record(cached, allow_redirects)
+
+        headers = self.response_cache.get_conditional_headers(cached) if self.response_cache else {}
+        with self.metrics.time("fetch"), self.limiter.limit(url) :
+            request_start = time.perf_counter()
+            response = self.request_client.get(rewrite_base_url(url, self.base_url_override), allow_redirects=allow_redirects, headers=headers) #type: ignore
+            request_duration = time.perf_counter() - request_start
+            http_response = HttpResponse(url=url,
+                                         status=response.status_code,
+                                         headers=dict(response.headers),
+                                         content=response.content)
+        # Body is read by get() : whatever comes after the headers is body transfer
+        ttfb = response.elapsed.total_seconds()
+        self.metrics.add_time("request.ttfb", ttfb)
+        self.metrics.add_time("request.body", max(0, request_duration - ttfb))
+        self.metrics.add("requests")
+        self.metrics.add("bytes", len(http_response.content))
+
+        if self.response_cache :
+            http_response = self.response_cache.update(http_response, cached, allow_redirects)
+        return self.record(http_response, allow_redirects)
+
+    async def fetch_async(self, url : str, allow_redirects : bool = True) -> HttpResponse :
+        """Performs a GET request using the asynchronous client, throttled by the shared limiter.
+           Body is read while still holding the limiter so that in-flight accounting covers the whole transfer.
+           Cache disk accesses are pushed to a worker thread so that they don't stall the event loop."""
+        cached : Optional[HttpResponse] = None
+        if self.response_cache :
+            cached = await asyncio.to_thread(self.response_cache.load, url, allow_redirects)
+            if cached != None and self.response_cache.mode == CacheMode.ReadOnly :
+                return self.record(cached, allow_redirects)
+
+        headers = self.response_cache.get_conditional_headers(cached) if self.response_cache else {}
+        with self.metrics.time("fetch") :
+            async with self.limiter.limit_async(url) :
+                # Connection level timings are recorded by the session's trace config, if any (see create_async_session())
+                async with self.async_client.get(rewrite_base_url(url, self.base_url_override), allow_redirects=allow_redirects, headers=headers, #type: ignore
+                                                 trace_request_ctx=self.metrics) as response :
+                    with self.metrics.time("request.body") :
+                        content = await response.read()
+                    http_response = HttpResponse(url=url,
+                                                 status=response.status,
+                                                 headers=dict(response.headers),
+                                                 content=content)
+        self.metrics.add("requests")
+        self.metrics.add("bytes", len(http_response.content))
+
+        if self.response_cache :
+            http_response = await asyncio.to_thread(self.response_cache.update, http_response, cached, allow_redirects)
+        return self.record(http_response, allow_redirects)
+
+    def record(self, response : HttpResponse, allow_redirects : bool) -> HttpResponse :
+        if self.recorder != None :
+            self.recorder.record(response, allow_redirects)
+        return response
+
+    def map_per_item(self, function : Callable[[U], V], inputs : list[U]) -> list[V] :
+        """Runs function on all inputs concurrently (threads flavor), with at most max_requests_per_item calls at once.
+           Meant for the secondary requests of a single item. Results are returned in the same order as inputs."""
+        num_workers = min(max(1, self.max_requests_per_item), len(inputs))
+        if num_workers <= 1 :
+            return [function(x) for x in inputs]
+
+        # Runs on the shared request pool instead of spawning threads for every item
+        results : list[Optional[V]] = [None] * len(inputs)
+        for index, future in parallel.iter_completed(self.get_request_executor(), range(0, len(inputs)), lambda i : function(inputs[i]), num_workers) :
+            results[index] = future.result()
+        return cast(list[V], results)
+
+    async def map_per_item_async(self, function : Callable[[U], Awaitable[V]], inputs : list[U]) -> list[V] :
+        """Asyncio flavor of map_per_item()."""
+        semaphore = asyncio.Semaphore(max(1, self.max_requests_per_item))
+
+        async def bounded_call(input : U) -> V :
+            async with semaphore :
+                return await function(input)
+
+        return await asyncio.gather(*[bounded_call(x) for x in inputs])
+
+    def fetch_many(self, urls : list[str], allow_redirects : bool = True) -> list[HttpResponse] :
+        """Fetches all urls concurrently (threads flavor), see map_per_item(). Responses are returned in the same order as urls."""
+        return self.map_per_item(lambda url : self.fetch(url, allow_redirects), urls)
+
+    async def fetch_many_async(self, urls : list[str], allow_redirects : bool = True) -> list[HttpResponse] :
+        """Fetches all urls concurrently (asyncio flavor), see map_per_item_async(). Responses are returned in the same order as urls."""
+        return await self.map_per_item_async(lambda url : self.fetch_async(url, allow_redirects), urls)
+
+    def notify_item_scraped(self, item : T) -> None :
+        for callback in self.item_scraped_callbacks :
+            callback(item)
+
     def get_time(self) -> datetime :
         return datetime.now()
 
@@ -0,0 +1,239 @@
+import io
+import sys
+import json
+import math
+import time
+import asyncio
+import argparse
+import tempfile
+import contextlib
+import multiprocessing
+from pathlib import Path
+from threading import Thread
+from dataclasses import dataclass
+from typing import Any, Iterator, Optional
+from concurrent.futures import ProcessPoolExecutor
+
+try :
+    import resource
+except ImportError :
+    # Not available on Windows, peak RSS is reported as 0 there
+    resource = None #type: ignore
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from ..Main import scrap_hops, scrap_yeasts
+from ..HopScraper import HopScraper
+from ..YeastScraper import YeastScraper
+from ..Utils.directories import Directories
+from ..Utils.html_backends import HTML_BACKENDS, get_html_backend
+from .replay_server import ReplayServer
+from .synthetic_pages import get_hop_link, get_yeast_link, make_synthetic_archive
+
+# End to end crawl benchmark : runs the whole scrap_hops / scrap_yeasts pipeline against a local replay server (synthetic site),
+# sweeping the number of jobs, threads vs async and the html backend. Each configuration runs in a fresh process,
+# so that its peak RSS and CPU time are its own (the replay server runs in this process, its CPU time isn't counted).
+# Results can be saved as a baseline, later runs fail (exit code 1) when they regress beyond a threshold.
+# Small runs are noisier : the threshold widens below REFERENCE_SAMPLE_ITEMS scraped items, and never goes below the spread
+# observed between the repeated runs of a configuration.
+# Run with : python -m Sources.Benchmarks.bench_crawl --save-baseline
+#      then : python -m Sources.Benchmarks.bench_crawl
+# Figures are machine dependent : only compare against a baseline recorded on the same machine, with the same settings.
+
+DEFAULT_BASELINE_FILEPATH = Directories.CACHE_DIR.joinpath("benchmarks", "crawl_baseline.json")
+# Scraped items (hops + yeasts) per run the threshold is meant for, i.e. the default -n 100
+REFERENCE_SAMPLE_ITEMS = 200
+
+
+@dataclass
+class CrawlConfig :
+    mode : str
+    html_backend : str
+    num_jobs : int
+
+    def get_key(self) -> str :
+        return f"{self.mode}/{self.html_backend}/j{self.num_jobs}"
+
+
+@contextlib.contextmanager
+def serve_in_background(server : ReplayServer) -> Iterator[str] :
+    """Runs the replay server on its own event loop thread, yields its base url."""
+    loop = asyncio.new_event_loop()
+    thread = Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    try :
+        yield asyncio.run_coroutine_threadsafe(server.start(), loop).result()
+    finally :
+        asyncio.run_coroutine_threadsafe(server.stop(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+
+def get_peak_rss_mb() -> float :
+    if resource == None :
+        return 0
+    # Kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def run_configuration(base_url : str, config : CrawlConfig, num_items : int) -> dict[str, Any] :
+    """Scraps num_items hops and as many yeasts from base_url, the way Main.py does. Scraping output is silenced.
+       Extracted files go to a temporary directory."""
+    hop_links = [get_hop_link(i) for i in range(0, num_items)]
+    yeast_links = [get_yeast_link(i) for i in range(0, num_items)]
+    use_threads = config.mode == "threads"
+
+    extracted_dir = Directories.EXTRACTED_DIR
+    with tempfile.TemporaryDirectory() as tmp_dir, contextlib.redirect_stdout(io.StringIO()) :
+        Directories.EXTRACTED_DIR = Path(tmp_dir)
+        try :
+            session = requests.Session()
+            session.mount("http://", HTTPAdapter(pool_maxsize=max(10, config.num_jobs)))
+            hop_scraper = HopScraper(request_client=session)
+            yeast_scraper = YeastScraper(request_client=session)
+            for scraper in [hop_scraper, yeast_scraper] :
+                scraper.html_backend = get_html_backend(config.html_backend)
+                scraper.base_url_override = base_url
+
+            cpu_start = time.process_time()
+            start = time.perf_counter()
+            hops = scrap_hops(hop_links, hop_scraper, use_threads, config.num_jobs, force=True)
+            yeast_scraper.async_client = hop_scraper.async_client
+            yeasts = scrap_yeasts(yeast_links, yeast_scraper, use_threads, config.num_jobs, force=True)
+            duration = time.perf_counter() - start
+            cpu_time = time.process_time() - cpu_start
+
+            hop_scraper.shutdown()
+            yeast_scraper.shutdown()
+        finally :
+            Directories.EXTRACTED_DIR = extracted_dir
+
+    num_scraped = len(hops) + len(yeasts)
+    return {
+        "items" : num_scraped,
+        "failed" : len(hop_scraper.error_items) + len(yeast_scraper.error_items),
+        "seconds" : duration,
+        "itemsPerSecond" : num_scraped / duration,
+        "cpuSeconds" : cpu_time,
+        "peakRssMb" : get_peak_rss_mb()
+    }
+
+def run_isolated(base_url : str, config : CrawlConfig, num_items : int) -> dict[str, Any] :
+    """run_configuration, in a fresh process."""
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as executor :
+        return executor.submit(run_configuration, base_url, config, num_items).result()
+
+def keep_best(runs : list[dict[str, Any]]) -> dict[str, Any] :
+    """Best figures of repeated runs of a configuration, to dampen machine noise. Each figure is taken on its own.
+       noise is the relative spread of throughput and CPU time between the runs (0.1 : worst run is 10% off the best one)."""
+    throughputs = [x["itemsPerSecond"] for x in runs]
+    cpu_times = [x["cpuSeconds"] for x in runs]
+    return {
+        "items" : min(x["items"] for x in runs),
+        "failed" : max(x["failed"] for x in runs),
+        "seconds" : min(x["seconds"] for x in runs),
+        "itemsPerSecond" : max(throughputs),
+        "cpuSeconds" : min(cpu_times),
+        "peakRssMb" : min(x["peakRssMb"] for x in runs),
+        "noise" : max(1 - min(throughputs) / max(max(throughputs), 1e-9), max(cpu_times) / max(min(cpu_times), 1e-9) - 1)
+    }
+
+def get_tolerance(threshold : float, items : int, noise : float = 0) -> float :
+    """Tolerated regression for runs of that many items : threshold grows as 1 / sqrt(items) below REFERENCE_SAMPLE_ITEMS,
+       and is at least the noise observed between repeated runs."""
+    return max(threshold * math.sqrt(max(1, REFERENCE_SAMPLE_ITEMS / max(1, items))), noise)
+
+def compare_to_baseline(runs : dict[str, dict[str, Any]], baseline_runs : dict[str, dict[str, Any]], threshold : float) -> list[str] :
+    """Regressions of runs against the baseline, beyond threshold (0.2 : 20%) : fewer items scraped, lower throughput,
+       more CPU time per item, higher peak RSS.
+       Throughput and CPU time are compared with the tolerance of the smaller sample and of the noisier side, see get_tolerance().
+       Configurations missing from either side are ignored."""
+    regressions : list[str] = []
+    for key, run in runs.items() :
+        reference = baseline_runs.get(key)
+        if reference == None :
+            continue
+
+        if run["items"] < reference["items"] :
+            regressions.append(f"{key} : {run['items']} items scraped, baseline is {reference['items']}")
+
+        # Baselines recorded before noise was measured don't have it
+        tolerance = get_tolerance(threshold, min(run["items"], reference["items"]), max(run.get("noise", 0), reference.get("noise", 0)))
+        if run["itemsPerSecond"] < reference["itemsPerSecond"] * (1 - tolerance) :
+            regressions.append(f"{key} : {run['itemsPerSecond']:.1f} items/s, baseline is {reference['itemsPerSecond']:.1f} (tolerance {tolerance * 100:.0f}%)")
+
+        cpu_per_item = run["cpuSeconds"] / max(1, run["items"])
+        reference_cpu_per_item = reference["cpuSeconds"] / max(1, reference["items"])
+        if cpu_per_item > reference_cpu_per_item * (1 + tolerance) :
+            regressions.append(f"{key} : {cpu_per_item * 1000:.2f} ms CPU per item, baseline is {reference_cpu_per_item * 1000:.2f} (tolerance {tolerance * 100:.0f}%)")
+
+        # Not available everywhere
+        if reference["peakRssMb"] > 0 and run["peakRssMb"] > reference["peakRssMb"] * (1 + threshold) :
+            regressions.append(f"{key} : {run['peakRssMb']:.1f} MB peak RSS, baseline is {reference['peakRssMb']:.1f}")
+    return regressions
+
+def main(args : list[str]) -> int :
+    parser = argparse.ArgumentParser(description="End to end crawl benchmark against a local replay server.")
+    parser.add_argument("-n", "--items", type=int, default=100, help="Number of hops (and of yeasts) to scrap per configuration")
+    parser.add_argument("-j", "--jobs", type=int, nargs="*", default=[1, 8, 32], help="Numbers of threads/tasks to sweep")
+    parser.add_argument("-m", "--modes", nargs="*", default=["threads", "async"], help="Modes to sweep")
+    parser.add_argument("-b", "--backends", nargs="*", default=list(HTML_BACKENDS.keys()), help="Html backends to sweep")
+    parser.add_argument("-r", "--repeat", type=int, default=3, help="Number of runs per configuration, best figures are kept")
+    parser.add_argument("--latency", type=float, default=0.02, help="Replay server latency, in seconds")
+    parser.add_argument("--jitter", type=float, default=0.01, help="Replay server latency jitter, in seconds")
+    parser.add_argument("--baseline", type=str, default=str(DEFAULT_BASELINE_FILEPATH), help="Baseline file")
+    parser.add_argument("--save-baseline", action="store_true", help="Saves results as the new baseline instead of comparing against it")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Tolerated regression against the baseline (0.2 : 20%%), "
+                                                                     f"widened for runs of less than {REFERENCE_SAMPLE_ITEMS // 2} hops and yeasts and by the noise between repeated runs")
+    params = parser.parse_args(args[1:])
+
+    settings = {"items" : params.items, "repeat" : params.repeat, "latency" : params.latency, "jitter" : params.jitter}
+    configs = [CrawlConfig(mode, backend, jobs) for mode in params.modes for backend in params.backends for jobs in params.jobs]
+
+    runs : dict[str, dict[str, Any]] = {}
+    with tempfile.TemporaryDirectory() as tmp_dir :
+        archive = make_synthetic_archive(Path(tmp_dir).joinpath("synthetic.zip"), params.items, params.items)
+        server = ReplayServer(archive, params.latency, params.jitter, seed=0)
+        with serve_in_background(server) as base_url :
+            print(f"{params.items} hops and {params.items} yeasts per run, best of {params.repeat} runs, latency = {params.latency}s +/- {params.jitter}s")
+            print(f"{'configuration':<32}{'items/s':>10}{'time (s)':>10}{'CPU (s)':>10}{'RSS (MB)':>10}{'failed':>8}")
+            for config in configs :
+                try :
+                    run = keep_best([run_isolated(base_url, config, params.items) for _ in range(0, params.repeat)])
+                except ImportError as e :
+                    print(f"{config.get_key():<32}  skipped : {e}")
+                    continue
+                runs[config.get_key()] = run
+                print(f"{config.get_key():<32}{run['itemsPerSecond']:>10.1f}{run['seconds']:>10.2f}{run['cpuSeconds']:>10.2f}"
+                      f"{run['peakRssMb']:>10.1f}{run['failed']:>8}")
+
+    baseline_filepath = Path(params.baseline)
+    if params.save_baseline :
+        baseline_filepath.parent.mkdir(parents=True, exist_ok=True)
+        with open(baseline_filepath, "w") as file :
+            json.dump({"settings" : settings, "runs" : runs}, file, indent=4)
+        print(f"Baseline saved to {baseline_filepath}")
+        return 0
+
+    if not baseline_filepath.exists() :
+        print(f"No baseline at {baseline_filepath}, run with --save-baseline first.")
+        return 0
+
+    with open(baseline_filepath, "r") as file :
+        baseline : Optional[dict[str, Any]] = json.load(file)
+    if baseline == None or baseline["settings"] != settings :
+        print(f"Baseline was recorded with other settings ({baseline['settings'] if baseline else None}), not comparing.")
+        return 0
+
+    regressions = compare_to_baseline(runs, baseline["runs"], params.threshold)
+    if len(regressions) > 0 :
+        print(f"/!\\ Regressions beyond tolerance ({params.threshold * 100:.0f}% threshold, widened for small or noisy runs) against {baseline_filepath} :")
+        for regression in regressions :
+            print(f"  {regression}")
+        return 1
+
+    print(f"No regression beyond tolerance ({params.threshold * 100:.0f}% threshold, widened for small or noisy runs) against {baseline_filepath}.")
+    return 0
+
+if __name__ == "__main__" :
+    exit(main(sys.argv))
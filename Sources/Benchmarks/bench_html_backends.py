@@ -0,0 +1,64 @@
+import sys
+import time
+import argparse
+from typing import Callable
+
+from ..HopScraper import HopScraper
+from ..YeastScraper import YeastScraper
+from ..Models.Hop import Hop
+from ..Models.Yeast import Yeast
+from ..Utils.html_backends import HTML_BACKENDS, get_html_backend
+from .synthetic_pages import make_hop_page, make_yeast_page
+
+# Single threaded parse throughput of each html backend, on synthetic beermaverick-like pages.
+# Timings cover the whole parse : building the document and extracting the Hop/Yeast out of it.
+# Run with : python -m Sources.Benchmarks.bench_html_backends
+
+def parse_hops(backend_name : str, pages : list[bytes]) -> None :
+    scraper = HopScraper()
+    scraper.html_backend = get_html_backend(backend_name)
+    for content in pages :
+        scraper.parse_page(Hop(link="https://beermaverick.com/hop/hop/"), content)
+
+def parse_yeasts(backend_name : str, pages : list[bytes]) -> None :
+    scraper = YeastScraper()
+    scraper.html_backend = get_html_backend(backend_name)
+    for content in pages :
+        scraper.parse_page(Yeast(link="https://beermaverick.com/yeast/yeast/"), content, [])
+
+def measure(parse : Callable[[str, list[bytes]], None], backend_name : str, pages : list[bytes], repeat : int) -> float :
+    """Best of repeat runs, in seconds."""
+    best = float("inf")
+    for _ in range(0, repeat) :
+        start = time.perf_counter()
+        parse(backend_name, pages)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main(args : list[str]) -> int :
+    parser = argparse.ArgumentParser(description="Html backends parse throughput benchmark.")
+    parser.add_argument("-n", "--pages", type=int, default=200, help="Number of synthetic pages per category")
+    parser.add_argument("-r", "--repeat", type=int, default=3, help="Number of runs per backend, best one is kept")
+    parser.add_argument("-b", "--backends", nargs="*", default=list(HTML_BACKENDS.keys()), help="Backends to benchmark")
+    params = parser.parse_args(args[1:])
+
+    categories : list[tuple[str, Callable[[str, list[bytes]], None], list[bytes]]] = [
+        ("hops", parse_hops, [make_hop_page(i).encode() for i in range(0, params.pages)]),
+        ("yeasts", parse_yeasts, [make_yeast_page(i).encode() for i in range(0, params.pages)])
+    ]
+
+    print(f"{params.pages} pages per category, best of {params.repeat} runs")
+    print(f"{'backend':<14}{'category':<10}{'time (s)':>10}{'pages/s':>10}")
+    for backend_name in params.backends :
+        for category, parse, pages in categories :
+            try :
+                duration = measure(parse, backend_name, pages, params.repeat)
+            except ImportError as e :
+                print(f"{backend_name:<14}{category:<10}  skipped : {e}")
+                break
+            print(f"{backend_name:<14}{category:<10}{duration:>10.2f}{len(pages) / duration:>10.1f}")
+
+    return 0
+
+if __name__ == "__main__" :
+    exit(main(sys.argv))
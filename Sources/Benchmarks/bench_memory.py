@@ -0,0 +1,62 @@
+import gc
+import sys
+import json
+import argparse
+import tracemalloc
+from typing import Any, Callable, Type
+
+from ..Models.Hop import Hop
+from ..Models.Yeast import Yeast
+from ..Models.Ranges import NumericRange
+from ..Models.Jsonable import Jsonable
+from .bench_serialization import make_from_json_all, to_json_all
+from .synthetic_items import make_hop, make_yeast
+
+# Resident footprint of loaded catalogues : full catalogues stay in memory during post-processing and upload.
+# Items are loaded from json contents, the way cache loads do. Contents stay alive meanwhile, so strings are shared
+# between contents and items and what's measured is the overhead of the model objects themselves :
+# * bytes/item : memory allocated for the loaded items (tracemalloc), list included
+# * objects/item : objects tracked by the garbage collector (class instances, their __dict__, lists, ...), which is what the collector walks
+# Run with : python -m Sources.Benchmarks.bench_memory -n 100000
+
+
+def measure_footprint(item_type : Type[Jsonable], contents : list[dict[str, Any]]) -> tuple[float, float] :
+    """Bytes and gc tracked objects per item, for items loaded from contents."""
+    from_json_all = make_from_json_all(item_type)
+    gc.collect()
+    num_objects = len(gc.get_objects())
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    items = from_json_all(contents)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    gc.collect()
+    # The list of items itself, and the list returned by gc.get_objects()
+    num_objects = len(gc.get_objects()) - num_objects - 2
+    count = len(items)
+    del items
+    return (current - before) / count, num_objects / count
+
+def main(args : list[str]) -> int :
+    parser = argparse.ArgumentParser(description="Resident memory footprint of loaded models.")
+    parser.add_argument("-n", "--items", type=int, default=100000, help="Number of items to load")
+    params = parser.parse_args(args[1:])
+
+    builders : list[tuple[str, Type[Jsonable], Callable[[int], Jsonable]]] = [
+        ("hops", Hop, make_hop),
+        ("yeasts", Yeast, make_yeast),
+        ("ranges", NumericRange, lambda i : NumericRange(i / 10, i / 10 + 2.5))
+    ]
+
+    print(f"{params.items} items per model")
+    print(f"{'model':<8}{'bytes/item':>12}{'objects/item':>14}")
+    for kind, item_type, build in builders :
+        contents = json.loads(json.dumps(to_json_all([build(i) for i in range(0, params.items)])))
+        bytes_per_item, objects_per_item = measure_footprint(item_type, contents)
+        print(f"{kind:<8}{bytes_per_item:>12.0f}{objects_per_item:>14.1f}")
+        del contents
+
+    return 0
+
+if __name__ == "__main__" :
+    exit(main(sys.argv))
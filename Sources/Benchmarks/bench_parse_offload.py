@@ -0,0 +1,66 @@
+import os
+import sys
+import time
+import asyncio
+import argparse
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Optional
+
+from ..HopScraper import HopScraper
+from ..Models.Hop import Hop
+from ..Utils import parallel
+from .synthetic_pages import make_hop_page
+
+# Compares the current single event loop design (fetch and parse on the loop thread) against the pipeline mode
+# where fetching stays asynchronous and parsing is offloaded to a process pool.
+# Network is emulated with asyncio.sleep, pages are synthetic beermaverick-like hop pages.
+# Run with : python -m Sources.Benchmarks.bench_parse_offload
+
+async def crawl(pages : list[bytes], num_tasks : int, latency : float, executor : Optional[Executor]) -> float :
+    scraper = HopScraper()
+    scraper.parse_executor = executor
+    items = list(enumerate(pages))
+
+    async def worker(item : tuple[int, bytes]) :
+        index, content = item
+        # Emulated network round trip
+        await asyncio.sleep(latency)
+        hop = Hop(link=f"https://beermaverick.com/hop/hop-{index}/")
+        await scraper.parse_page_async(hop, content)
+
+    start = time.perf_counter()
+    await parallel.consume_queue_async(items, worker, num_tasks)
+    return time.perf_counter() - start
+
+def main(args : list[str]) -> int :
+    parser = argparse.ArgumentParser(description="Inline parsing vs process pool parsing throughput benchmark.")
+    parser.add_argument("-n", "--pages", type=int, default=300, help="Number of synthetic pages")
+    parser.add_argument("-j", "--jobs", type=int, default=40, help="Number of concurrent async tasks")
+    parser.add_argument("-l", "--latency", type=float, default=0.05, help="Emulated network latency per page, in seconds")
+    parser.add_argument("-w", "--workers", type=int, nargs="*", default=[], help="Process pool sizes to try (defaults to 1, 2, 4, ... up to the number of cores)")
+    params = parser.parse_args(args[1:])
+
+    pages = [make_hop_page(i).encode() for i in range(0, params.pages)]
+    worker_counts : list[int] = params.workers
+    if len(worker_counts) == 0 :
+        worker_counts = [1]
+        while worker_counts[-1] * 2 <= (os.cpu_count() or 1) :
+            worker_counts.append(worker_counts[-1] * 2)
+
+    print(f"{params.pages} pages of ~{sum(len(x) for x in pages) // len(pages) // 1024} kB, {params.jobs} tasks, {params.latency * 1000:.0f} ms emulated latency")
+    print(f"{'mode':<24}{'time (s)':>10}{'pages/s':>10}")
+
+    duration = asyncio.run(crawl(pages, params.jobs, params.latency, None))
+    print(f"{'single event loop':<24}{duration:>10.2f}{params.pages / duration:>10.1f}")
+
+    for workers in worker_counts :
+        with ProcessPoolExecutor(max_workers=workers) as executor :
+            # Warm up worker processes, so that spawning them is not accounted for
+            list(executor.map(abs, range(0, workers)))
+            duration = asyncio.run(crawl(pages, params.jobs, params.latency, executor))
+        print(f"{f'process pool ({workers})':<24}{duration:>10.2f}{params.pages / duration:>10.1f}")
+
+    return 0
+
+if __name__ == "__main__" :
+    exit(main(sys.argv))
@@ -0,0 +1,91 @@
+import sys
+import time
+import random
+import asyncio
+import argparse
+from threading import Thread
+from concurrent.futures import ThreadPoolExecutor
+
+from ..Utils import parallel
+
+# Compares the legacy static partitioning (spread_load_for_parallel + one worker per chunk) against the shared work queue
+# on synthetic, skewed workloads : most items are fast but a few of them are slow (think yeasts with lots of comparable yeasts to resolve).
+# Sleeps are used to emulate network latency, which is what dominates the real crawl.
+# Run with : python -m Sources.Benchmarks.bench_scheduler
+
+def make_skewed_workload(num_items : int, fast_duration : float, slow_duration : float, slow_ratio : float, clustered : bool, seed : int = 42) -> list[float] :
+    """Builds a list of per-item durations (in seconds).
+       If clustered, slow items are contiguous, which is the worst case for static partitioning (a single chunk gets all of them)."""
+    rng = random.Random(seed)
+    num_slow = max(1, int(num_items * slow_ratio))
+    durations = [slow_duration] * num_slow + [fast_duration] * (num_items - num_slow)
+    if not clustered :
+        rng.shuffle(durations)
+    return durations
+
+def run_static_threaded(durations : list[float], num_jobs : int) -> float :
+    start = time.perf_counter()
+    thread_list : list[Thread] = []
+    for sublist in parallel.spread_load_for_parallel(durations, num_jobs) :
+        if len(sublist) == 0 :
+            continue
+        new_thread = Thread(target=lambda chunk : [time.sleep(x) for x in chunk], args=(sublist,))
+        new_thread.start()
+        thread_list.append(new_thread)
+    for thread in thread_list :
+        thread.join()
+    return time.perf_counter() - start
+
+def run_queue_threaded(durations : list[float], num_jobs : int) -> float :
+    # Same scheduling as the scrapers threaded mode : a bounded executor, fed as calls complete
+    with ThreadPoolExecutor(max_workers=num_jobs) as executor :
+        start = time.perf_counter()
+        for _ in parallel.iter_completed(executor, durations, time.sleep, num_jobs) :
+            pass
+        return time.perf_counter() - start
+
+async def run_static_async(durations : list[float], num_jobs : int) -> float :
+    async def chunk_worker(chunk : list[float]) :
+        for duration in chunk :
+            await asyncio.sleep(duration)
+
+    start = time.perf_counter()
+    async with asyncio.TaskGroup() as tg :
+        for sublist in parallel.spread_load_for_parallel(durations, num_jobs) :
+            if len(sublist) == 0 :
+                continue
+            tg.create_task(chunk_worker(sublist))
+    return time.perf_counter() - start
+
+async def run_queue_async(durations : list[float], num_jobs : int) -> float :
+    start = time.perf_counter()
+    await parallel.consume_queue_async(durations, asyncio.sleep, num_jobs)
+    return time.perf_counter() - start
+
+def main(args : list[str]) -> int :
+    parser = argparse.ArgumentParser(description="Static partitioning vs shared work queue scheduling benchmark.")
+    parser.add_argument("-n", "--items", type=int, default=400, help="Number of synthetic items")
+    parser.add_argument("-j", "--jobs", type=int, default=20, help="Number of threads/tasks")
+    parser.add_argument("--fast", type=float, default=0.005, help="Duration of a fast item, in seconds")
+    parser.add_argument("--slow", type=float, default=0.1, help="Duration of a slow item, in seconds")
+    parser.add_argument("--slow-ratio", type=float, default=0.05, help="Ratio of slow items in the workload")
+    params = parser.parse_args(args[1:])
+
+    print(f"{params.items} items, {params.jobs} jobs, fast = {params.fast}s, slow = {params.slow}s, slow ratio = {params.slow_ratio}")
+    print(f"{'workload':<12}{'mode':<10}{'static (s)':>12}{'queue (s)':>12}{'speedup':>10}")
+    for clustered in [False, True] :
+        durations = make_skewed_workload(params.items, params.fast, params.slow, params.slow_ratio, clustered)
+        workload_name = "clustered" if clustered else "shuffled"
+
+        static_time = run_static_threaded(durations, params.jobs)
+        queue_time = run_queue_threaded(durations, params.jobs)
+        print(f"{workload_name:<12}{'threads':<10}{static_time:>12.3f}{queue_time:>12.3f}{static_time / queue_time:>9.2f}x")
+
+        static_time = asyncio.run(run_static_async(durations, params.jobs))
+        queue_time = asyncio.run(run_queue_async(durations, params.jobs))
+        print(f"{workload_name:<12}{'async':<10}{static_time:>12.3f}{queue_time:>12.3f}{static_time / queue_time:>9.2f}x")
+
+    return 0
+
+if __name__ == "__main__" :
+    exit(main(sys.argv))
@@ -0,0 +1,109 @@
+import gc
+import sys
+import json
+import time
+import argparse
+import tracemalloc
+from dataclasses import dataclass
+from typing import Any, Callable, Type
+
+from ..Models.Hop import Hop
+from ..Models.Yeast import Yeast
+from ..Models.Ranges import NumericRange
+from ..Models.Jsonable import Jsonable
+from .synthetic_items import make_hop, make_yeast
+
+# Model serialization micro-benchmarks : to_json / from_json of hops, yeasts and ranges (what cache loads and writes run once per item),
+# and json encoding / decoding of the whole collection, at catalogue scale.
+# Each operation is timed first, then run again under tracemalloc for its allocations (tracing slows everything down,
+# so it never runs during the timed pass) :
+# * peak : highest memory allocated while the operation runs, on top of what existed before (temporaries included)
+# * retained : memory still held by the operation's output once it's done
+# Run with : python -m Sources.Benchmarks.bench_serialization -n 10000 100000
+#        or : python -m Sources.Benchmarks.bench_serialization -n 1000000 --no-trace   (tracing a million items takes a while)
+
+
+@dataclass
+class Measure :
+    seconds : float
+    peak_bytes : int = 0
+    retained_bytes : int = 0
+
+
+def measure(function : Callable[[Any], Any], inputs : Any, trace : bool = True) -> Measure :
+    gc.collect()
+    start = time.perf_counter()
+    output = function(inputs)
+    result = Measure(time.perf_counter() - start)
+    del output
+
+    if trace :
+        gc.collect()
+        tracemalloc.start()
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        output = function(inputs)
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        result.peak_bytes = peak - before
+        result.retained_bytes = current - before
+        del output
+    return result
+
+def to_json_all(items : list[Jsonable]) -> list[dict[str, Any]] :
+    return [x.to_json() for x in items]
+
+def make_from_json_all(item_type : Type[Jsonable]) -> Callable[[list[dict[str, Any]]], list[Jsonable]] :
+    def from_json_all(contents : list[dict[str, Any]]) -> list[Jsonable] :
+        items : list[Jsonable] = []
+        for content in contents :
+            item = item_type()
+            item.from_json(content)
+            items.append(item)
+        return items
+    return from_json_all
+
+def round_trip_all(item_type : Type[Jsonable]) -> Callable[[list[Jsonable]], list[Jsonable]] :
+    """What a cache write followed by a cache load goes through."""
+    from_json_all = make_from_json_all(item_type)
+    return lambda items : from_json_all(json.loads(json.dumps(to_json_all(items))))
+
+def get_operations(item_type : Type[Jsonable], items : list[Jsonable]) -> list[tuple[str, Callable[[Any], Any], Any]] :
+    contents = to_json_all(items)
+    text = json.dumps(contents)
+    return [
+        ("to_json", to_json_all, items),
+        ("from_json", make_from_json_all(item_type), contents),
+        ("json.dumps", json.dumps, contents),
+        ("json.loads", json.loads, text),
+        ("round trip", round_trip_all(item_type), items)
+    ]
+
+def main(args : list[str]) -> int :
+    parser = argparse.ArgumentParser(description="Model serialization micro-benchmarks.")
+    parser.add_argument("-n", "--items", type=int, nargs="*", default=[10000, 100000], help="Collection sizes to benchmark")
+    parser.add_argument("-k", "--kinds", nargs="*", default=["hops", "yeasts", "ranges"], help="Models to benchmark")
+    parser.add_argument("--no-trace", action="store_true", help="Only measures time, not allocations")
+    params = parser.parse_args(args[1:])
+
+    builders : dict[str, tuple[Type[Jsonable], Callable[[int], Jsonable]]] = {
+        "hops" : (Hop, make_hop),
+        "yeasts" : (Yeast, make_yeast),
+        "ranges" : (NumericRange, lambda i : NumericRange(i / 10, i / 10 + 2.5))
+    }
+
+    print(f"{'model':<8}{'operation':<12}{'items':>9}{'time (s)':>10}{'us/item':>10}{'peak B/item':>13}{'kept B/item':>13}")
+    for count in params.items :
+        for kind in params.kinds :
+            item_type, build = builders[kind]
+            items = [build(i) for i in range(0, count)]
+            for name, function, inputs in get_operations(item_type, items) :
+                result = measure(function, inputs, not params.no_trace)
+                print(f"{kind:<8}{name:<12}{count:>9}{result.seconds:>10.3f}{result.seconds / count * 1e6:>10.2f}"
+                      f"{result.peak_bytes / count:>13.0f}{result.retained_bytes / count:>13.0f}")
+            del items
+
+    return 0
+
+if __name__ == "__main__" :
+    exit(main(sys.argv))
@@ -0,0 +1,76 @@
+import sys
+import time
+import asyncio
+import argparse
+from pathlib import Path
+from typing import Any
+
+from ..Models.Hop import Hop
+from ..Utils import parallel
+from ..Utils.firestore_upload import BulkUploader
+from ..Utils.upload_manifest import UploadManifest
+from .fake_firestore import FakeCollection, FakeFirestoreClient
+
+# Firestore upload throughput : previous get-then-update/add per document against batched writes.
+# Runs against an in-memory fake with an emulated round trip latency, so it needs neither network nor credentials.
+# The fake charges the same latency whatever the batch size, whereas real commits of 500 writes take longer than single writes :
+# batched figures are an upper bound, round trips count is the meaningful part. Use the emulator for more realistic figures.
+# Run with : python -m Sources.Benchmarks.bench_upload
+
+def make_documents(count : int) -> list[tuple[str, dict[str, Any]]] :
+    return [(f"hop-{i}", Hop(name=f"Hop {i}", id=f"hop-{i}", link=f"https://beermaverick.com/hop/hop-{i}/").to_json()) for i in range(0, count)]
+
+async def upload_per_document(collection : FakeCollection, documents : list[tuple[str, dict[str, Any]]], num_tasks : int) -> None :
+    """What the upload used to do : statically partitioned tasks, two round trips per document."""
+    async def upload_chunk(chunk : list[tuple[str, dict[str, Any]]]) :
+        for document_id, content in chunk :
+            snapshot = await collection.document(document_id).get()
+            if snapshot.exists :
+                await collection.document(document_id).update(content)
+            else :
+                await collection.add(content, document_id=document_id)
+
+    async with asyncio.TaskGroup() as tg :
+        for chunk in parallel.spread_load_for_parallel(documents, num_tasks) :
+            tg.create_task(upload_chunk(chunk))
+
+def main(args : list[str]) -> int :
+    parser = argparse.ArgumentParser(description="Per document upload vs batched upload throughput benchmark.")
+    parser.add_argument("-n", "--documents", type=int, default=2000, help="Number of documents to upload")
+    parser.add_argument("-j", "--jobs", type=int, default=8, help="Concurrent tasks (per document mode) or concurrent batches (batched mode)")
+    parser.add_argument("-l", "--latency", type=float, default=0.03, help="Emulated round trip latency, in seconds")
+    params = parser.parse_args(args[1:])
+
+    documents = make_documents(params.documents)
+    print(f"{params.documents} documents, {params.jobs} jobs, {params.latency * 1000:.0f} ms emulated latency")
+    print(f"{'mode':<24}{'round trips':>12}{'time (s)':>10}{'docs/s':>10}")
+
+    for existing in [False, True] :
+        client = FakeFirestoreClient(latency=params.latency)
+        collection = client.collection("bmHops")
+        if existing :
+            collection.documents = {x[0] : dict(x[1]) for x in documents}
+        start = time.perf_counter()
+        asyncio.run(upload_per_document(collection, documents, params.jobs))
+        duration = time.perf_counter() - start
+        label = "per document (update)" if existing else "per document (create)"
+        print(f"{label:<24}{client.round_trips:>12}{duration:>10.2f}{params.documents / duration:>10.1f}")
+
+    client = FakeFirestoreClient(latency=params.latency)
+    report = asyncio.run(BulkUploader(client, max_concurrent_batches=params.jobs).upload(client.collection("bmHops"), documents))
+    print(f"{'batched':<24}{client.round_trips:>12}{report.duration:>10.2f}{report.get_rate():>10.1f}")
+
+    # Same catalogue uploaded again, with the manifest of the previous upload : nothing left to send
+    manifest = UploadManifest(Path("unused"))
+    manifest.record("bmHops", manifest.diff("bmHops", documents), [], [])
+    client = FakeFirestoreClient(latency=params.latency)
+    start = time.perf_counter()
+    diff = manifest.diff("bmHops", documents)
+    asyncio.run(BulkUploader(client, max_concurrent_batches=params.jobs).upload(client.collection("bmHops"), diff.to_write))
+    duration = time.perf_counter() - start
+    print(f"{'batched, unchanged':<24}{client.round_trips:>12}{duration:>10.2f}{params.documents / duration:>10.1f}")
+
+    return 0
+
+if __name__ == "__main__" :
+    exit(main(sys.argv))
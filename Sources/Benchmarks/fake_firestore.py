@@ -0,0 +1,105 @@
+import copy
+import asyncio
+from typing import Any, Optional
+
+from google.api_core import exceptions as gexceptions #type: ignore
+
+# In-memory stand-in for the async Firestore client, covering the small part of the api used by the uploaders.
+# Every call which is a round trip with the real client sleeps for latency seconds, so that benchmarks give
+# meaningful documents/sec figures without any network nor emulator.
+# Commits can be made to fail with transient errors to exercise retries.
+
+
+class FakeDocumentSnapshot :
+    def __init__(self, content : Optional[dict[str, Any]]) -> None:
+        self.exists = content != None
+        self._content = content
+
+    def to_dict(self) -> Optional[dict[str, Any]] :
+        return copy.deepcopy(self._content)
+
+
+class FakeDocumentReference :
+    def __init__(self, collection : "FakeCollection", id : str) -> None:
+        self.collection = collection
+        self.id = id
+
+    async def get(self) -> FakeDocumentSnapshot :
+        await self.collection.client.round_trip()
+        return FakeDocumentSnapshot(self.collection.documents.get(self.id))
+
+    async def update(self, content : dict[str, Any], option : Any = None) -> None :
+        await self.collection.client.round_trip()
+        if not self.id in self.collection.documents :
+            raise gexceptions.NotFound(f"No document to update : {self.id}")
+        self.collection.documents[self.id].update(copy.deepcopy(content))
+
+
+class FakeCollection :
+    def __init__(self, client : "FakeFirestoreClient", name : str) -> None:
+        self.client = client
+        self.name = name
+        self.documents : dict[str, dict[str, Any]] = {}
+
+    def document(self, id : str) -> FakeDocumentReference :
+        return FakeDocumentReference(self, id)
+
+    async def add(self, content : dict[str, Any], document_id : str) -> None :
+        await self.client.round_trip()
+        if document_id in self.documents :
+            raise gexceptions.Conflict(f"Document already exists : {document_id}")
+        self.documents[document_id] = copy.deepcopy(content)
+
+
+class FakeWriteBatch :
+    def __init__(self, client : "FakeFirestoreClient") -> None:
+        self.client = client
+        self.writes : list[tuple[FakeDocumentReference, Optional[dict[str, Any]], bool]] = []
+
+    def set(self, reference : FakeDocumentReference, content : dict[str, Any], merge : bool = False) -> None :
+        self.writes.append((reference, copy.deepcopy(content), merge))
+
+    def delete(self, reference : FakeDocumentReference, option : Any = None) -> None :
+        self.writes.append((reference, None, False))
+
+    async def commit(self) -> None :
+        if len(self.writes) > 500 :
+            raise gexceptions.InvalidArgument("maximum 500 writes allowed per request")
+        await self.client.round_trip()
+        self.client.commits += 1
+        if self.client.failures_to_inject > 0 :
+            self.client.failures_to_inject -= 1
+            raise gexceptions.ServiceUnavailable("Injected failure")
+
+        # Batches are atomic : all writes are applied, or none of them
+        for reference, content, merge in self.writes :
+            documents = reference.collection.documents
+            if content == None :
+                documents.pop(reference.id, None)
+            elif merge and reference.id in documents :
+                documents[reference.id].update(content)
+            else :
+                documents[reference.id] = content
+
+
+class FakeFirestoreClient :
+    """latency : emulated round trip duration in seconds
+       failures_to_inject : number of upcoming batch commits which fail with ServiceUnavailable"""
+    def __init__(self, latency : float = 0, failures_to_inject : int = 0) -> None:
+        self.latency = latency
+        self.failures_to_inject = failures_to_inject
+        self.round_trips = 0
+        self.commits = 0
+        self.collections : dict[str, FakeCollection] = {}
+
+    async def round_trip(self) -> None :
+        self.round_trips += 1
+        await asyncio.sleep(self.latency)
+
+    def collection(self, name : str) -> FakeCollection :
+        if not name in self.collections :
+            self.collections[name] = FakeCollection(self, name)
+        return self.collections[name]
+
+    def batch(self) -> FakeWriteBatch :
+        return FakeWriteBatch(self)
@@ -0,0 +1,129 @@
+import sys
+import random
+import asyncio
+import argparse
+import tempfile
+from pathlib import Path
+from typing import Optional
+from urllib.parse import urlsplit
+
+from aiohttp import web
+
+from ..Utils.fixture_archive import FixtureArchive, rewrite_base_url
+from .synthetic_pages import make_synthetic_archive
+
+# Local stand-in for beermaverick.com : serves the responses of a fixture archive (recorded with Main.py --record, or synthetic),
+# with configurable latency, jitter and error injection. Point the scrapers to it with Main.py --replay-url.
+# Run with : python -m Sources.Benchmarks.replay_server --archive fixtures.zip --latency 0.05 --jitter 0.02 --error-rate 0.01
+#        or : python -m Sources.Benchmarks.replay_server --synthetic 500
+
+
+# Those describe the body as it was transferred, whereas archives store it decoded : aiohttp sets them again if needed
+DROPPED_HEADERS = ["content-encoding", "content-length", "transfer-encoding", "connection", "keep-alive"]
+
+
+class ReplayServer :
+    """latency : delay added to every response, in seconds, jitter : latency varies uniformly by +/- jitter seconds
+       error_rate : probability (0-1) of answering error_status instead of the recorded response
+       Urls missing from the archive are answered with a 404."""
+    archive : FixtureArchive
+    latency : float
+    jitter : float
+    error_rate : float
+    error_status : int
+
+    def __init__(self, archive : FixtureArchive, latency : float = 0, jitter : float = 0, error_rate : float = 0,
+                 error_status : int = 503, seed : Optional[int] = None) -> None:
+        self.archive = archive
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.rng = random.Random(seed)
+        self.served = 0
+        self.errors = 0
+        self.not_found = 0
+        self._runner : Optional[web.AppRunner] = None
+
+    def make_app(self) -> web.Application :
+        app = web.Application()
+        app.router.add_route("GET", "/{tail:.*}", self.handle)
+        return app
+
+    async def handle(self, request : web.Request) -> web.Response :
+        delay = self.latency + self.rng.uniform(-self.jitter, self.jitter)
+        if delay > 0 :
+            await asyncio.sleep(delay)
+
+        if self.rng.random() < self.error_rate :
+            self.errors += 1
+            return web.Response(status=self.error_status, text="Injected error")
+
+        response = self.archive.find(request.path_qs)
+        if response == None :
+            self.not_found += 1
+            return web.Response(status=404, text=f"Not in archive : {request.path_qs}")
+
+        self.served += 1
+        headers = {key : value for key, value in response.headers.items() if not key.lower() in DROPPED_HEADERS}
+        for key in headers :
+            if key.lower() == "location" :
+                headers[key] = self.rewrite_location(headers[key], response.url, f"{request.scheme}://{request.host}")
+        return web.Response(status=response.status, headers=headers, body=response.content)
+
+    def rewrite_location(self, location : str, recorded_url : str, base_url : str) -> str :
+        """Redirections are replayed as they were sent, relative or absolute : only absolute ones to the recorded website
+           are sent to this server instead (they would send clients back to the real website otherwise)."""
+        location_host = urlsplit(location).netloc
+        if location_host == "" or location_host != urlsplit(recorded_url).netloc :
+            return location
+        return rewrite_base_url(location, base_url)
+
+    async def start(self, host : str = "127.0.0.1", port : int = 0) -> str :
+        """Starts serving in the background (current event loop), returns the base url. Port 0 picks a free port."""
+        self._runner = web.AppRunner(self.make_app(), access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        return f"http://{host}:{self._runner.addresses[0][1]}"
+
+    async def stop(self) -> None :
+        if self._runner :
+            await self._runner.cleanup()
+            self._runner = None
+
+
+def main(args : list[str]) -> int :
+    parser = argparse.ArgumentParser(description="Serves recorded BeerMaverick responses locally.")
+    parser.add_argument("--archive", type=str, default="", help="Fixture archive to serve (see Main.py --record)")
+    parser.add_argument("--synthetic", type=int, default=0, help="Serves a synthetic site with that many hops and yeasts instead of an archive")
+    parser.add_argument("--save-synthetic", type=str, default="", help="Also saves the synthetic site as a fixture archive, to that path")
+    parser.add_argument("--host", type=str, default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--latency", type=float, default=0, help="Delay added to every response, in seconds")
+    parser.add_argument("--jitter", type=float, default=0, help="Latency varies by +/- jitter seconds")
+    parser.add_argument("--error-rate", type=float, default=0, help="Probability (0-1) of answering an error instead of the recorded response")
+    parser.add_argument("--error-status", type=int, default=503, help="Status code of injected errors")
+    params = parser.parse_args(args[1:])
+
+    if params.synthetic > 0 :
+        # Synthetic sites are only kept in memory, unless --save-synthetic is given
+        filepath = Path(params.save_synthetic) if params.save_synthetic != "" else Path(tempfile.gettempdir()).joinpath("synthetic.zip")
+        archive = make_synthetic_archive(filepath, params.synthetic, params.synthetic)
+        if params.save_synthetic != "" :
+            archive.save()
+            print(f"Synthetic site saved to {archive.filepath}")
+    elif params.archive != "" :
+        archive = FixtureArchive(Path(params.archive))
+        archive.load()
+    else :
+        print("Either --archive or --synthetic is required.")
+        return 1
+
+    server = ReplayServer(archive, params.latency, params.jitter, params.error_rate, params.error_status)
+    print(f"Serving {len(archive)} responses on http://{params.host}:{params.port} (use Main.py --replay-url http://{params.host}:{params.port})")
+    web.run_app(server.make_app(), host=params.host, port=params.port, print=None)
+    return 0
+
+if __name__ == "__main__" :
+    exit(main(sys.argv))
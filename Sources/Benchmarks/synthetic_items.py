@@ -0,0 +1,67 @@
+import random
+
+from ..Models.Hop import Hop, HopAttribute, RadarChart
+from ..Models.Yeast import Yeast
+from ..Models.Ranges import NumericRange, RatioRange
+from ..Models.Catalogue import make_stable_id
+from .synthetic_pages import HOP_NAMES, YEAST_NAMES, get_hop_link, get_yeast_link
+
+# Synthetic, fully populated hops and yeasts, built directly (no page to parse) : catalogue sized collections
+# (up to millions of items) can be built in seconds, for serialization and memory benchmarks.
+
+TAGS = ["citrus", "tropical", "pine", "resin", "floral", "grapefruit", "melon", "herbal", "stone fruit", "spicy"]
+BEER_STYLES = ["India Pale Ale", "Pale Ale", "Double IPA", "Lager", "Pilsner", "Saison", "Stout", "Porter", "Wheat Beer", "Kolsch"]
+
+
+def _range(rng : random.Random, low : float, high : float) -> NumericRange :
+    start = round(rng.uniform(low, high), 1)
+    return NumericRange(start, round(start + rng.uniform(0, (high - low) / 2), 1))
+
+def make_hop(index : int, seed : int = 0) -> Hop :
+    rng = random.Random(seed * 100003 + index)
+    link = get_hop_link(index)
+    name = HOP_NAMES[index % len(HOP_NAMES)]
+    hop = Hop(name=f"{name} {index}", link=link, id=make_stable_id(link))
+    hop.purpose = rng.choice(list(HopAttribute))
+    hop.country = "United States"
+    hop.international_code = f"C{index:03d}"
+    hop.cultivar_id = f"HBC {index}"
+    hop.origin_txt = f"{name} {index} was bred in {1980 + index % 40} by a hop breeding company. " + "Some more heritage text. " * rng.randint(3, 10)
+    hop.flavor_txt = f"{name} {index} brings " + "juicy tropical fruit and citrus notes " * rng.randint(2, 6)
+    hop.tags = rng.sample(TAGS, 4)
+    hop.alpha_acids = _range(rng, 4, 16)
+    hop.beta_acids = _range(rng, 2, 6)
+    hop.alpha_beta_ratio = RatioRange(f"{rng.randint(1, 3)}:1", f"{rng.randint(3, 6)}:1")
+    hop.hop_storage_index = round(rng.uniform(10, 60), 1)
+    hop.co_humulone_normalized = _range(rng, 20, 40)
+    hop.total_oils = _range(rng, 0.5, 3)
+    hop.myrcene = _range(rng, 20, 70)
+    hop.humulene = _range(rng, 5, 30)
+    hop.caryophyllene = _range(rng, 2, 15)
+    hop.farnesene = _range(rng, 0, 3)
+    hop.other_oils = _range(rng, 5, 30)
+    hop.beer_styles = rng.sample(BEER_STYLES, rng.randint(2, 5))
+    hop.substitutes = [get_hop_link(index + i) for i in range(1, rng.randint(2, 8))]
+    hop.radar_chart = RadarChart(*[rng.randint(0, 5) for _ in range(0, 9)])
+    hop.mark_extracted()
+    return hop
+
+def make_yeast(index : int, seed : int = 0) -> Yeast :
+    rng = random.Random(seed * 100003 + index)
+    link = get_yeast_link(index)
+    name = YEAST_NAMES[index % len(YEAST_NAMES)]
+    yeast = Yeast(name=f"{name} {index}", brand=rng.choice(["Wyeast", "White Labs", "Fermentis", "Lallemand"]), link=link, id=make_stable_id(link))
+    yeast.type = rng.choice(["Ale", "Lager", "Wheat", "Wild"])
+    yeast.packaging = rng.choice(["Liquid", "Dry"])
+    yeast.has_bacterias = rng.random() < 0.1
+    yeast.species = ["Saccharomyces cerevisiae"]
+    yeast.description = f"{name} {index} is a " + "clean fermenting strain with a crisp finish, " * rng.randint(2, 8)
+    yeast.tags = rng.sample(TAGS, 3)
+    yeast.alcohol_tolerance = round(rng.uniform(8, 15), 1)
+    yeast.attenuation = _range(rng, 65, 80)
+    yeast.flocculation = rng.choice(["Low", "Medium", "High"])
+    yeast.optimal_temperature = _range(rng, 10, 22)
+    yeast.comparable_yeasts = [make_stable_id(get_yeast_link(index + i)) for i in range(1, rng.randint(2, 6))]
+    yeast.common_beer_styles = rng.sample(BEER_STYLES, rng.randint(2, 5))
+    yeast.mark_extracted()
+    return yeast
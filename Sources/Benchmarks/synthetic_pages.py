@@ -0,0 +1,153 @@
+import json
+import random
+from pathlib import Path
+
+from ..Utils.http import HttpResponse
+from ..Utils.fixture_archive import FixtureArchive
+
+# Synthetic beermaverick-like pages, shaped after what HopScraper and YeastScraper look for in real pages.
+# Used by benchmarks so that they can run offline, without hammering the real website.
+# Some filler markup (navigation, footer, ...) is added so that pages have a realistic size and DOM depth.
+
+HOP_NAMES = ["Citra", "Mosaic", "Simcoe", "Amarillo", "Cascade", "Centennial", "Chinook", "Columbus", "Galaxy", "Nelson Sauvin",
+             "Saaz", "Hallertau Mittelfruh", "East Kent Goldings", "Fuggle", "Magnum", "Sabro", "Strata", "Talus", "Idaho 7", "El Dorado"]
+YEAST_NAMES = ["California Ale", "London Ale III", "Belgian Saison", "Kolsch", "Bavarian Lager", "American Ale II", "Scottish Ale", "Hefeweizen IV"]
+
+
+def _slug(name : str) -> str :
+    return name.lower().replace(" ", "-")
+
+def _filler(rng : random.Random, num_blocks : int) -> str :
+    blocks : list[str] = []
+    for i in range(0, num_blocks) :
+        links = "".join(f"<li class=\"menu-item\"><a href=\"/page/{i}-{j}/\">Menu entry {i}-{j}</a></li>" for j in range(0, 8))
+        blocks.append(f"<div class=\"widget widget-{i}\"><h3>Widget {i}</h3><ul class=\"menu\">{links}</ul>"
+                      f"<p>{' '.join(['lorem ipsum dolor sit amet'] * rng.randint(5, 15))}</p></div>")
+    return "".join(blocks)
+
+def _range(rng : random.Random, low : float, high : float, unit : str = "%") -> str :
+    start = round(rng.uniform(low, high), 1)
+    end = round(start + rng.uniform(0, (high - low) / 2), 1)
+    return f"{start}-{end}{unit}"
+
+def make_hop_page(index : int, seed : int = 0, filler_blocks : int = 40) -> str :
+    rng = random.Random(seed * 100003 + index)
+    name = f"{HOP_NAMES[index % len(HOP_NAMES)]} {index}"
+    substitutes = "".join(f"<li><a href=\"/hop/{_slug(HOP_NAMES[(index + i) % len(HOP_NAMES)])}-{index + i}/\">{HOP_NAMES[(index + i) % len(HOP_NAMES)]}</a></li>" for i in range(1, rng.randint(2, 8)))
+    tags = "".join(f"<a class=\"text-muted\" href=\"/tag/{x}/\">#{x}</a> " for x in rng.sample(["citrus", "tropical", "pine", "resin", "floral", "grapefruit", "melon", "herbal"], 4))
+
+    return f"""<!DOCTYPE html><html><head><title>{name} Hop | Beer Maverick</title>
+<link rel="canonical" href="https://beermaverick.com/hop/{_slug(name)}/" /></head>
+<body><header><nav>{_filler(rng, filler_blocks // 4)}</nav></header>
+<main><article>
+<h1 class="entry-title">{name} Hop</h1>
+<table class="basics">
+<tr><th>Purpose:</th><td><a href="/hops/aroma/">{rng.choice(["Aromatic", "Bittering", "Dual"])}</a></td></tr>
+<tr><th>Country:</th><td>  United   States </td></tr>
+<tr><th>International Code:</th><td>C{index:03d}</td></tr>
+<tr><th>Cultivar/Brand ID:</th><td>HBC {index}</td></tr>
+</table>
+<h2>Origin</h2>
+<p>{name} was bred in {1980 + index % 40} by a hop breeding company. {' '.join(['Some more heritage text.'] * rng.randint(3, 10))}</p>
+<p><span>Notice</span> Still about {name} origins.</p>
+<h2>Flavor &amp; Aroma Profile</h2>
+<p>{name} brings {' '.join(['juicy tropical fruit and citrus notes'] * rng.randint(2, 6))}.</p>
+<p>Tags: <em>{tags}</em></p>
+<h2>Brewing Values</h2>
+<table class="brewvalues">
+<tr><th>Alpha Acid % (AA)</th><td>{_range(rng, 4, 16)}</td></tr>
+<tr><th>Beta Acid %</th><td>{_range(rng, 2, 6)}</td></tr>
+<tr><th>Alpha-Beta Ratio</th><td>2:1 - 5:1</td></tr>
+<tr><th>Hop Storage Index (HSI)</th><td>{rng.randint(15, 60)}% (Good)</td></tr>
+<tr><th>Co-Humulone as % of Alpha</th><td>{_range(rng, 18, 40)}</td></tr>
+<tr><th>Total Oils (mL/100g)</th><td>{_range(rng, 0.5, 3, " mL")}</td></tr>
+<tr><th>Myrcene</th><td>{_range(rng, 30, 70)}</td></tr>
+<tr><th>Humulene</th><td>{_range(rng, 5, 25)}</td></tr>
+<tr><th>Caryophyllene</th><td>{_range(rng, 3, 12)}</td></tr>
+<tr><th>Farnesene</th><td>{_range(rng, 0, 2)}</td></tr>
+<tr><th>All Others</th><td>{_range(rng, 10, 30)}</td></tr>
+</table>
+<h2>Beer Styles</h2>
+<p>Commonly used in <b>India Pale Ale</b>, <b>Pale Ale</b> and <b>Wheat Beer</b>.</p>
+<h2>Hop Substitutions</h2>
+<p>Some text about substitutions.</p>
+<p>Experienced brewers have chosen the following hop substitutes for {name}:</p>
+<ul>{substitutes}</ul>
+<h2>Related articles</h2>
+<p>Nothing to see here.</p>
+</article></main>
+<footer>{_filler(rng, filler_blocks)}</footer></body></html>"""
+
+def make_yeast_page(index : int, seed : int = 0, filler_blocks : int = 40) -> str :
+    rng = random.Random(seed * 100019 + index)
+    name = f"{YEAST_NAMES[index % len(YEAST_NAMES)]} {index}"
+    comparables = "".join(f"<li><a href=\"/yeasts/?yid={(index + i) * 7}\">Comparable {i}</a></li>" for i in range(1, rng.randint(2, 12)))
+
+    return f"""<!DOCTYPE html><html><head><title>{name} | Beer Maverick</title>
+<link rel="canonical" href="https://beermaverick.com/yeast/{_slug(name)}/" /></head>
+<body><header><nav>{_filler(rng, filler_blocks // 4)}</nav></header>
+<main><article>
+<h1 class="entry-title">{name}</h1>
+<table class="basics">
+<tr><th>Brand:</th><td> White Labs </td></tr>
+<tr><th>Type:</th><td>Ale</td></tr>
+<tr><th>Packet:</th><td>Liquid</td></tr>
+<tr><th>Species:</th><td>Saccharomyces cerevisiae, Brettanomyces</td></tr>
+<tr><th>Contains Bacteria?</th><td>{rng.choice(["Yes", "No"])}</td></tr>
+</table>
+<h2>Description</h2>
+<p>{' '.join(['A clean fermenting yeast with a crisp finish.'] * rng.randint(2, 6))}</p>
+<p class="readmore"><a href="#">Read more</a></p>
+<p><strong>#clean #crisp #versatile</strong></p>
+<h2>Brewing Properties</h2>
+<table class="brewvalues">
+<tr><th>Alcohol Tolerance</th><td><small class="text-muted bold">{rng.randint(8, 15)}%</small></td></tr>
+<tr><th>Attenuation</th><td><small class="text-muted bold">{rng.randint(65, 75)} - {rng.randint(76, 85)}%</small></td></tr>
+<tr><th>Flocculation</th><td><small class="text-muted bold">{rng.choice(["Low", "Medium", "High"])}</small></td></tr>
+<tr><th>Optimal Temperature</th><td><small class="text-muted bold">{rng.randint(60, 65)} - {rng.randint(66, 75)}° F</small></td></tr>
+</table>
+<h2>Common Beer Styles</h2>
+<p>This yeast is commonly used in the following styles :</p>
+<p>American IPA, Pale Ale, Blonde Ale &amp; Stout</p>
+<h2>Comparable Beer Yeast</h2>
+<ul>{comparables}</ul>
+</article></main>
+<footer>{_filler(rng, filler_blocks)}</footer></body></html>"""
+
+def get_hop_link(index : int) -> str :
+    return f"https://beermaverick.com/hop/{_slug(HOP_NAMES[index % len(HOP_NAMES)])}-{index}/"
+
+def get_yeast_link(index : int) -> str :
+    return f"https://beermaverick.com/yeast/{_slug(YEAST_NAMES[index % len(YEAST_NAMES)])}-{index}/"
+
+def make_hop_api_response(index : int, seed : int = 0) -> str :
+    rng = random.Random(seed * 100043 + index)
+    return json.dumps({"primary" : {"name" : f"{HOP_NAMES[index % len(HOP_NAMES)]} {index}", "radar_chart" : [rng.randint(0, 5) for _ in range(0, 9)]},
+                       "substitute" : {"human_picked" : [], "aroma" : [], "combined" : [], "bittering" : []}})
+
+def make_sitemap(links : list[str]) -> str :
+    urls = "".join(f"<url><loc>{x}</loc><lastmod>2024-01-01T00:00:00+00:00</lastmod></url>" for x in links)
+    return f"<?xml version=\"1.0\" encoding=\"UTF-8\"?><urlset xmlns=\"http://www.sitemaps.org/schemas/sitemap/0.9\">{urls}</urlset>"
+
+def make_synthetic_archive(filepath : Path, num_hops : int, num_yeasts : int, seed : int = 0) -> FixtureArchive :
+    """Fixture archive of a whole synthetic site : sitemap, hop pages and their api calls, yeast pages and the redirections
+       of their comparable yeasts short urls. Lets the replay server stand in for the real website when nothing was recorded."""
+    archive = FixtureArchive(filepath)
+    html_headers = {"Content-Type" : "text/html; charset=UTF-8"}
+    for i in range(0, num_hops) :
+        link = get_hop_link(i)
+        archive.record(HttpResponse(url=link, status=200, headers=html_headers, content=make_hop_page(i, seed).encode()))
+        api_url = f"https://beermaverick.com/api/?hop={link.split('/')[-2]}"
+        archive.record(HttpResponse(url=api_url, status=200, headers={"Content-Type" : "application/json"}, content=make_hop_api_response(i, seed).encode()))
+
+    for i in range(0, num_yeasts) :
+        archive.record(HttpResponse(url=get_yeast_link(i), status=200, headers=html_headers, content=make_yeast_page(i, seed).encode()))
+    # Comparable yeasts of yeast i are yid=(i + k) * 7 (see make_yeast_page), redirected to the page of yeast i + k
+    for target in range(0, num_yeasts + 12) :
+        short_url = f"https://beermaverick.com/yeasts/?yid={target * 7}"
+        location = get_yeast_link(target).replace("https://beermaverick.com", "")
+        archive.record(HttpResponse(url=short_url, status=301, headers={"Location" : location}), allow_redirects=False)
+
+    sitemap = make_sitemap([get_hop_link(i) for i in range(0, num_hops)] + [get_yeast_link(i) for i in range(0, num_yeasts)])
+    archive.record(HttpResponse(url="https://beermaverick.com/beerm-sitemap.xml", status=200, headers={"Content-Type" : "application/xml"}, content=sitemap.encode()))
+    return archive
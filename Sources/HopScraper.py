@@ -1,15 +1,18 @@
-import uuid
 import aiohttp
 import asyncio
 import requests
 import datetime
-from threading import Thread
 import traceback
-from typing import Optional, cast
+from typing import Any, Optional, cast
 import bs4
 
 from .BaseScraper import BaseScraper, ItemPair
+from .Utils.http import RequestLimiter
+from .Utils.http_cache import ResponseCache
+from .Utils.html_backends import DEFAULT_HTML_BACKEND, get_html_backend
+from .Utils.page_index import PageIndex
 from .Models.Hop import Hop, hop_attribute_from_str
+from .Models.Catalogue import make_stable_id
 from .Models.Ranges import NumericRange
 from .Models.BeerMaverick import HopApi as bmapi
 
@@ -21,8 +24,10 @@ class HopScraper(BaseScraper[Hop]) :
     error_items : list[ItemPair[str]]
 
     def __init__(self, async_client: Optional[aiohttp.ClientSession] = None,
-                 request_client: Optional[requests.Session] = None) :
-        super().__init__(async_client, request_client)
+                 request_client: Optional[requests.Session] = None,
+                 limiter: Optional[RequestLimiter] = None,
+                 response_cache: Optional[ResponseCache] = None) :
+        super().__init__(async_client, request_client, limiter, response_cache)
         self.reset()
 
     def reset(self) :
@@ -36,7 +41,6 @@ class HopScraper(BaseScraper[Hop]) :
             print("/!\\ Warning : no session found for synchronous http requests, creating a new one.")
             self.request_client = requests.Session()
 
-        matrix = parallel.spread_load_for_parallel(links, num_threads)
         if num_threads == 1 :
             start = datetime.datetime.now()
             print(f"Retrieving hops, running synchronously. Starting at : {self.get_formatted_time()}")
@@ -55,47 +59,18 @@ class HopScraper(BaseScraper[Hop]) :
             print(f"Total execution time : {self.get_duration_formatted(start)}")
             return True
 
-        error_item_collection : list[list[Hop]] = []
-        output_item_collection : list[list[Hop]] = []
-
-        print(f"Spawning {num_threads} new threads ...")
-        thread_list : list[Thread] = []
-        for sublist in matrix :
-            # Empty list happen when we request e.g. 40 concurrent tasks but we only have 20 items to scrap
-            # -> Some tasks have nothing to do ! So skip them.
-            # Note : a break instruction might have done it here, but that only works on the assumption that empty lists are contiguous and the last
-            # ones of the matrix. It's probably always true, but a continue does it just as well and takes care of unordered lists whereas the break does not.
-            if len(sublist) == 0:
-                continue
-
-            # Prepare output data lists and store them in both collections
-            error_item_list = []
-            output_item_list = []
-
-            # Now that both collection contain the two lists created above,
-            # our thread will work on them (with side effects) and when the thread is joined, new values will be populated within each corresponding list in both collections
-            error_item_collection.append(error_item_list)
-            output_item_collection.append(output_item_list)
-
-            new_thread = Thread(target=self.atomic_scrap, args=(sublist, error_item_list, output_item_list)) #type: ignore
-            new_thread.start()
-            thread_list.append(new_thread)
-            #print(f"Spawning new thread with id : {new_thread.ident}.")
-
-        joined_threads  : list[int] = []
-
+        num_threads = parallel.resolve_num_jobs(num_threads)
+        print(f"Scraping with {num_threads} threads ...")
         start_time = datetime.datetime.now()
-        while len(joined_threads) != num_threads :
-            for thread in thread_list :
-                if not thread.is_alive() and not thread.ident in joined_threads:
-                    thread.join()
-                    joined_threads.append(thread.ident)  #type: ignore
+
+        error_item_list : list[Hop] = []
+        output_item_list : list[Hop] = []
+        self.scrap_links_threaded(links, error_item_list, output_item_list, num_threads)
 
         print(f"All threads returned, time : {self.get_duration_formatted(start_time)}")
 
-         # Flattening returned items yeast collection
-        self.hops : list[Hop] = [item for sublist in output_item_collection for item in sublist]
-        self.error_items = [item for sublist in error_item_collection for item in sublist] #type: ignore
+        self.hops = output_item_list
+        self.error_items = error_item_list #type: ignore
 
         # Alert for errors
         if len(self.error_items) > 0 :
@@ -113,11 +88,10 @@ class HopScraper(BaseScraper[Hop]) :
         self.reset()
         if self.async_client == None :
             print("/!\\ Warning : no session found for async http requests, creating a new one.")
-            self.async_client = aiohttp.ClientSession()
+            self.async_client = self.create_async_session()
         elif self.async_client.closed :
-            self.async_client = aiohttp.ClientSession()
+            self.async_client = self.create_async_session()
 
-        matrix = parallel.spread_load_for_parallel(links, num_tasks)
         if num_tasks == 1 :
             start = datetime.datetime.now()
             print(f"Retrieving hops, running synchronously. Starting at : {self.get_formatted_time()}")
@@ -134,39 +108,19 @@ class HopScraper(BaseScraper[Hop]) :
 
             print(f"Successfully retrieved hops ! Finished at {self.get_formatted_time()}")
             print(f"Total execution time : {self.get_duration_formatted(start)}")
+            await self.async_client.close()
             return True
 
-        error_item_collection : list[list[Hop]] = []
-        output_item_collection : list[list[Hop]] = []
-
         print(f"Spawning {num_tasks} new async tasks ...")
         start_time = datetime.datetime.now()
-        async with asyncio.TaskGroup() as tg :
-            for sublist in matrix :
-                # Empty list happen when we request e.g. 40 concurrent tasks but we only have 20 items to scrap
-                # -> Some tasks have nothing to do ! So skip them.
-                # Note : a break instruction might have done it here, but that only works on the assumption that empty lists are contiguous and the last
-                # ones of the matrix. It's probably always true, but a continue does it just as well and takes care of unordered lists whereas the break does not.
-                if len(sublist) == 0:
-                    continue
-
-                # Prepare output data lists and store them in both collections
-                error_item_list = []
-                output_item_list = []
-
-                # Now that both collection contain the two lists created above,
-                # our thread will work on them (with side effects) and when the thread is joined, new values will be populated within each corresponding list in both collections
-                error_item_collection.append(error_item_list)
-                output_item_collection.append(output_item_list)
-
-                tg.create_task(coro=self.atomic_scrap_async(sublist, error_item_list, output_item_list))
+        error_item_list : list[Hop] = []
+        output_item_list : list[Hop] = []
+        await parallel.consume_queue_async(links, lambda link : self.scrap_single_async(link, error_item_list, output_item_list), num_tasks)
         await self.async_client.close()
         print(f"All tasks returned, time : {self.get_duration_formatted(start_time)}")
 
-        # Flattening returned items yeast collection
-        self.hops : list[Hop] = [item for sublist in output_item_collection for item in sublist]
-        self.error_items = [item for sublist in error_item_collection for item in sublist] #type: ignore
-
+        self.hops = output_item_list
+        self.error_items = error_item_list #type: ignore
 
         # Alert for errors
         if len(self.error_items) > 0 :
@@ -192,85 +146,129 @@ class HopScraper(BaseScraper[Hop]) :
            * out_error_item_list : list of rejected objects (caused by a hard issue, like http connection failing/etc)
            * out_item_list : list of item that could be parsed. Check for the internal error list to see non-critical parsing warnings"""
         for link in links :
-            new_hop = Hop(link=link, id=str(uuid.uuid4()))
-
-            # Critical error, reject data
-            response = await self.async_client.get(link) #type: ignore
-            if response.status != 200 :
-                new_hop.add_parsing_error(str(response))
-                out_error_item_list.append(new_hop)
-                self.treated_item += 1
-                continue
-
-            try:
-                parser = bs4.BeautifulSoup(await response.content.read(), "html.parser")
-                self.parse_hop_item_from_page(parser, new_hop)
-
-                # NOTE : We don't like to use the api directly, as this is not scraping.
-                # However we can use this to read the radar chart, which is the only option to read it.
-                # Another option would be to render the whole page with tools like Selenium, then perform OCR on the chart
-                hop_url_unique = new_hop.link.split("/")[-2]
-                url = f"https://beermaverick.com/api/?hop={hop_url_unique}"
-                response = await self.async_client.get(url) #type: ignore
-                if response.status == 200 :
-                    bm_hop_model = bmapi.BMHopModel()
-                    json_content = await response.json()
-                    bm_hop_model.from_json(json_content)
-
-                    new_hop.radar_chart_from_bmapi(bm_hop_model)
-
-                out_item_list.append(new_hop)
-                self.treated_item += 1
-
-            except : # Exception as e :
-                out_error_item_list.append(new_hop)
-                traceback.print_exc()
-                self.treated_item += 1
+            await self.scrap_single_async(link, out_error_item_list, out_item_list)
+
+    async def scrap_single_async(self, link : str, out_error_item_list : list[Hop], out_item_list : list[Hop]) -> None :
+        """Scraps a single hop page and appends the result to one of the output lists (asyncio flavor)."""
+        new_hop = Hop(link=link, id=make_stable_id(link))
+        new_hop.mark_extracted()
+
+        # The api call only depends on the link, so it's sent along with the page request instead of waiting for the page to be parsed
+        try :
+            response, api_response = await self.fetch_many_async([link, self.get_api_url(link)])
+        except : # Exception as e :
+            out_error_item_list.append(new_hop)
+            traceback.print_exc()
+            self.mark_treated(failed=True)
+            return
+
+        # Critical error, reject data
+        if response.status != 200 :
+            new_hop.add_parsing_error(str(response))
+            out_error_item_list.append(new_hop)
+            self.mark_treated(failed=True)
+            return
+
+        try:
+            await self.parse_page_async(new_hop, response.content)
+
+            if api_response.status == 200 :
+                bm_hop_model = bmapi.BMHopModel()
+                json_content = api_response.json()
+                bm_hop_model.from_json(json_content)
+
+                new_hop.radar_chart_from_bmapi(bm_hop_model)
+
+            out_item_list.append(new_hop)
+            self.notify_item_scraped(new_hop)
+            self.mark_treated(warnings=len(new_hop.parsing_errors or []))
+
+        except : # Exception as e :
+            out_error_item_list.append(new_hop)
+            traceback.print_exc()
+            self.mark_treated(failed=True)
 
     def atomic_scrap(self, links: list[str], out_error_item_list : list[Hop], out_item_list : list[Hop]) -> None:
         """Atomic function used by asynchronous executers (threads).
            Returns two output lists :
            * out_error_item_list : list of rejected objects (caused by a hard issue, like http connection failing/etc)
            * out_item_list : list of item that could be parsed. Check for the internal error list to see non-critical parsing warnings"""
-        self.request_client = cast(requests.Session, self.request_client)
         for link in links :
-            new_hop = Hop(link=link, id=str(uuid.uuid4()))
-
-            # Critical error, reject data
-            response = self.request_client.get(link)
-            if response.status_code != 200 :
-                new_hop.add_parsing_error(str(response))
-                out_error_item_list.append(new_hop)
-                self.treated_item += 1
-                continue
-
-            try:
-                parser = bs4.BeautifulSoup(response.content, "html.parser")
-                self.parse_hop_item_from_page(parser, new_hop)
-
-                # NOTE : We don't like to use the api directly, as this is not scraping.
-                # However we can use this to read the radar chart, which is the only option to read it.
-                # Another option would be to render the whole page with tools like Selenium, then perform OCR on the chart
-                hop_url_unique = new_hop.link.split("/")[-2]
-                url = f"https://beermaverick.com/api/?hop={hop_url_unique}"
-                response = self.request_client.get(url)
-                if response.status_code == 200 :
-                    bm_hop_model = bmapi.BMHopModel()
-                    json_content = response.json()
-                    bm_hop_model.from_json(json_content)
-
-                    new_hop.radar_chart_from_bmapi(bm_hop_model)
-
-                out_item_list.append(new_hop)
-                self.treated_item += 1
-
-            except : # Exception as e :
-                out_error_item_list.append(new_hop)
-                traceback.print_exc()
-                self.treated_item += 1
+            self.scrap_single(link, out_error_item_list, out_item_list)
+
+    def scrap_single(self, link : str, out_error_item_list : list[Hop], out_item_list : list[Hop]) -> None :
+        """Scraps a single hop page and appends the result to one of the output lists (threads flavor)."""
+        self.request_client = cast(requests.Session, self.request_client)
+        new_hop = Hop(link=link, id=make_stable_id(link))
+        new_hop.mark_extracted()
+
+        # The api call only depends on the link, so it's sent along with the page request instead of waiting for the page to be parsed
+        try :
+            response, api_response = self.fetch_many([link, self.get_api_url(link)])
+        except : # Exception as e :
+            out_error_item_list.append(new_hop)
+            traceback.print_exc()
+            self.mark_treated(failed=True)
+            return
+
+        # Critical error, reject data
+        if response.status != 200 :
+            new_hop.add_parsing_error(str(response))
+            out_error_item_list.append(new_hop)
+            self.mark_treated(failed=True)
+            return
+
+        try:
+            self.parse_page(new_hop, response.content)
+
+            if api_response.status == 200 :
+                bm_hop_model = bmapi.BMHopModel()
+                json_content = api_response.json()
+                bm_hop_model.from_json(json_content)
+
+                new_hop.radar_chart_from_bmapi(bm_hop_model)
+
+            out_item_list.append(new_hop)
+            self.notify_item_scraped(new_hop)
+            self.mark_treated(warnings=len(new_hop.parsing_errors or []))
+
+        except : # Exception as e :
+            out_error_item_list.append(new_hop)
+            traceback.print_exc()
+            self.mark_treated(failed=True)
+
+    def get_api_url(self, link : str) -> str :
+        # NOTE : We don't like to use the api directly, as this is not scraping.
+        # However we can use this to read the radar chart, which is the only option to read it.
+        # Another option would be to render the whole page with tools like Selenium, then perform OCR on the chart
+        hop_url_unique = link.split("/")[-2]
+        return f"https://beermaverick.com/api/?hop={hop_url_unique}"
+
+    def parse_page(self, hop : Hop, content : bytes) -> None :
+        """Parses raw page content into hop, either in place or in the parse executor (threads flavor)."""
+        with self.metrics.time("parse") :
+            if self.parse_executor != None :
+                hop.from_json(self.parse_executor.submit(parse_hop_page, hop.to_json(), content, self.html_backend.name).result())
+                return
+
+            with self.metrics.time("parse.html") :
+                parser = self.html_backend.parse(content)
+            self.parse_hop_item_from_page(parser, hop)
+
+    async def parse_page_async(self, hop : Hop, content : bytes) -> None :
+        """Parses raw page content into hop (asyncio flavor). With a parse executor, the event loop keeps serving other requests while parsing happens."""
+        if self.parse_executor != None :
+            with self.metrics.time("parse") :
+                hop.from_json(await asyncio.get_running_loop().run_in_executor(self.parse_executor, parse_hop_page, hop.to_json(), content, self.html_backend.name))
+            return
+
+        self.parse_page(hop, content)
 
     def parse_hop_item_from_page(self, parser : bs4.BeautifulSoup, hop : Hop) -> None :
-        name_node = parser.find("h1", attrs={"class" : "entry-title"})
+        # Page is walked once, sections are then read from the index
+        with self.metrics.time("parse.index") :
+            index = PageIndex(parser)
+        name_node = index.find_title("entry-title")
         if not name_node:
             hop.add_parsing_error(f"Could not retrieve hop name for link {hop.link}")
             # retrieving name from the link itself
@@ -279,12 +277,12 @@ class HopScraper(BaseScraper[Hop]) :
             hop.name = self.format_text(name_node.text).replace(" Hop", "").strip()
 
         success = True
-        success &= self.parse_basics_section(parser, hop)
-        success &= self.parse_origin_section(parser, hop)
-        success &= self.parse_flavor_and_aroma_section(parser, hop)
-        success &= self.parse_brewing_values(parser, hop)
-        success &= self.parse_beer_style(parser, hop)
-        success &= self.parse_hop_substitution(parser, hop)
+        success &= self.parse_section("basics", self.parse_basics_section, index, hop)
+        success &= self.parse_section("origin", self.parse_origin_section, index, hop)
+        success &= self.parse_section("flavor_and_aroma", self.parse_flavor_and_aroma_section, index, hop)
+        success &= self.parse_section("brewing_values", self.parse_brewing_values, index, hop)
+        success &= self.parse_section("beer_style", self.parse_beer_style, index, hop)
+        success &= self.parse_section("hop_substitution", self.parse_hop_substitution, index, hop)
 
         if len(hop.substitutes) != 0 :
             for i in range(0, len(hop.substitutes)) :
@@ -294,19 +292,20 @@ class HopScraper(BaseScraper[Hop]) :
         if not success :
             hop.add_parsing_error("Some parts of this Hop failed to be read")
 
-    def parse_hop_substitution(self, parser : bs4.BeautifulSoup, hop : Hop) -> bool :
+    def parse_hop_substitution(self, index : PageIndex, hop : Hop) -> bool :
         header_name = "Hop Substitutions"
-        header = self.find_header_by_name(parser, header_name)
+        header = index.find_header(header_name)
         if not header :
             hop.add_parsing_error(f"Could not find {header_name} header")
             return False
 
-        p_node : bs4.ResultSet[bs4.PageElement] = header.find_all_next("p")
-        experienced_brewer_node : list[bs4.PageElement] = [x for x in p_node if "Experienced brewers have chosen the following hop" in x.text] # type: ignore
+        # Walking paragraphs one by one stops at the first match, instead of collecting all of them until the end of the page
+        experienced_brewer_node : Optional[bs4.Tag] = header.find_next("p") #type: ignore
+        while experienced_brewer_node != None and not "Experienced brewers have chosen the following hop" in experienced_brewer_node.text :
+            experienced_brewer_node = experienced_brewer_node.find_next("p") #type: ignore
         if not experienced_brewer_node :
             hop.add_parsing_error("Could not isolate substitution list")
             return False
-        experienced_brewer_node : bs4.PageElement = experienced_brewer_node[0] #type: ignore
 
         substitution_list_node : bs4.Tag = experienced_brewer_node.find_next_sibling("ul") # type: ignore
         bullet_nodes : list[bs4.Tag] = substitution_list_node.find_all("li")
@@ -316,9 +315,9 @@ class HopScraper(BaseScraper[Hop]) :
 
         return True
 
-    def parse_beer_style(self, parser : bs4.BeautifulSoup, hop : Hop) -> bool :
+    def parse_beer_style(self, index : PageIndex, hop : Hop) -> bool :
         header_name = "Beer Styles"
-        header = self.find_header_by_name(parser, header_name)
+        header = index.find_header(header_name)
         if not header :
             hop.add_parsing_error(f"Could not find {header_name} header")
             return False
@@ -331,13 +330,6 @@ class HopScraper(BaseScraper[Hop]) :
             hop.beer_styles.append(style.text.strip())    #type: ignore
         return True
 
-    def find_header_by_name(self, parser : bs4.BeautifulSoup, name : str) -> Optional[bs4.Tag] :
-        headers : list[bs4.Tag] = parser.find_all("h2")
-        header = [x for x in headers if name in x.text]
-        if len(header) == 0 :
-            return None
-        return header[0]
-
     def parse_numeric_range(self, td : bs4.Tag, range : NumericRange, unit_char : str = "%") -> bool :
         values = td.contents[0].text.rstrip(unit_char).split("-")
 
@@ -346,11 +338,11 @@ class HopScraper(BaseScraper[Hop]) :
 
         try :
             if len(values) == 1 :
-                range.min.value = float(values[0].strip())
-                range.max.value = range.min.value
+                range.min = float(values[0].strip())
+                range.max = range.min
             if len(values) == 2 :
-                range.min.value = float(values[0].strip())
-                range.max.value = float(values[1].strip())
+                range.min = float(values[0].strip())
+                range.max = float(values[1].strip())
         # Might fail if one of the values is not convertible to float (happens with some default values)
         # In some cases, numerical values are replaced by the "Unknown" keyword, which makes parsing more difficult
         except :
@@ -360,86 +352,50 @@ class HopScraper(BaseScraper[Hop]) :
     def parse_percentage_value(self, td : bs4.Tag, range : NumericRange) -> bool :
         return self.parse_numeric_range(td, range, "%")
 
-    def parse_brewing_values(self, parser : bs4.BeautifulSoup, hop : Hop) -> bool :
-        table = parser.find("table", attrs={"class" : "brewvalues"})
-        if not table :
+    def parse_brewing_values(self, index : PageIndex, hop : Hop) -> bool :
+        table_class = "brewvalues"
+        if not index.has_table(table_class) :
             hop.add_parsing_error("Could not parse brewing values")
             return False
 
-        tr_nodes :list[bs4.Tag] = table.find_all("tr") #type: ignore
-        for node in tr_nodes :                         #type: ignore
-            th : bs4.Tag = node.find("th")             #type: ignore
-            td : bs4.Tag = node.find("td")             #type: ignore
-
-            if not th or not td :
-                continue
-
-            if  "Alpha Acid % (AA)" in th.contents[0].text:
-                if not self.parse_percentage_value(td, hop.alpha_acids) :
-                    hop.add_parsing_error("Caught unexpected content for Alpha acids")
-                continue
-
-            if  "Beta Acid %" in th.contents[0].text:
-                if not self.parse_percentage_value(td, hop.beta_acids):
-                    hop.add_parsing_error("Caught unexpected content for Beta acids")
-                continue
-
-            if  "Alpha-Beta Ratio" in th.contents[0].text:
-                values = td.contents[0].text.split("-")
-                if len(values) < 1 or len(values) > 2 :
-                    hop.add_parsing_error("Caught unexpected content for Beta acids")
-                    continue
-                hop.alpha_beta_ratio.min.value = values[0].strip()
-                hop.alpha_beta_ratio.max.value = values[1].strip()
-                continue
-
-            if  "Hop Storage Index (HSI)" in th.contents[0].text:
-                values = td.contents[0].text.split("%")
-                hop.hop_storage_index = float(values[0].strip())
-                continue
-
-            if  "Co-Humulone as % of Alpha" in th.contents[0].text:
-                if not self.parse_percentage_value(td, hop.co_humulone_normalized) :
-                    hop.add_parsing_error("Caught unexpected content for Co-humulone")
-                continue
-
-            if "Total Oils (mL/100g)" in th.contents[0].text :
-                if not self.parse_numeric_range(td, hop.total_oils, "mL") :
-                    hop.add_parsing_error("Caught invalid format for total oils")
-                continue
-
-            if "Myrcene" in th.contents[0].text:
-                if not self.parse_percentage_value(td, hop.myrcene):
-                    hop.add_parsing_error("Caught invalid format for Myrcene")
-                continue
-
-            if "Humulene" in th.contents[0].text:
-                if not self.parse_percentage_value(td, hop.humulene):
-                    hop.add_parsing_error("Caught invalid format for Humulene")
-                continue
-
-            if "Caryophyllene" in th.contents[0].text:
-                if not self.parse_percentage_value(td, hop.caryophyllene):
-                    hop.add_parsing_error("Caught invalid format for Caryophyllene")
-                continue
-
-            if "Farnesene" in th.contents[0].text:
-                if not self.parse_percentage_value(td, hop.farnesene):
-                    hop.add_parsing_error("Caught invalid format for Farnesene")
-                continue
-
-            if "All Others" in th.contents[0].text:
-                if not self.parse_percentage_value(td, hop.other_oils) :
-                    hop.add_parsing_error("Caught invalid format for other oils")
-                continue
+        # Label, range to fill, unit and error message
+        numeric_rows : list[tuple[str, NumericRange, str, str]] = [
+            ("Alpha Acid % (AA)", hop.alpha_acids, "%", "Caught unexpected content for Alpha acids"),
+            ("Beta Acid %", hop.beta_acids, "%", "Caught unexpected content for Beta acids"),
+            ("Co-Humulone as % of Alpha", hop.co_humulone_normalized, "%", "Caught unexpected content for Co-humulone"),
+            ("Total Oils (mL/100g)", hop.total_oils, "mL", "Caught invalid format for total oils"),
+            ("Myrcene", hop.myrcene, "%", "Caught invalid format for Myrcene"),
+            ("Humulene", hop.humulene, "%", "Caught invalid format for Humulene"),
+            ("Caryophyllene", hop.caryophyllene, "%", "Caught invalid format for Caryophyllene"),
+            ("Farnesene", hop.farnesene, "%", "Caught invalid format for Farnesene"),
+            ("All Others", hop.other_oils, "%", "Caught invalid format for other oils")
+        ]
 
+        for label, range, unit_char, error_message in numeric_rows :
+            td : Optional[bs4.Tag] = index.find_row(label, table_class)
+            if td != None and not self.parse_numeric_range(td, range, unit_char) :
+                hop.add_parsing_error(error_message)
+
+        td = index.find_row("Alpha-Beta Ratio", table_class)
+        if td != None :
+            values = td.contents[0].text.split("-")
+            if len(values) < 1 or len(values) > 2 :
+                hop.add_parsing_error("Caught unexpected content for Beta acids")
+            else :
+                hop.alpha_beta_ratio.min = values[0].strip()
+                hop.alpha_beta_ratio.max = values[1].strip()
+
+        td = index.find_row("Hop Storage Index (HSI)", table_class)
+        if td != None :
+            values = td.contents[0].text.split("%")
+            hop.hop_storage_index = float(values[0].strip())
 
         return True
 
-    def parse_flavor_and_aroma_section(self, parser : bs4.BeautifulSoup, hop : Hop) -> bool :
+    def parse_flavor_and_aroma_section(self, index : PageIndex, hop : Hop) -> bool :
         header_name = "Flavor & Aroma Profile"
 
-        header = self.find_header_by_name(parser, header_name)
+        header = index.find_header(header_name)
         if not header :
             hop.add_parsing_error(f"Could not find {header_name} header")
             return False
@@ -470,9 +426,9 @@ class HopScraper(BaseScraper[Hop]) :
 
         return True
 
-    def parse_origin_section(self, parser : bs4.BeautifulSoup, hop : Hop) -> bool :
+    def parse_origin_section(self, index : PageIndex, hop : Hop) -> bool :
         header_name = "Origin"
-        header = self.find_header_by_name(parser, header_name)
+        header = index.find_header(header_name)
         if not header :
             hop.add_parsing_error(f"Could not find {header_name} header")
             return False
@@ -491,37 +447,34 @@ class HopScraper(BaseScraper[Hop]) :
 
         return True
 
-    def parse_basics_section(self, parser : bs4.BeautifulSoup, hop : Hop) -> bool :
-        all_th : list[bs4.Tag] = parser.find_all("th")
-        required = [
-            "Purpose:",
-            "Country:",
-            "International Code:",
-            "Cultivar/Brand ID:"
-        ]
+    def parse_basics_section(self, index : PageIndex, hop : Hop) -> bool :
+        td_node : Optional[bs4.Tag] = index.get_row("Purpose:")
+        if td_node != None :
+            a_node = td_node.find("a")
+            txt = self.format_text(a_node.contents[0].text) #type: ignore
+            hop.purpose = hop_attribute_from_str(txt)
 
-        for th in all_th :
-            content = th.contents[0].text
-            if not content in required :
-                continue
+        td_node = index.get_row("Country:")
+        if td_node != None :
+            hop.country = self.format_text(td_node.contents[0].text)
 
-            parent_node = th.parent
-            td_node : bs4.Tag = parent_node.find("td") #type: ignore
-            if content == required[0] :
-                a_node = td_node.find("a")
-                txt = self.format_text(a_node.contents[0].text) #type: ignore
-                hop.purpose = hop_attribute_from_str(txt)
+        td_node = index.get_row("International Code:")
+        if td_node != None :
+            hop.international_code = self.format_text(td_node.contents[0].text)
 
-            elif content == required[1] :
-                hop.country = td_node.contents[0].text
-                hop.country = self.format_text(hop.country)
+        td_node = index.get_row("Cultivar/Brand ID:")
+        if td_node != None :
+            hop.cultivar_id = self.format_text(td_node.contents[0].text)
 
-            elif content == required[2] :
-                hop.international_code = td_node.contents[0].text
-                hop.international_code = self.format_text(hop.international_code)
+        return True
 
-            elif content == required[3] :
-                hop.cultivar_id = td_node.contents[0].text
-                hop.cultivar_id = self.format_text(hop.cultivar_id)
 
-        return True
\ No newline at end of file
+def parse_hop_page(hop_content : dict[str, Any], page_content : bytes, html_backend : str = DEFAULT_HTML_BACKEND) -> dict[str, Any] :
+    """Parse executor entry point : module level so that it can be pickled and sent to worker processes.
+       Takes and returns serialized hops, as they are much cheaper to transfer than the objects (and don't need the http clients).
+       Html backend is passed by name, worker processes look it up on their side."""
+    hop = Hop()
+    hop.from_json(hop_content)
+    parser = get_html_backend(html_backend).parse(page_content)
+    HopScraper().parse_hop_item_from_page(parser, hop)
+    return hop.to_json()
@@ -1,38 +1,53 @@
 #!/usr/bin/python3
 from dataclasses import dataclass, field
+import os
 import sys
 import json
+import itertools
 from pathlib import Path
 import argparse
-import uuid
 
 import google.cloud.firestore as fstore         #type: ignore
 from google.cloud.exceptions import Conflict    #type: ignore
 from google.oauth2 import service_account       #type: ignore
 from google.auth.credentials import Credentials #type: ignore
 
-import time
 import requests
 from requests.adapters import HTTPAdapter
 
 from bs4 import BeautifulSoup
 import asyncio
-from typing import Any, TypeVar
+from typing import Any, Iterable, Optional, TypeVar
+from datetime import datetime, timezone
 
 from threading import Thread
+from concurrent.futures import ProcessPoolExecutor
 
 from urllib3 import Retry
 
 from .Models.Hop import Hop
 from .Models.Yeast import Yeast
+from .Models.ScapedObject import ScrapedObject
+from .Models.Catalogue import CatalogueIndex, UnresolvedReference, assign_stable_ids
 # from .Models import Water
 # from .Models import Fermentable
 
-from .Utils.parallel import spread_load_for_parallel
+from .Utils.parallel import resolve_num_jobs
 from .Utils.directories import Directories
 from .Utils.console import ConsoleChars
-
-from .ProgressBar import draw_progress_bar, print_buffer
+from .Utils.http import HttpResponse, RequestLimiter
+from .Utils.reconciliation import reconcile_cache
+from .Utils.ndjson import NdjsonWriter, read_ndjson_items, write_ndjson
+from .Utils.checkpoint import CheckpointJournal
+from .Utils.http_cache import CacheMode, ResponseCache, cache_mode_from_str
+from .Utils.link_resolver import LinkResolver
+from .Utils.firestore_upload import BulkUploader
+from .Utils.upload_manifest import UploadManifest
+from .Utils.html_backends import DEFAULT_HTML_BACKEND, HTML_BACKENDS, get_html_backend
+from .Utils.fixture_archive import FixtureArchive, rewrite_base_url
+from .Utils.columnar import hops_to_columns, write_columns, yeasts_to_columns
+
+from .Utils.progress import ProgressTracker, report_progress
 
 from .BaseScraper import BaseScraper
 from .HopScraper import HopScraper
@@ -40,67 +55,149 @@ from .YeastScraper import YeastScraper
 #from .FermentableScraper import FermentablePageScraper
 
 
-def retrieve_links_from_sitemap() -> list[str] :
+@dataclass
+class SitemapLink :
+    link : str
+    # Raw <lastmod> value as found in the sitemap (W3C datetime), None when the sitemap does not provide it
+    lastmod : Optional[str] = None
+
+    def get_lastmod_time(self) -> Optional[datetime] :
+        if not self.lastmod :
+            return None
+        try :
+            lastmod = datetime.fromisoformat(self.lastmod)
+        except ValueError :
+            return None
+        # Date only values come without any timezone information, assume UTC
+        if lastmod.tzinfo == None :
+            lastmod = lastmod.replace(tzinfo=timezone.utc)
+        return lastmod
+
+SITEMAP_URL = "https://beermaverick.com/beerm-sitemap.xml"
 
-    result = requests.get("https://beermaverick.com/beerm-sitemap.xml")
+def retrieve_links_from_sitemap(base_url_override : Optional[str] = None, recorder : Optional[FixtureArchive] = None) -> list[SitemapLink] :
+
+    result = requests.get(rewrite_base_url(SITEMAP_URL, base_url_override))
     if result.status_code != 200 :
         # Whoops !
         return []
 
     content = result.content
+    if recorder != None :
+        recorder.record(HttpResponse(url=SITEMAP_URL, status=result.status_code, headers=dict(result.headers), content=content))
+    return parse_sitemap(content)
+
+def parse_sitemap(content : str | bytes) -> list[SitemapLink] :
     soup = BeautifulSoup(content, features="xml")
 
-    all_links : list[str] = []
+    all_links : list[SitemapLink] = []
 
     for link in soup.find_all("loc", href=False) :
-        all_links.append(link.next)
+        # <loc> and <lastmod> are siblings within the same <url> node
+        lastmod_node = link.parent.find("lastmod")
+        lastmod = lastmod_node.text.strip() if lastmod_node else None
+        all_links.append(SitemapLink(link.next, lastmod))
     return all_links
 
-def cache_links(filepath: Path, links : list[str]) :
+def cache_links(filepath: Path, links : list[SitemapLink]) :
     with open(filepath, 'w') as file :
-        json.dump({"links" : links}, file, indent=4)
+        json.dump({"links" : [{"link" : x.link, "lastmod" : x.lastmod} for x in links]}, file, indent=4)
 
-def read_links_from_cache(filepath: Path) -> list[str]:
-    links : list[str] = []
+def read_links_from_cache(filepath: Path) -> list[SitemapLink]:
+    links : list[SitemapLink] = []
 
     if filepath.exists() :
         with open(filepath, 'r') as file :
-            links = json.load(file)["links"]
+            for item in json.load(file)["links"] :
+                # Older caches only stored the raw links
+                if isinstance(item, str) :
+                    links.append(SitemapLink(item))
+                else :
+                    links.append(SitemapLink(item["link"], item.get("lastmod")))
 
     return links
 
-def scrap_hops(hops_links : list[str], scraper : HopScraper, use_threads : bool = False, max_jobs : int = 0, force : bool = False) -> list[Hop]:
+def get_lastmods(links : list[SitemapLink]) -> dict[str, datetime] :
+    lastmods : dict[str, datetime] = {}
+    for link in links :
+        lastmod = link.get_lastmod_time()
+        if lastmod != None :
+            lastmods[link.link] = lastmod
+    return lastmods
+
+def is_outdated(item : ScrapedObject, lastmods : Optional[dict[str, datetime]], link : str) -> bool :
+    """Tells whether the page behind link changed since item was extracted from it.
+       Without any lastmod information, cached items are always considered up to date."""
+    if lastmods == None or not link in lastmods :
+        return False
+
+    extraction_time = item.get_extraction_time()
+    if extraction_time == None :
+        return True
+    return lastmods[link] > extraction_time
+
+def scrap_hops(hops_links : list[str], scraper : HopScraper, use_threads : bool = False, max_jobs : int = 0, force : bool = False,
+               lastmods : Optional[dict[str, datetime]] = None, output_format : str = "json", resume : bool = False) -> list[Hop]:
     # Retrieving Hops from cache
-    hops : list[Hop] = []
-    hops_filepath = Directories.EXTRACTED_DIR.joinpath("hops.json")
+    hops_filepath = Directories.EXTRACTED_DIR.joinpath(f"hops.{output_format}")
+
+    checkpoint = open_checkpoint(hops_filepath, resume)
+    cached_hops : Iterable[Hop] = [] if force else read_hops_from_cache(hops_filepath)
 
-    if not force:
-        hops = read_hops_from_cache(hops_filepath)
-        for hop in hops :
-            hops_links.remove(hop.link)
+    # Items recorded by an interrupted run come first as they are the most recent ones
+    cached_hops = itertools.chain(checkpoint.get_items(Hop), cached_hops)
+
+    # Pages changed since last extraction are scraped again, cached hops that vanished from the sitemap are dropped
+    reconciliation = reconcile_cache(hops_links, cached_hops, lambda x : x.link, lambda x : is_outdated(x, lastmods, x.link))
+    print(reconciliation.report("Hops"))
+    hops = reconciliation.to_keep
+    # Caches written by older versions hold random ids
+    assign_stable_ids(hops)
+    hops_links = reconciliation.to_scrape
 
     # Only scrap what's necessary to limit load of the server
+    stream_writer : Optional[NdjsonWriter] = None
     if len(hops_links) > 0 :
         print("Parsing hops.")
         report_loop_thread : Thread
-        progress_accessor = ScraperProgressAccessor(scraper)
-        report_loop_thread = Thread(target=report_progress_threaded, args=(progress_accessor, len(hops_links)))
+        scraper.progress.reset(len(hops_links))
+        report_loop_thread = Thread(target=report_progress, args=(scraper.progress,))
         report_loop_thread.start()
 
-        scraped_hops = _scrap_hops_from_website(hops_links, scraper, multi_threaded=use_threads, max_jobs=max_jobs)
-        hops += scraped_hops
+        # NDJSON output is streamed to disk as soon as each item is scraped, so that a crash doesn't lose anything.
+        # Items are still collected in memory as well : post-processing (catalogue index, upload, exports) needs all of them
+        stream_writer = open_extraction_stream(hops_filepath, scraper, hops) if output_format == "ndjson" else None
+        scraper.item_scraped_callbacks.append(lambda item : checkpoint.record(item.link, item.to_json()))
+
+        try :
+            scraped_hops = _scrap_hops_from_website(hops_links, scraper, multi_threaded=use_threads, max_jobs=max_jobs)
+            hops += scraped_hops
+        finally :
+            # Whatever happens, don't lose what has been scraped so far
+            checkpoint.close()
+            scraper.item_scraped_callbacks.clear()
+            # Releases the progress thread, even if scraping failed midway
+            scraper.progress.close()
+
+        if stream_writer :
+            close_extraction_stream(stream_writer, hops_filepath)
 
         report_loop_thread.join()
+        print(f"Hops scraping metrics : {scraper.metrics.snapshot()}")
     else :
         print("Hop parsing : no hop to parse, all done !")
-    write_hops_json_to_disk(hops_filepath, hops)
+
+    if not stream_writer :
+        write_hops_json_to_disk(hops_filepath, hops)
+
+    # Results are safely written, checkpoint is not needed anymore
+    checkpoint.clear()
 
 
     return hops
 
 def _scrap_hops_from_website(hop_links : list[str], scraper : HopScraper, multi_threaded : bool = False, max_jobs : int = -1) -> list[Hop] :
-    # Seems like running Tasks or threads is roughly equivalent in terms of performances
-    # Takes roughly 11-15 seconds for 318 hops with 40 - 100 tasks/threads
+    # Threads vs tasks, number of jobs and html backends are compared by Benchmarks/bench_crawl.py
     if multi_threaded :
         result = scraper.scrap(hop_links, max_jobs)
         if not result :
@@ -112,7 +209,11 @@ def _scrap_hops_from_website(hop_links : list[str], scraper : HopScraper, multi_
 
     return scraper.hops
 
-def read_hops_from_cache(filepath : Path) -> list[Hop] :
+def read_hops_from_cache(filepath : Path) -> Iterable[Hop] :
+    if filepath.suffix == ".ndjson" :
+        # Lazily read, leftovers of an interrupted run come first as they are the most recent ones
+        return itertools.chain(read_ndjson_items(get_partial_filepath(filepath), Hop), read_ndjson_items(filepath, Hop))
+
     hops : list[Hop] = []
     if filepath.exists():
         with open(filepath, 'r') as file :
@@ -125,6 +226,10 @@ def read_hops_from_cache(filepath : Path) -> list[Hop] :
     return hops
 
 def write_hops_json_to_disk(filepath : Path, hops : list[Hop]):
+    if filepath.suffix == ".ndjson" :
+        write_ndjson(filepath, (hop.to_json() for hop in hops))
+        return
+
     hops_list : list[dict[str, Any]] = []
     for hop in hops :
         hops_list.append(hop.to_json())
@@ -136,72 +241,70 @@ def write_hops_json_to_disk(filepath : Path, hops : list[Hop]):
         json.dump(json_content, file, indent=4)
 
 
-class ProgressReportAccessor:
-    def get(self) -> int :
-        return 0
-
-class ScraperProgressAccessor(ProgressReportAccessor):
-    scraper : BaseScraper[Any]
-    def __init__(self, scraper: BaseScraper[Any]) -> None:
-        self.scraper = scraper
-
-    def get(self) -> int:
-        return self.scraper.treated_item
-
-class AsyncSafeCounter(ProgressReportAccessor):
-    data : int = 0
-    locked : bool = False
-    def __init__(self, data : int = 0) -> None:
-        self.data = data
-
-    def get(self) -> int:
-        return self.data
-
-    def increment(self) :
-        while self.locked :
-            pass
-        self.locked = True
-        self.data += 1
-        self.locked = False
-
+def scrap_yeasts(yeasts_links : list[str], scraper : YeastScraper, use_threads : bool = False, max_jobs : int = 0, force : bool = False,
+                 lastmods : Optional[dict[str, datetime]] = None, output_format : str = "json", resume : bool = False) -> list[Yeast]:
+    # Retrieving Yeasts from cache
+    yeasts_filepath = Directories.EXTRACTED_DIR.joinpath(f"yeasts.{output_format}")
+    checkpoint = open_checkpoint(yeasts_filepath, resume)
+    cached_yeasts : Iterable[Yeast] = [] if force else read_yeasts_from_cache(yeasts_filepath)
 
-def scraper_elem_count_accessor(scraper : BaseScraper[Any]) -> int :
-    return scraper.treated_item
+    # Items recorded by an interrupted run come first as they are the most recent ones
+    cached_yeasts = itertools.chain(checkpoint.get_items(Yeast), cached_yeasts)
 
-def scrap_yeasts(yeasts_links : list[str], scraper : YeastScraper, use_threads : bool = False, max_jobs : int = 0, force : bool = False) -> list[Yeast]:
-    # Retrieving Yeasts from cache
-    yeasts : list[Yeast] = []
-    yeasts_filepath = Directories.EXTRACTED_DIR.joinpath("yeasts.json")
-    if not force :
-        yeasts = read_yeasts_from_cache(yeasts_filepath)
-        for yeast in yeasts :
-            yeasts_links.remove(yeast.link)
+    # Pages changed since last extraction are scraped again, cached yeasts that vanished from the sitemap are dropped
+    reconciliation = reconcile_cache(yeasts_links, cached_yeasts, lambda x : x.link, lambda x : is_outdated(x, lastmods, x.link))
+    print(reconciliation.report("Yeasts"))
+    yeasts = reconciliation.to_keep
+    # Caches written by older versions hold random ids
+    assign_stable_ids(yeasts)
+    yeasts_links = reconciliation.to_scrape
 
 
 
     # Only scrap what's necessary to limit load of the server
+    stream_writer : Optional[NdjsonWriter] = None
     if len(yeasts_links) > 0 :
         print("Parsing yeasts.")
 
         report_loop_thread : Thread
-        progress_accessor = ScraperProgressAccessor(scraper)
-        report_loop_thread = Thread(target=report_progress_threaded, args=(progress_accessor, len(yeasts_links)))
+        scraper.progress.reset(len(yeasts_links))
+        report_loop_thread = Thread(target=report_progress, args=(scraper.progress,))
         report_loop_thread.start()
 
-        scraped_yeasts = _scrap_yeasts_from_website(yeasts_links, scraper, multi_threaded=use_threads, max_jobs=max_jobs)
-        yeasts += scraped_yeasts
+        # NDJSON output is streamed to disk as soon as each item is scraped, so that a crash doesn't lose anything.
+        # Items are still collected in memory as well : post-processing (catalogue index, upload, exports) needs all of them
+        stream_writer = open_extraction_stream(yeasts_filepath, scraper, yeasts) if output_format == "ndjson" else None
+        scraper.item_scraped_callbacks.append(lambda item : checkpoint.record(item.link, item.to_json()))
+
+        try :
+            scraped_yeasts = _scrap_yeasts_from_website(yeasts_links, scraper, multi_threaded=use_threads, max_jobs=max_jobs)
+            yeasts += scraped_yeasts
+        finally :
+            # Whatever happens, don't lose what has been scraped so far
+            checkpoint.close()
+            scraper.item_scraped_callbacks.clear()
+            # Releases the progress thread, even if scraping failed midway
+            scraper.progress.close()
+
+        if stream_writer :
+            close_extraction_stream(stream_writer, yeasts_filepath)
 
         report_loop_thread.join()
+        print(f"Yeasts scraping metrics : {scraper.metrics.snapshot()}")
     else :
         print("Yeast parsing : no yeast to parse, all done !")
-    write_yeasts_json_to_disk(yeasts_filepath, yeasts)
+
+    if not stream_writer :
+        write_yeasts_json_to_disk(yeasts_filepath, yeasts)
+
+    # Results are safely written, checkpoint is not needed anymore
+    checkpoint.clear()
 
 
     return yeasts
 
 def _scrap_yeasts_from_website(yeast_links : list[str], scraper : YeastScraper, multi_threaded : bool = False, max_jobs : int = -1) -> list[Yeast] :
-    # Seems like running Tasks or threads is roughly equivalent in terms of performances
-    # Takes roughly 11-15 seconds for 318 yeasts with 40 - 100 tasks/threads
+    # Threads vs tasks, number of jobs and html backends are compared by Benchmarks/bench_crawl.py
     if multi_threaded :
         result = scraper.scrap(yeast_links, max_jobs)
         if not result :
@@ -212,7 +315,11 @@ def _scrap_yeasts_from_website(yeast_links : list[str], scraper : YeastScraper,
             print("Whoops")
     return scraper.yeasts
 
-def read_yeasts_from_cache(filepath : Path) -> list[Yeast] :
+def read_yeasts_from_cache(filepath : Path) -> Iterable[Yeast] :
+    if filepath.suffix == ".ndjson" :
+        # Lazily read, leftovers of an interrupted run come first as they are the most recent ones
+        return itertools.chain(read_ndjson_items(get_partial_filepath(filepath), Yeast), read_ndjson_items(filepath, Yeast))
+
     yeasts : list[Yeast] = []
     if filepath.exists():
         with open(filepath, 'r') as file :
@@ -225,6 +332,10 @@ def read_yeasts_from_cache(filepath : Path) -> list[Yeast] :
     return yeasts
 
 def write_yeasts_json_to_disk(filepath : Path, yeasts : list[Yeast]):
+    if filepath.suffix == ".ndjson" :
+        write_ndjson(filepath, (yeast.to_json() for yeast in yeasts))
+        return
+
     yeasts_list : list[dict[str, Any]] = []
     for yeast in yeasts :
         yeasts_list.append(yeast.to_json())
@@ -235,24 +346,44 @@ def write_yeasts_json_to_disk(filepath : Path, yeasts : list[Yeast]):
     with open(filepath, "w") as file :
         json.dump(json_content, file, indent=4)
 
-def report_scrap_loop(scraper : BaseScraper[Any], links : list[str]) :
-    old_treated_elem_count = 0
-
-    # Give the scraper some time before it actually starts processing anything
-    time.sleep(0.5)
+def write_unresolved_references_to_disk(filepath : Path, unresolved : dict[str, list[UnresolvedReference]]) :
+    json_content = {category : [x.to_json() for x in references] for category, references in unresolved.items()}
+    with open(filepath, "w") as file :
+        json.dump(json_content, file, indent=4)
 
-    # Dummy line that'll get overwritten
-    print("", end="")
-    buffer = draw_progress_bar(0)
-    print_buffer(buffer)
-    while scraper.treated_item < len(links) :
+def write_profile_report(filepath : Path, scrapers : dict[str, BaseScraper[Any]]) :
+    json_content = {category : scraper.metrics.snapshot().to_json() for category, scraper in scrapers.items()}
+    with open(filepath, "w") as file :
+        json.dump(json_content, file, indent=4)
 
-        # New item added event !
-        if old_treated_elem_count != scraper.treated_item :
-            old_treated_elem_count = scraper.treated_item
-            percentage = round(old_treated_elem_count * 100 / len(links))
-            buffer = draw_progress_bar(percentage)
-            print_buffer(buffer)
+def get_partial_filepath(filepath : Path) -> Path :
+    return filepath.with_name(f"{filepath.name}.partial")
+
+def open_extraction_stream(filepath : Path, scraper : BaseScraper[Any], kept_items : list[Any]) -> NdjsonWriter :
+    """Starts a new partial NDJSON file, made of the items kept from cache, to which every scraped item is appended as soon as it's ready."""
+    writer = NdjsonWriter(get_partial_filepath(filepath))
+    for item in kept_items :
+        writer.write(item.to_json())
+    scraper.item_scraped_callbacks.append(lambda item : writer.write(item.to_json()))
+    return writer
+
+def close_extraction_stream(writer : NdjsonWriter, filepath : Path) :
+    """Partial file is complete : it replaces the previous extraction file."""
+    writer.close()
+    os.replace(writer.filepath, filepath)
+
+def get_checkpoint_filepath(filepath : Path) -> Path :
+    return filepath.with_name(f"{filepath.stem}.checkpoint.ndjson")
+
+def open_checkpoint(filepath : Path, resume : bool) -> CheckpointJournal :
+    """Every scraped item is recorded in a checkpoint journal, periodically appended to disk.
+       When resuming, the journal left by the previous (interrupted) run is loaded first."""
+    checkpoint = CheckpointJournal(get_checkpoint_filepath(filepath))
+    if resume :
+        checkpoint.load()
+        if len(checkpoint.completed) > 0 :
+            print(f"Resuming from checkpoint : {len(checkpoint.completed)} items already scraped.")
+    return checkpoint
 
 @dataclass
 class CategorizedLinks :
@@ -310,24 +441,138 @@ def main(args : list[str]):
                         default="False",
                         help="If set, will try to upload data to distant database, if provided.")
 
+    parser.add_argument("--upload-all",
+                        required=False,
+                        default="False",
+                        help="If set, all items are uploaded. Otherwise only items which changed since the last upload (according to the upload manifest) are sent.")
+
+    parser.add_argument("--delete-vanished",
+                        required=False,
+                        default="False",
+                        help="If set, documents uploaded previously whose item is no longer in the catalogue are deleted from the remote database.")
+
+    parser.add_argument("--max-in-flight",
+                        required=False,
+                        default=0,
+                        help="Maximum number of concurrent http requests, shared by all scrapers. Set to 0 by default (no limit other than the number of jobs).")
+
+    parser.add_argument("--rps",
+                        required=False,
+                        default=0,
+                        help="Maximum number of http requests per second sent to a single host. Set to 0 by default (no limit).")
+
+    parser.add_argument("--requests-per-item",
+                        required=False,
+                        default=4,
+                        help="Maximum number of concurrent secondary requests sent for a single item (hop api call, comparable yeasts redirections). "
+                             "Set to 4 by default, 1 sends them one after the other.")
+
+    parser.add_argument("--cache-mode",
+                        required=False,
+                        default=CacheMode.Refresh.value,
+                        choices=[x.value for x in CacheMode],
+                        help="Http response cache behavior. \"refresh\" (default) revalidates cached responses with conditional requests, "
+                             "\"read-only\" serves cached responses without contacting the server and \"off\" disables the cache.")
+
+    parser.add_argument("--cache-max-size",
+                        required=False,
+                        default=512,
+                        help="Maximum size of the http response cache, in MB. Least recently used responses are evicted above this size.")
+
+    parser.add_argument("--parse-workers",
+                        required=False,
+                        default=0,
+                        help="Number of worker processes used to parse html pages, fetching stays on the main process. "
+                             "Set to 0 by default : pages are parsed where they are fetched. Set to -1 to use one process per CPU core.")
+
+    parser.add_argument("--html-backend",
+                        required=False,
+                        default=DEFAULT_HTML_BACKEND,
+                        choices=list(HTML_BACKENDS.keys()),
+                        help="Html parser used to read pages, all of them extract the same data. \"html.parser\" (default) needs no extra dependency, "
+                             "\"lxml\" is faster and \"selectolax\" is the fastest one (requires the selectolax package). "
+                             "See Sources/Benchmarks/bench_html_backends.py.")
+
+    parser.add_argument("--output-format",
+                        required=False,
+                        default="json",
+                        choices=["json", "ndjson"],
+                        help="Format of extracted and processed catalogues. \"ndjson\" writes one item per line, as soon as it's scraped.")
+
+    parser.add_argument("-r","--resume",
+                        required=False,
+                        default="False",
+                        help="If set, items recorded in the checkpoint journal of a previously interrupted run are reused instead of being scraped again.")
+
+    parser.add_argument("-i","--incremental",
+                        required=False,
+                        default="False",
+                        help="If set, sitemap is downloaded again and only pages modified (according to sitemap's lastmod) since they were last extracted are scraped again.")
+
+    parser.add_argument("--record",
+                        required=False,
+                        default="",
+                        help="Path of a fixture archive (zip) receiving every response fetched during this run (sitemap, pages, api calls, redirections). "
+                             "Serve it with Sources/Benchmarks/replay_server.py to run the scrapers offline. "
+                             "Items reused from the extraction cache aren't fetched, use along with --force to record the whole site.")
+
+    parser.add_argument("--replay-url",
+                        required=False,
+                        default="",
+                        help="Base url (e.g. http://127.0.0.1:8080) of a replay server to which all requests are sent instead of the website.")
+
+    parser.add_argument("--profile-report",
+                        required=False,
+                        default="",
+                        help="Path of a JSON file receiving per request (dns, connect, ttfb, body) and per parse phase timings of the scraping : "
+                             "count, mean, p50/p95/p99 and histogram. Page sections are only timed when parsing in process (--parse-workers 0).")
+
+    parser.add_argument("--columnar-export",
+                        required=False,
+                        default="False",
+                        help="If set, processed hops and yeasts are also exported as columnar arrays (hops.npz and yeasts.npz, next to the processed json files) "
+                             "for vectorised statistical analysis. Requires the numpy package. See Sources/Utils/columnar.py.")
+
     params = parser.parse_args(args[1:])
     max_jobs = int(params.jobs)
+    max_in_flight = int(params.max_in_flight)
+    requests_per_second = float(params.rps)
+    requests_per_item = int(params.requests_per_item)
+    cache_mode = cache_mode_from_str(params.cache_mode)
+    cache_max_size = int(params.cache_max_size) * 1024 * 1024
     use_threads = params.thread.lower() == "true"
     force = params.force.lower() == "true"
     upload = params.upload.lower() == "true"
+    upload_all = params.upload_all.lower() == "true"
+    delete_vanished = params.delete_vanished.lower() == "true"
+    incremental = params.incremental.lower() == "true"
+    output_format : str = params.output_format
+    resume = params.resume.lower() == "true"
+    parse_workers = int(params.parse_workers)
+    html_backend = get_html_backend(params.html_backend)
+    columnar_export = params.columnar_export.lower() == "true"
+    profile_report_filepath = Path(params.profile_report) if params.profile_report != "" else None
+    recorder = FixtureArchive(Path(params.record)) if params.record != "" else None
+    base_url_override : Optional[str] = params.replay_url if params.replay_url != "" else None
 
     Directories.ensure_directory_exists(Directories.EXTRACTED_DIR)
     Directories.ensure_directory_exists(Directories.PROCESSED_DIR)
 
     link_cached_file = Directories.EXTRACTED_DIR.joinpath("links.json")
-    links = read_links_from_cache(link_cached_file)
+    sitemap_links = read_links_from_cache(link_cached_file)
+
+    # Incremental mode needs fresh lastmod values
+    # Recording a run needs the sitemap in the archive, so that replayed runs can fetch it too
+    if len(sitemap_links) == 0 or incremental or recorder != None :
+        fresh_links = retrieve_links_from_sitemap(base_url_override, recorder)
+        if len(fresh_links) != 0 :
+            sitemap_links = fresh_links
+            cache_links(link_cached_file, sitemap_links)
 
-    if len(links) == 0 :
-        links = retrieve_links_from_sitemap()
-        cache_links(link_cached_file, links)
+    lastmods = get_lastmods(sitemap_links) if incremental else None
 
     # Preprocess links list
-    categorized_links = split_links_by_category(links)
+    categorized_links = split_links_by_category([x.link for x in sitemap_links])
 
     sync_http_client = requests.Session()
 
@@ -340,15 +585,43 @@ def main(args : list[str]):
     )
     sync_http_client.adapters.clear()
     sync_http_client.mount("https://", HTTPAdapter(max_retries=retry_strategy))
-
-    hop_scraper = HopScraper(request_client=sync_http_client)
-    yeast_scraper = YeastScraper(request_client=sync_http_client)
+    # Replay servers are plain http
+    sync_http_client.mount("http://", HTTPAdapter(max_retries=retry_strategy))
+
+    # Single budget for all http traffic, whatever the scraper
+    limiter = RequestLimiter(max_in_flight=max_in_flight, requests_per_second=requests_per_second)
+
+    # Both scrapers share the same http cache as well
+    response_cache = ResponseCache(Directories.HTTP_CACHE_DIR, cache_mode, cache_max_size)
+
+    hop_scraper = HopScraper(request_client=sync_http_client, limiter=limiter, response_cache=response_cache)
+    yeast_scraper = YeastScraper(request_client=sync_http_client, limiter=limiter, response_cache=response_cache)
+    hop_scraper.html_backend = html_backend
+    yeast_scraper.html_backend = html_backend
+    hop_scraper.max_requests_per_item = requests_per_item
+    yeast_scraper.max_requests_per_item = requests_per_item
+    for scraper in [hop_scraper, yeast_scraper] :
+        scraper.recorder = recorder
+        scraper.base_url_override = base_url_override
+
+    # Parsing is CPU bound : when asked for, it's offloaded to worker processes so that it scales with cores
+    parse_executor : Optional[ProcessPoolExecutor] = None
+    if parse_workers != 0 :
+        parse_executor = ProcessPoolExecutor(max_workers=resolve_num_jobs(parse_workers))
+        hop_scraper.parse_executor = parse_executor
+        yeast_scraper.parse_executor = parse_executor
+
+    # Comparable yeasts links resolved by previous runs follow the http cache policy : not used at all when it's off,
+    # used but not updated in read-only mode.
+    yeast_scraper.link_resolver = LinkResolver(Directories.CACHE_DIR.joinpath("comparable_yeasts_links.json"))
+    if cache_mode != CacheMode.Off :
+        yeast_scraper.link_resolver.load()
 
     ##################################################################
     ########################## Hops parsing ##########################
     ##################################################################
 
-    hops = scrap_hops(categorized_links.hops, hop_scraper, use_threads, max_jobs, force)
+    hops = scrap_hops(categorized_links.hops, hop_scraper, use_threads, max_jobs, force, lastmods, output_format, resume)
 
     ##################################################################
     ######################## Yeasts parsing ##########################
@@ -356,68 +629,93 @@ def main(args : list[str]):
 
     # Share the session
     yeast_scraper.async_client = hop_scraper.async_client
-    yeasts = scrap_yeasts(categorized_links.yeasts, yeast_scraper, use_threads, max_jobs, force)
+    yeasts = scrap_yeasts(categorized_links.yeasts, yeast_scraper, use_threads, max_jobs, force, lastmods, output_format, resume)
+
+    link_resolver = yeast_scraper.link_resolver
+    print(f"Comparable yeasts links : {link_resolver.misses} resolved, {link_resolver.hits} already known, {link_resolver.coalesced} coalesced with a pending resolution")
+    if cache_mode == CacheMode.Refresh :
+        link_resolver.save()
+
+    if recorder != None :
+        recorder.save()
+        print(f"Recorded {len(recorder)} responses to {recorder.filepath}")
+
+    if profile_report_filepath :
+        write_profile_report(profile_report_filepath, {"hops" : hop_scraper, "yeasts" : yeast_scraper})
+        print(f"Profile report written to {profile_report_filepath}")
+
+    hop_scraper.shutdown()
+    yeast_scraper.shutdown()
+    if parse_executor :
+        parse_executor.shutdown()
 
 
     ##################################################################
-    ######################## Yeasts parsing ##########################
+    ###################### Hops post-processing ######################
     ##################################################################
-    for hop in hops :
-        if hop.id == "" :
-            hop.id = str(uuid.uuid4())
+    # Same page, same id : rescraping doesn't duplicate documents
+    assign_stable_ids(hops)
 
-    for hop in hops :
-        for i in range(0, len(hop.substitutes)):
-            # Data originally contains a link that points to the substitute hop,
-            # we'll change that for its UUID instead, which is closer to what we'll find in a regular database
-            linked_hop = hop.substitutes[i]
-            target = [item for item in hops if item.link == linked_hop]
-            if len(target) != 0 :
-                hop.substitutes[i] = target[0].id
+    # Data originally contains links that point to the substitute hops,
+    # we'll change them for their UUID instead, which is closer to what we'll find in a regular database
+    hops_index = CatalogueIndex(hops)
+    unresolved_hops = hops_index.resolve_references(hops, lambda x : x.substitutes)
 
-    write_hops_json_to_disk(Directories.PROCESSED_DIR.joinpath("hops.json"), hops)
+    write_hops_json_to_disk(Directories.PROCESSED_DIR.joinpath(f"hops.{output_format}"), hops)
 
 
     ##################################################################
     ##################### Yeasts post-processing #####################
     ##################################################################
 
-    for yeast in yeasts :
-        if yeast.id == "" :
-            yeast.id = str(uuid.uuid4())
+    assign_stable_ids(yeasts)
 
-    for yeast in yeasts :
-        for i in range(0, len(yeast.comparable_yeasts)):
-            # Data originally contains a link that points to the substitute hop,
-            # we'll change that for its UUID instead, which is closer to what we'll find in a regular database
-            linked_yeast = yeast.comparable_yeasts[i]
-            target = [item for item in yeasts if item.link == linked_yeast]
-            if len(target) != 0 :
-                yeast.comparable_yeasts[i] = target[0].id
-            else :
-                # We are stumbling on "bad" links : for some linked yeasts, there are issues with the website api calls and redirection did not work
-                # So we'll need to find a solution for that.
-                print(f"Yeast : \"{yeast.name}\" with link : {yeast.link} has issues in comparable yeasts : \"{linked_yeast}\"")
+    # We are stumbling on "bad" links : for some linked yeasts, there are issues with the website api calls and redirection did not work
+    # Those are reported in the unresolved references file.
+    yeasts_index = CatalogueIndex(yeasts)
+    unresolved_yeasts = yeasts_index.resolve_references(yeasts, lambda x : x.comparable_yeasts)
+
+    write_unresolved_references_to_disk(Directories.PROCESSED_DIR.joinpath("unresolved_references.json"),
+                                        {"hops" : unresolved_hops, "yeasts" : unresolved_yeasts})
+    print(f"Unresolved references : {len(unresolved_hops)} in hops substitutes, {len(unresolved_yeasts)} in comparable yeasts.")
 
     print("Dumping post-processed yeasts to disk.")
-    write_yeasts_json_to_disk(Directories.PROCESSED_DIR.joinpath("yeasts.json"), yeasts)
+    write_yeasts_json_to_disk(Directories.PROCESSED_DIR.joinpath(f"yeasts.{output_format}"), yeasts)
     print("-> Ok.")
 
+    if columnar_export :
+        print("Exporting columnar catalogues.")
+        write_columns(Directories.PROCESSED_DIR.joinpath("hops.npz"), hops_to_columns(hops))
+        write_columns(Directories.PROCESSED_DIR.joinpath("yeasts.npz"), yeasts_to_columns(yeasts))
+        print("-> Ok.")
+
     ##################################################################
     ########################### Data upload ##########################
     ##################################################################
 
-    service_account_filepath = Directories.SECRETS_DIR.joinpath("service_account.json")
-    if not service_account_filepath.exists() :
+    service_account_filepath : Optional[Path] = Directories.SECRETS_DIR.joinpath("service_account.json")
+    upload_manifest = UploadManifest(Directories.CACHE_DIR.joinpath("upload_manifest.json"))
+
+    # The Firestore client targets the emulator when this one is set, no need for a service account then
+    if "FIRESTORE_EMULATOR_HOST" in os.environ :
+        service_account_filepath = None
+        # Don't mix up what was sent to the emulator with what's on the real database
+        upload_manifest = UploadManifest(Directories.CACHE_DIR.joinpath("upload_manifest_emulator.json"))
+    elif not service_account_filepath.exists() : #type: ignore
         print(f"/!\\ Warning : service account file does not exist at location : {service_account_filepath}. Cannot upload data to remote db.")
         return 1
 
     # Start bulk upload
     if upload :
+        # Loaded even when uploading everything : it's what tells which documents vanished since previous uploads
+        upload_manifest.load()
         asyncio.run(upload_all_data_async(service_account_filepath,
                                         hops,
                                         yeasts,
-                                        max_jobs))
+                                        max_jobs,
+                                        upload_manifest,
+                                        delete_vanished,
+                                        upload_all))
     else :
         print("Upload phase skipped.")
 
@@ -430,81 +728,61 @@ def main(args : list[str]):
     return 0
 
 
-async def upload_all_data_async(sa_filepath : Path, hops : list[Hop], yeasts : list[Yeast], max_jobs : int) :
+async def upload_all_data_async(sa_filepath : Optional[Path], hops : list[Hop], yeasts : list[Yeast], max_jobs : int,
+                                manifest : UploadManifest, delete_vanished : bool = False, upload_all : bool = False) :
     print(ConsoleChars.bd("\nData Upload") + ": Acquiring credentials for remote services ...")
-    credentials = service_account.Credentials.from_service_account_file() #type: ignore
-    fs_client = fstore.AsyncClient("druids-corner-cloud", credentials=credentials)
+    if sa_filepath != None :
+        credentials = service_account.Credentials.from_service_account_file(sa_filepath) #type: ignore
+        fs_client = fstore.AsyncClient("druids-corner-cloud", credentials=credentials)
+    else :
+        # Firestore emulator (FIRESTORE_EMULATOR_HOST), no credentials needed
+        fs_client = fstore.AsyncClient("druids-corner-cloud")
     hopsDb = fs_client.collection("bmHops")                                         #type: ignore
     yeastsDb = fs_client.collection("bmYeasts")
 
+    # Batches are committed concurrently, -j drives how many of them are in flight
+    uploader = BulkUploader(fs_client, max_concurrent_batches=max_jobs if max_jobs > 0 else 8)
+
     print("Uploading data to remote database ...")
     print("Uploading hops ...")
-    tasks_input_list = spread_load_for_parallel(hops, max_jobs)
-    await upload_bulk_item_dispatch_async(tasks_input_list, hopsDb, len(hops))
+    await upload_collection_async(uploader, hopsDb, "bmHops", hops, manifest, delete_vanished, upload_all)
     print("-> Ok.")
 
     print("Uploading yeasts ...")
-    tasks_input_list = spread_load_for_parallel(yeasts, max_jobs)
-    await upload_bulk_item_dispatch_async(tasks_input_list, yeastsDb, len(yeasts))
+    await upload_collection_async(uploader, yeastsDb, "bmYeasts", yeasts, manifest, delete_vanished, upload_all)
     print("-> Ok.")
 
 
-def report_progress_threaded(accessor : ProgressReportAccessor, total_elem_count : int = 0) :
-    old_treated_elem_count = 0
-
-    # Give the scraper some time before it actually starts processing anything
-    time.sleep(0.5)
-
-    # Dummy line that'll get overwritten
-    print("", end="")
-    buffer = draw_progress_bar(0)
-    print_buffer(buffer)
-    while accessor.get() < total_elem_count :
-
-        # New item added event !
-        if old_treated_elem_count != accessor.get() :
-            old_treated_elem_count = accessor.get()
-            percentage = round(old_treated_elem_count * 100 / total_elem_count)
-            buffer = draw_progress_bar(percentage)
-            print_buffer(buffer)
-
 T = TypeVar("T", Hop, Yeast)
-async def upload_bulk_item_dispatch_async(tasks_input_list : list[list[T]], db : fstore.AsyncCollectionReference, total_elem_count : int = 0) :
-    """Dispatches input task matrix to individual async tasks"""
+async def upload_collection_async(uploader : BulkUploader, db : fstore.AsyncCollectionReference, collection_name : str, items : list[T],
+                                  manifest : UploadManifest, delete_vanished : bool = False, upload_all : bool = False) :
+    """Uploads new and modified items to db in batches (see BulkUploader), manifest tells which ones were already uploaded as is.
+       upload_all uploads every item, modified or not. Documents of items which are no longer there are deleted if delete_vanished is set."""
+    diff = manifest.diff(collection_name, ((item.id, item.to_json()) for item in items), upload_all)
+    print(diff.report(collection_name))
+    to_delete = diff.to_delete if delete_vanished else []
+
     report_loop_thread : Thread
-    async_progress_accessor = AsyncSafeCounter()
-    report_loop_thread = Thread(target=report_progress_threaded, args=(async_progress_accessor, total_elem_count))
+    progress = ProgressTracker(len(diff.to_write) + len(to_delete))
+    report_loop_thread = Thread(target=report_progress, args=(progress,))
     report_loop_thread.start()
 
-    async with asyncio.TaskGroup() as tg :
-        for inputs in tasks_input_list :
-            tg.create_task(upload_item_async(inputs, db, async_progress_accessor))
-
-    report_loop_thread.join()
-
-async def upload_item_async(items : list[T], db : fstore.AsyncCollectionReference, progress_accessor : AsyncSafeCounter) :
-    """Uploads a single item list, using internal event loop."""
-
-    # Hints : https://clemfournier.medium.com/make-crud-operations-on-firebase-firestore-in-python-d51ab6aa98af
-    for item in items :
-        try :
-            doc_ref = await db.document(item.id).get()
-            if doc_ref.exists :
-                # Replace document
-                write_option = fstore.WriteOption()
-                await db.document(item.id).update(item.to_json(), option=write_option)
-            else :
-                await db.add(item.to_json(), document_id = item.id)
-
-        except Exception as e:
-            # Item already exist
-            print(e)
-            pass
-        # Bump the uploaded items count safely (async safe)
-        progress_accessor.increment()
-
-
-
+    try :
+        report = await uploader.upload(db, diff.to_write, progress.advance)
+        delete_report = await uploader.delete(db, to_delete, progress.advance)
+    finally :
+        progress.close()
+        report_loop_thread.join()
+    print(report)
+    if len(to_delete) != 0 :
+        print(delete_report)
+    failed = report.failed + delete_report.failed
+    if len(failed) != 0 :
+        print(f"/!\\ Warning : some documents could not be uploaded : {failed}")
+
+    # Saved after each collection, so that an interrupted upload doesn't send everything again
+    manifest.record(collection_name, diff, to_delete, failed)
+    manifest.save()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,106 @@
+import re
+import uuid
+from urllib.parse import urlsplit, urlunsplit
+from dataclasses import dataclass, field
+from typing import Any, Callable, Generic, Optional, Protocol, TypeVar
+
+from .Jsonable import Jsonable
+
+
+class CatalogueItem(Protocol) :
+    """Anything that can be indexed in a catalogue (Hop, Yeast, ...)"""
+    id : str
+    name : str
+    link : str
+
+
+T = TypeVar("T", bound=CatalogueItem)
+
+def normalize_name(name : str) -> str :
+    """Lower case, alphanumeric only version of a name, so that "Citra®" and "citra" point to the same item."""
+    return re.sub(r"[^a-z0-9]", "", name.lower())
+
+def canonicalize_link(link : str) -> str :
+    """Scheme and host in lower case, https, trailing slash on the path, no fragment :
+       "http://BeerMaverick.com/hop/citra" and "https://beermaverick.com/hop/citra/" are the same page."""
+    parts = urlsplit(link.strip())
+    scheme = "https" if parts.scheme.lower() in ["http", "https"] else parts.scheme.lower()
+    path = parts.path if parts.path.endswith("/") else parts.path + "/"
+    return urlunsplit((scheme, parts.netloc.lower(), path, parts.query, ""))
+
+def make_stable_id(link : str) -> str :
+    """Deterministic id of an item, derived from its canonical link : scraping the same page again always gives the same id,
+       so that documents are updated in place (remote database, caches, upload manifest) instead of being duplicated."""
+    return str(uuid.uuid5(uuid.NAMESPACE_URL, canonicalize_link(link)))
+
+def assign_stable_ids(items : list[T]) -> None :
+    """Gives their stable id to items (e.g. read from caches written with random ids), items without link keep theirs (or get a random one)."""
+    for item in items :
+        if item.link != "" :
+            item.id = make_stable_id(item.link)
+        elif item.id == "" :
+            item.id = str(uuid.uuid4())
+
+
+@dataclass
+class UnresolvedReference(Jsonable) :
+    """A reference (link) found in an item which does not point to any known item of the catalogue."""
+    item_id : str       = field(default_factory=str)
+    item_name : str     = field(default_factory=str)
+    item_link : str     = field(default_factory=str)
+    reference : str     = field(default_factory=str)
+
+    def to_json(self) -> dict[str, Any]:
+        return {
+            "itemId" : self.item_id,
+            "itemName" : self.item_name,
+            "itemLink" : self.item_link,
+            "reference" : self.reference
+        }
+
+    def from_json(self, content: dict[str, Any]) -> None:
+        self.item_id = self._read_prop("itemId", content, "")
+        self.item_name = self._read_prop("itemName", content, "")
+        self.item_link = self._read_prop("itemLink", content, "")
+        self.reference = self._read_prop("reference", content, "")
+
+
+class CatalogueIndex(Generic[T]) :
+    """Indexes a catalogue of items by link, by id and by normalized name, for constant time lookups.
+       When several items share the same key, the first one wins."""
+    by_link : dict[str, T]
+    by_id : dict[str, T]
+    by_name : dict[str, T]
+
+    def __init__(self, items : list[T]) -> None:
+        self.by_link = {}
+        self.by_id = {}
+        self.by_name = {}
+        for item in items :
+            self.by_link.setdefault(item.link, item)
+            self.by_id.setdefault(item.id, item)
+            self.by_name.setdefault(normalize_name(item.name), item)
+
+    def find_by_link(self, link : str) -> Optional[T] :
+        return self.by_link.get(link)
+
+    def find_by_id(self, id : str) -> Optional[T] :
+        return self.by_id.get(id)
+
+    def find_by_name(self, name : str) -> Optional[T] :
+        return self.by_name.get(normalize_name(name))
+
+    def resolve_references(self, items : list[T], get_references : Callable[[T], list[str]]) -> list[UnresolvedReference] :
+        """Replaces, in place, every link returned by get_references by the id of the item it points to.
+           This is done in a single pass over all references. Links that can't be resolved are left untouched and reported."""
+        unresolved : list[UnresolvedReference] = []
+        for item in items :
+            references = get_references(item)
+            for i in range(0, len(references)) :
+                target = self.by_link.get(references[i])
+                # Not "!= None" : that would go through the items __eq__
+                if target is not None :
+                    references[i] = target.id
+                else :
+                    unresolved.append(UnresolvedReference(item.id, item.name, item.link, references[i]))
+        return unresolved
@@ -30,7 +30,7 @@ def hop_attribute_from_str(input : str) -> HopAttribute :
             return HopAttribute.Hybrid
 
 
-@dataclass
+@dataclass(slots=True)
 class RadarChart(Jsonable) :
     citrus : int            = field(default=0)
     tropical_fruit : int    = field(default=0)
@@ -67,7 +67,9 @@ class RadarChart(Jsonable) :
         self.resinous = self._read_prop("resinous", content, 0)
 
 
-@dataclass
+# Slotted : no __dict__ per hop, whole catalogues are kept in memory.
+# slots=True rebuilds the class, which zero argument super() doesn't know about : hence the explicit super(Hop, self) below.
+@dataclass(slots=True)
 class Hop(ScrapedObject) :
     # Basic characteristics
     name : str                  = field(default_factory=str)
@@ -113,7 +115,7 @@ class Hop(ScrapedObject) :
         other = cast(Hop, other)
         self = cast(Hop, self)
         identical = True
-        identical &= super().__eq__(other)
+        identical &= super(Hop, self).__eq__(other)
         identical &= self.id == other.id
         identical &= self.name ==  other.name
         identical &= self.link == other.link
@@ -170,11 +172,11 @@ class Hop(ScrapedObject) :
         }
 
         # Doing the parent at the end as it only contains the parsingErrors that we want to go to the end of the object
-        content.update(super().to_json())
+        content.update(super(Hop, self).to_json())
         return content
 
     def from_json(self, content : dict[str, Any]) -> None :
-        super().from_json(content)
+        super(Hop, self).from_json(content)
 
         self.name = self._read_prop("name", content, "")
         self.id = self._read_prop("id", content, "")
@@ -3,6 +3,8 @@ from typing import Any, Optional, Generic, TypeVar, Union, cast
 
 
 class Jsonable :
+    # Lets slotted subclasses do without a __dict__
+    __slots__ = ()
 
     T = TypeVar("T")
     def _read_prop(self, key : str, content : dict[str, T], default : T) -> T:
@@ -18,7 +20,7 @@ class Jsonable :
 
 T = TypeVar("T")
 
-@dataclass
+@dataclass(slots=True)
 class JsonProperty(Generic[T]):
     value : T
     key : str = field(default_factory=str)
@@ -53,7 +55,7 @@ class JsonProperty(Generic[T]):
         self = cast(JsonProperty[T], self)
         return self.value == other.value
 
-@dataclass
+@dataclass(slots=True)
 class JsonOptionalProperty(Generic[T]):
     value : Optional[T] = None
     key : str = field(default_factory=str)
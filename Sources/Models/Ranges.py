@@ -1,61 +1,69 @@
 from .Jsonable import *
 
+# Ranges are flattened : bounds are plain attributes and json keys are class constants, instead of a JsonProperty (and its __dict__) per bound.
+# A hop holds a dozen of them, and whole catalogues stay in memory during post-processing and upload.
+
 class NumericRange(Jsonable):
-    min : JsonProperty[float] = field(default_factory=JsonProperty[float])
-    max : JsonProperty[float] = field(default_factory=JsonProperty[float])
+    __slots__ = ("min", "max")
+    MIN_KEY = "min"
+    MAX_KEY = "max"
+
+    min : float
+    max : float
 
     def __init__(self, min : float = 0, max : float = 0) -> None:
-        super().__init__()
-        self.min = JsonProperty[float]("min", min)
-        self.max = JsonProperty[float]("max", max)
+        self.min = min
+        self.max = max
 
     def to_json(self) -> dict[str, Any]:
         return {
-            self.min.key: self.min.value,
-            self.max.key: self.max.value
+            self.MIN_KEY: self.min,
+            self.MAX_KEY: self.max
         }
 
     def from_json(self, content: dict[str, float]) -> None:
-        self.min.value = float(self.min.try_read(content, self.min.value))
-        self.max.value = float(self.max.try_read(content, self.max.value))
+        # Missing or empty values keep the current ones, the way JsonProperty.try_read does
+        self.min = float(content.get(self.MIN_KEY) or self.min)
+        self.max = float(content.get(self.MAX_KEY) or self.max)
 
     def __eq__(self, other: object) -> bool:
         if type(self) != type(other):
             return False
-        self = cast(NumericRange, self)
         other = cast(NumericRange, other)
-        identical = True
-        identical &= self.max.value == other.max.value
-        identical &= self.min.value == other.min.value
-        return identical
+        return self.min == other.min and self.max == other.max
+
+    def __repr__(self) -> str:
+        return f"NumericRange(min={self.min}, max={self.max})"
 
 
 
 class RatioRange(Jsonable):
-    min : JsonProperty[str] = field(default_factory=JsonProperty[str])
-    max : JsonProperty[str] = field(default_factory=JsonProperty[str])
+    __slots__ = ("min", "max")
+    MIN_KEY = "min"
+    MAX_KEY = "max"
+
+    min : str
+    max : str
 
     def __init__(self, min : str = "", max : str = "") -> None:
-        super().__init__()
-        self.min = JsonProperty[str]("min", min)
-        self.max = JsonProperty[str]("max", max)
+        self.min = min
+        self.max = max
 
     def to_json(self) -> dict[str, str]:
         return {
-            self.min.key: self.min.value,
-            self.max.key: self.max.value
+            self.MIN_KEY: self.min,
+            self.MAX_KEY: self.max
         }
 
     def from_json(self, content: dict[str, str]) -> None:
-        self.min.value = self.min.try_read(content, self.min.value)
-        self.max.value = self.max.try_read(content, self.max.value)
+        self.min = content.get(self.MIN_KEY) or self.min
+        self.max = content.get(self.MAX_KEY) or self.max
 
     def __eq__(self, other: object) -> bool:
         if type(self) != type(other):
             return False
-        self = cast(RatioRange, self)
         other = cast(RatioRange, other)
-        identical = True
-        identical &= self.max.value == other.max.value
-        identical &= self.min.value == other.min.value
-        return identical
\ No newline at end of file
+        return self.min == other.min and self.max == other.max
+
+    def __repr__(self) -> str:
+        return f"RatioRange(min={self.min!r}, max={self.max!r})"
@@ -1,22 +1,37 @@
 from dataclasses import dataclass, field
+from datetime import datetime, timezone
 from typing import Any, Optional, cast
 from .Jsonable import Jsonable
 
-@dataclass
+@dataclass(slots=True)
 class ScrapedObject(Jsonable) :
     # Id retains the unique identifier of the object and is used later on
     # to map objects on one another
     id : str                             = field(default_factory=str)
     parsing_errors : Optional[list[str]] = None
 
+    # ISO 8601 (UTC) timestamp of the moment this object was scraped from the website, empty if unknown.
+    # Compared with sitemap's lastmod to know whether the object needs to be scraped again.
+    extracted_at : str                   = field(default_factory=str)
+
     def to_json(self) -> dict[str, Any]:
         return {
+            "extractedAt" : self.extracted_at,
             "parsingErrors" : self.parsing_errors
         }
 
     def from_json(self, content: dict[str, Any]) -> None:
+        self.extracted_at = self._read_prop("extractedAt", content, "")
         self.parsing_errors = self._read_prop("parsingErrors", content, None)
 
+    def mark_extracted(self) :
+        self.extracted_at = datetime.now(timezone.utc).isoformat()
+
+    def get_extraction_time(self) -> Optional[datetime] :
+        if self.extracted_at == "" :
+            return None
+        return datetime.fromisoformat(self.extracted_at)
+
     def add_parsing_error(self, message : str) :
         if self.parsing_errors == None :
             self.parsing_errors = []
@@ -0,0 +1,60 @@
+import unittest
+from ..Catalogue import CatalogueIndex, assign_stable_ids, canonicalize_link, make_stable_id, normalize_name
+from ..Hop import Hop
+from ..Yeast import Yeast
+
+class TestCatalogueIndex(unittest.TestCase):
+    def build_hops(self) -> list[Hop] :
+        citra = Hop(name="Citra®", link="https://beermaverick.com/hop/citra/", id="1")
+        mosaic = Hop(name="Mosaic", link="https://beermaverick.com/hop/mosaic/", id="2")
+        citra.substitutes = ["https://beermaverick.com/hop/mosaic/", "https://beermaverick.com/hop/unknown/"]
+        mosaic.substitutes = ["https://beermaverick.com/hop/citra/"]
+        return [citra, mosaic]
+
+    def test_lookups(self):
+        hops = self.build_hops()
+        index = CatalogueIndex(hops)
+        self.assertIs(index.find_by_link("https://beermaverick.com/hop/mosaic/"), hops[1])
+        self.assertIs(index.find_by_id("1"), hops[0])
+        self.assertIs(index.find_by_name("citra"), hops[0])
+        self.assertIsNone(index.find_by_name("Cascade"))
+        self.assertEqual(normalize_name(" Hallertau Mittelfrüh "), "hallertaumittelfrh")
+
+    def test_resolve_references(self):
+        hops = self.build_hops()
+        index = CatalogueIndex(hops)
+        unresolved = index.resolve_references(hops, lambda x : x.substitutes)
+
+        self.assertEqual(hops[0].substitutes, ["2", "https://beermaverick.com/hop/unknown/"])
+        self.assertEqual(hops[1].substitutes, ["1"])
+        self.assertEqual(len(unresolved), 1)
+        self.assertEqual(unresolved[0].item_id, "1")
+        self.assertEqual(unresolved[0].reference, "https://beermaverick.com/hop/unknown/")
+        self.assertEqual(unresolved[0].to_json()["itemName"], "Citra®")
+
+    def test_resolve_yeast_references(self):
+        kolsch = Yeast(name="Kolsch", link="https://beermaverick.com/yeast/kolsch/", id="1")
+        kolsch.comparable_yeasts = ["https://beermaverick.com/yeast/unknown/", "https://beermaverick.com/yeast/kolsch/"]
+        unresolved = CatalogueIndex([kolsch]).resolve_references([kolsch], lambda x : x.comparable_yeasts)
+        self.assertEqual(kolsch.comparable_yeasts, ["https://beermaverick.com/yeast/unknown/", "1"])
+        self.assertEqual(len(unresolved), 1)
+
+    def test_stable_ids(self):
+        self.assertEqual(canonicalize_link(" http://BeerMaverick.com/hop/citra#aroma"), "https://beermaverick.com/hop/citra/")
+        self.assertEqual(canonicalize_link("https://beermaverick.com/yeasts/?yid=42"), "https://beermaverick.com/yeasts/?yid=42")
+
+        citra = make_stable_id("https://beermaverick.com/hop/citra/")
+        self.assertEqual(citra, make_stable_id("http://beermaverick.com/hop/citra"))
+        self.assertNotEqual(citra, make_stable_id("https://beermaverick.com/hop/mosaic/"))
+        # Must never change : ids already uploaded depend on it
+        self.assertEqual(citra, "7b588825-67c8-5f1a-ab77-38630ed26931")
+
+        hops = self.build_hops()
+        hops.append(Hop(name="No link"))
+        assign_stable_ids(hops)
+        self.assertEqual(hops[0].id, citra)
+        self.assertNotEqual(hops[2].id, "")
+
+
+if __name__ == "__main__" :
+    unittest.main()
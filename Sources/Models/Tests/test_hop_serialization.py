@@ -15,41 +15,42 @@ class TestHopModelSerialization(unittest.TestCase):
         hop.flavor_txt = "some flavor"
         hop.tags = ["tag1", "tag2", "tag3"]
 
-        hop.alpha_acids.max.value = 3
-        hop.alpha_acids.min.value = 2
+        hop.alpha_acids.max = 3
+        hop.alpha_acids.min = 2
 
-        hop.beta_acids.max.value = 4
-        hop.beta_acids.min.value = 5
+        hop.beta_acids.max = 4
+        hop.beta_acids.min = 5
 
-        hop.alpha_beta_ratio.max.value = "3:2"
-        hop.alpha_beta_ratio.min.value = "2:1"
+        hop.alpha_beta_ratio.max = "3:2"
+        hop.alpha_beta_ratio.min = "2:1"
 
         hop.hop_storage_index = 85
-        hop.co_humulone_normalized.max.value = 66
-        hop.co_humulone_normalized.min.value = 99
+        hop.co_humulone_normalized.max = 66
+        hop.co_humulone_normalized.min = 99
 
-        hop.total_oils.max.value = 1
-        hop.total_oils.min.value = 2
+        hop.total_oils.max = 1
+        hop.total_oils.min = 2
 
-        hop.myrcene.max.value = 3
-        hop.myrcene.min.value = 4
+        hop.myrcene.max = 3
+        hop.myrcene.min = 4
 
-        hop.humulene.max.value = 5
-        hop.humulene.min.value = 6
+        hop.humulene.max = 5
+        hop.humulene.min = 6
 
-        hop.caryophyllene.max.value = 7
-        hop.caryophyllene.min.value = 8
+        hop.caryophyllene.max = 7
+        hop.caryophyllene.min = 8
 
-        hop.farnesene.max.value = 9
-        hop.farnesene.min.value = 10
+        hop.farnesene.max = 9
+        hop.farnesene.min = 10
 
-        hop.other_oils.max.value = 11
-        hop.other_oils.min.value = 12
+        hop.other_oils.max = 11
+        hop.other_oils.min = 12
 
         hop.beer_styles = ["Ale", "Sour", "Don't know"]
         hop.substitutes = ["Substitute 1", "Substitute 2", "Substitute 3"]
 
         hop.radar_chart = RadarChart(citrus=1, berry=2, tropical_fruit=3, stone_fruit=4, floral=0, grassy=3, herbal=1, spice=2, resinous=0)
+        hop.mark_extracted()
 
         content = hop.to_json()
         print(json.dumps(content, indent=4))
@@ -58,6 +59,7 @@ class TestHopModelSerialization(unittest.TestCase):
 
         # Data is good but we need a custom comparator
         self.assertEqual(hop, parsed_hop)
+        self.assertEqual(hop.get_extraction_time(), parsed_hop.get_extraction_time())
 
 if __name__ == "__main__" :
     unittest.main()
\ No newline at end of file
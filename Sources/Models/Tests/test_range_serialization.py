@@ -0,0 +1,42 @@
+import unittest
+
+from ..Hop import Hop
+from ..Yeast import Yeast
+from ..Ranges import NumericRange, RatioRange
+
+
+class TestRangeSerialization(unittest.TestCase):
+    def test_numeric_range_json(self):
+        numeric_range = NumericRange(2.5, 4)
+        self.assertEqual(numeric_range.to_json(), {"min" : 2.5, "max" : 4})
+
+        parsed = NumericRange()
+        parsed.from_json(numeric_range.to_json())
+        self.assertEqual(parsed, numeric_range)
+        self.assertIsInstance(parsed.max, float)
+
+        # Missing and empty values keep the current ones
+        parsed.from_json({"min" : None})
+        self.assertEqual(parsed, numeric_range)
+
+    def test_ratio_range_json(self):
+        ratio_range = RatioRange("2:1", "5:1")
+        self.assertEqual(ratio_range.to_json(), {"min" : "2:1", "max" : "5:1"})
+        parsed = RatioRange()
+        parsed.from_json(ratio_range.to_json())
+        self.assertEqual(parsed, ratio_range)
+        self.assertNotEqual(parsed, NumericRange())
+
+    def test_slotted_models(self):
+        for item in [NumericRange(), RatioRange(), Hop(), Yeast()] :
+            self.assertFalse(hasattr(item, "__dict__"), type(item))
+
+        hop = Hop(name="Citra")
+        hop.add_parsing_error("warning")
+        self.assertEqual(hop.to_json()["parsingErrors"], ["warning"])
+        with self.assertRaises(AttributeError) :
+            hop.unknown_attribute = 0 #type: ignore
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -5,7 +5,8 @@ from .Ranges import NumericRange
 from .Jsonable import *
 from .ScapedObject import ScrapedObject
 
-@dataclass
+# Slotted, see Hop (explicit super() arguments included)
+@dataclass(slots=True)
 class Yeast(ScrapedObject):
     name : str = field(default_factory=str)
     brand : str = field(default_factory=str)
@@ -29,13 +30,14 @@ class Yeast(ScrapedObject):
     parsing_errors : Optional[list[str]] = None
 
     def from_json(self, content: dict[str, Any]) -> None:
+        super(Yeast, self).from_json(content)
         self.name = self._read_prop("name", content, "")
         self.id = self._read_prop("id", content, "")
         self.brand = self._read_prop("brand", content, "")
         self.link = self._read_prop("link", content, "")
         self.type = self._read_prop("type", content, "")
         self.packaging = self._read_prop("packaging", content, "")
-        self.has_bacterias = bool(self._read_prop("hasBacterias", content, False))
+        self.has_bacterias = self._read_prop("hasBacterias", content, None)
         self.species = []
         for item in content["species"] :
             self.species.append(item)
@@ -80,11 +82,11 @@ class Yeast(ScrapedObject):
             "comparableYeasts" : self.comparable_yeasts,
             "commonBeerStyles" : self.common_beer_styles
         }
-        content.update(super().to_json())
+        content.update(super(Yeast, self).to_json())
         return content
 
     def __eq__(self, other: object) -> bool:
-        identical = super().__eq__(other)
+        identical = super(Yeast, self).__eq__(other)
         other = cast(Yeast, other)
         self = cast(Yeast, self)
         identical &= self.name == other.name
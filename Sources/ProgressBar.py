@@ -1,8 +1,9 @@
-import os
+import shutil
 
 def fill_buffer() -> list[str] :
     buffer : list[str] = []
-    for _ in range(0, os.get_terminal_size().columns - 2) :
+    # Falls back to 80 columns when output is not a terminal (redirected to a file, ran from a background thread in tests, ...)
+    for _ in range(0, shutil.get_terminal_size().columns - 2) :
         buffer += " "
     return buffer
 
@@ -17,7 +18,7 @@ def print_buffer(buffer : list[str]) :
     content = "".join(buffer)
     print(f"\r{content}", end="")
 
-def draw_progress_bar(percentage : int) -> list[str] :
+def draw_progress_bar(percentage : int, status : str = "") -> list[str] :
     buffer = fill_buffer()
     buffer[0] = "["
     buffer[-1] = "]"
@@ -32,7 +33,10 @@ def draw_progress_bar(percentage : int) -> list[str] :
     # Some more padding so that we can breathe
     ### 100% ]
     perc_str = " " + perc_str + " "
-    buffer[-5:-1] = perc_str
+    if status != "" :
+        # Status (rate, ETA, ...) goes right before the percentage
+        perc_str = " " + status + perc_str
+    buffer[-1 - len(perc_str):-1] = perc_str
 
     # Compute remaining length accounting with the [] characters
     usable_length = len(buffer) - 2 - len(perc_str)
@@ -0,0 +1,157 @@
+import time
+import asyncio
+import unittest
+import threading
+
+from ..YeastScraper import YeastScraper
+from ..Models.Yeast import Yeast
+from ..Utils.http import HttpResponse
+
+
+class FakeYeastScraper(YeastScraper) :
+    """Serves comparable yeasts redirections without any network, while keeping track of request concurrency."""
+    def __init__(self) -> None:
+        super().__init__()
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.requested : list[str] = []
+
+    def _enter(self, url : str) -> None :
+        with self.lock :
+            self.requested.append(url)
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+
+    def _leave(self, url : str) -> HttpResponse :
+        with self.lock :
+            self.in_flight -= 1
+        yid = url.split("yid=")[-1]
+        return HttpResponse(url=url, status=301, headers={"Location" : f"/yeast/yeast-{yid}/"})
+
+    def fetch(self, url : str, allow_redirects : bool = True) -> HttpResponse :
+        self._enter(url)
+        time.sleep(0.01)
+        return self._leave(url)
+
+    async def fetch_async(self, url : str, allow_redirects : bool = True) -> HttpResponse :
+        self._enter(url)
+        await asyncio.sleep(0.01)
+        return self._leave(url)
+
+
+def make_yeast(num_comparables : int) -> Yeast :
+    return Yeast(link="https://beermaverick.com/yeast/test/", comparable_yeasts=[f"/yeasts/?yid={i}" for i in range(0, num_comparables)])
+
+def expected_links(num_comparables : int) -> list[str] :
+    return [f"https://beermaverick.com/yeast/yeast-{i}/" for i in range(0, num_comparables)]
+
+
+class TestBaseScraperFetchMany(unittest.TestCase):
+    def test_threads_fan_out(self):
+        scraper = FakeYeastScraper()
+        scraper.max_requests_per_item = 4
+        yeast = make_yeast(10)
+        scraper.resolve_comparable_yeasts(yeast)
+
+        # Responses are mapped back in order, whatever the completion order
+        self.assertEqual(yeast.comparable_yeasts, expected_links(10))
+        self.assertEqual(len(scraper.requested), 10)
+        self.assertGreater(scraper.max_in_flight, 1)
+        self.assertLessEqual(scraper.max_in_flight, 4)
+
+    def test_async_fan_out(self):
+        scraper = FakeYeastScraper()
+        scraper.max_requests_per_item = 4
+        yeast = make_yeast(10)
+        asyncio.run(scraper.resolve_comparable_yeasts_async(yeast))
+
+        self.assertEqual(yeast.comparable_yeasts, expected_links(10))
+        self.assertEqual(scraper.max_in_flight, 4)
+
+    def test_serial_when_capped_to_one(self):
+        scraper = FakeYeastScraper()
+        scraper.max_requests_per_item = 1
+        yeast = make_yeast(5)
+        scraper.resolve_comparable_yeasts(yeast)
+        asyncio.run(scraper.resolve_comparable_yeasts_async(make_yeast(5)))
+
+        self.assertEqual(yeast.comparable_yeasts, expected_links(5))
+        self.assertEqual(scraper.max_in_flight, 1)
+
+    def test_shared_comparables_are_probed_once(self):
+        scraper = FakeYeastScraper()
+        first = make_yeast(6)
+        second = make_yeast(8)
+        scraper.resolve_comparable_yeasts(first)
+        asyncio.run(scraper.resolve_comparable_yeasts_async(second))
+
+        self.assertEqual(first.comparable_yeasts, expected_links(6))
+        self.assertEqual(second.comparable_yeasts, expected_links(8))
+        self.assertEqual(len(scraper.requested), 8)
+        self.assertEqual(len(set(scraper.requested)), 8)
+
+    def test_canonical_link_from_page_head(self):
+        scraper = FakeYeastScraper()
+        page = b"<html><head><link rel=\"canonical\" href=\"https://beermaverick.com/yeast/kolsch/\" /></head><body><p>Unclosed"
+        self.assertEqual(scraper.get_canonical_link(page, {}, 200), "https://beermaverick.com/yeast/kolsch/")
+
+        yeast = Yeast()
+        false_positive = b"<html><head><link rel=\"canonical\" href=\"https://beermaverick.com/yeasts/\" /></head></html>"
+        self.assertEqual(scraper.recover_comparable_yeast_link(false_positive, {}, 200, "/yeasts/?yid=42", yeast), "42")
+        self.assertEqual(scraper.recover_comparable_yeast_link(b"", {}, 404, "/yeasts/?yid=43", yeast), "43")
+        self.assertEqual(len(yeast.parsing_errors), 2) #type: ignore
+
+    def test_metrics(self):
+        scraper = FakeYeastScraper()
+        scraper.resolve_comparable_yeasts(make_yeast(6))
+        asyncio.run(scraper.resolve_comparable_yeasts_async(make_yeast(3)))
+
+        threads = [threading.Thread(target=lambda : [scraper.mark_treated(failed=(i % 2 == 0), warnings=1) for i in range(0, 1000)]) for _ in range(0, 8)]
+        for thread in threads :
+            thread.start()
+        for thread in threads :
+            thread.join()
+
+        snapshot = scraper.metrics.snapshot()
+        self.assertEqual(snapshot.phases["resolve"].count, 2)
+        self.assertEqual(snapshot.get("treated"), 8000)
+        self.assertEqual(snapshot.get("failed"), 4000)
+        self.assertEqual(snapshot.get("warnings"), 8000)
+        self.assertEqual(scraper.treated_item, 8000)
+
+        scraper.reset()
+        self.assertEqual(scraper.metrics.get("treated"), 0)
+        self.assertEqual(scraper.treated_item, 0)
+
+    def test_threaded_scrap_reuses_pools(self):
+        scraper = FakeYeastScraper()
+        links = [f"https://beermaverick.com/yeast/yeast-{i}/" for i in range(0, 20)]
+        streamed : list[Yeast] = []
+        scraper.item_scraped_callbacks.append(streamed.append)
+
+        scraper.scrap(links, 4)
+        executor = scraper.item_executor
+        # Fake server only answers with redirections : every page is rejected, but all of them are treated
+        self.assertEqual(len(scraper.error_items), 20)
+        self.assertEqual(scraper.treated_item, 20)
+        self.assertEqual(streamed, [])
+
+        scraper.scrap(links, 4)
+        self.assertIs(scraper.item_executor, executor)
+        self.assertEqual(scraper.treated_item, 20)
+        self.assertLessEqual(scraper.max_in_flight, 4)
+
+        scraper.shutdown()
+        self.assertIsNone(scraper.item_executor)
+
+    def test_no_comparables(self):
+        scraper = FakeYeastScraper()
+        yeast = make_yeast(0)
+        scraper.resolve_comparable_yeasts(yeast)
+        asyncio.run(scraper.resolve_comparable_yeasts_async(yeast))
+        self.assertEqual(scraper.requested, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from ..Utils.directories import Directories
+from ..Benchmarks.bench_crawl import CrawlConfig, compare_to_baseline, get_tolerance, keep_best, run_configuration, serve_in_background
+from ..Benchmarks.replay_server import ReplayServer
+from ..Benchmarks.synthetic_pages import make_synthetic_archive
+
+
+def make_run(items : int = 200, items_per_second : float = 10, cpu_seconds : float = 1, peak_rss_mb : float = 100, noise : float = 0) :
+    return {"items" : items, "failed" : 0, "seconds" : items / items_per_second, "itemsPerSecond" : items_per_second,
+            "cpuSeconds" : cpu_seconds, "peakRssMb" : peak_rss_mb, "noise" : noise}
+
+
+class TestBenchCrawl(unittest.TestCase):
+    def test_compare_to_baseline(self):
+        baseline = {"async/lxml/j8" : make_run()}
+        self.assertEqual(compare_to_baseline({"async/lxml/j8" : make_run(items_per_second=9, cpu_seconds=1.1, peak_rss_mb=110)}, baseline, 0.2), [])
+        # Not in baseline
+        self.assertEqual(compare_to_baseline({"async/lxml/j1" : make_run(items_per_second=1)}, baseline, 0.2), [])
+
+        regressions = compare_to_baseline({"async/lxml/j8" : make_run(items_per_second=7, cpu_seconds=1.5, peak_rss_mb=130)}, baseline, 0.2)
+        self.assertEqual(len(regressions), 3)
+        regressions = compare_to_baseline({"async/lxml/j8" : make_run(items=150, cpu_seconds=0.75)}, baseline, 0.2)
+        self.assertEqual(len(regressions), 1)
+
+    def test_small_and_noisy_samples(self):
+        self.assertEqual(get_tolerance(0.2, 200), 0.2)
+        self.assertEqual(get_tolerance(0.2, 2000), 0.2)
+        self.assertAlmostEqual(get_tolerance(0.2, 20), 0.2 * 10 ** 0.5)
+        self.assertEqual(get_tolerance(0.2, 200, 0.5), 0.5)
+
+        # 30% slower on 20 items (-n 10) is within noise, not on 200 items
+        small_baseline = {"threads/lxml/j1" : make_run(items=20)}
+        self.assertEqual(compare_to_baseline({"threads/lxml/j1" : make_run(items=20, items_per_second=7)}, small_baseline, 0.2), [])
+        self.assertEqual(len(compare_to_baseline({"threads/lxml/j1" : make_run(items_per_second=7)}, {"threads/lxml/j1" : make_run()}, 0.2)), 1)
+        # Runs that were already 40% apart when repeated can't tell a 30% difference either
+        self.assertEqual(compare_to_baseline({"threads/lxml/j1" : make_run(items_per_second=7, noise=0.4)}, {"threads/lxml/j1" : make_run()}, 0.2), [])
+
+    def test_keep_best(self):
+        best = keep_best([make_run(items_per_second=8, cpu_seconds=1), make_run(items_per_second=10, cpu_seconds=1.5)])
+        self.assertEqual(best["itemsPerSecond"], 10)
+        self.assertEqual(best["cpuSeconds"], 1)
+        # CPU time varies the most : 50%
+        self.assertAlmostEqual(best["noise"], 0.5)
+        self.assertEqual(keep_best([make_run()])["noise"], 0)
+
+    def test_run_configuration(self):
+        with tempfile.TemporaryDirectory() as tmp_dir :
+            server = ReplayServer(make_synthetic_archive(Path(tmp_dir).joinpath("synthetic.zip"), 6, 6))
+            with serve_in_background(server) as base_url :
+                for config in [CrawlConfig("threads", "html.parser", 1), CrawlConfig("async", "html.parser", 3)] :
+                    extracted_dir = Directories.EXTRACTED_DIR
+                    run = run_configuration(base_url, config, 6)
+                    self.assertEqual(run["items"], 12, config)
+                    self.assertEqual(run["failed"], 0, config)
+                    self.assertGreater(run["cpuSeconds"], 0)
+                    self.assertEqual(Directories.EXTRACTED_DIR, extracted_dir)
+            self.assertEqual(server.not_found, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
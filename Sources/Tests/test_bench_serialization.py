@@ -0,0 +1,33 @@
+import unittest
+
+from ..Models.Hop import Hop
+from ..Models.Yeast import Yeast
+from ..Benchmarks.bench_serialization import get_operations, measure, round_trip_all
+from ..Benchmarks.synthetic_items import make_hop, make_yeast
+
+
+class TestBenchSerialization(unittest.TestCase):
+    def test_synthetic_items_round_trip(self):
+        hops = [make_hop(i) for i in range(0, 20)]
+        self.assertEqual(round_trip_all(Hop)(hops), hops)
+        self.assertEqual(make_hop(3), make_hop(3))
+        self.assertNotEqual(hops[0].alpha_acids.max, 0)
+        self.assertNotEqual(hops[0].substitutes, [])
+
+        yeasts = [make_yeast(i) for i in range(0, 20)]
+        self.assertEqual(round_trip_all(Yeast)(yeasts), yeasts)
+        self.assertNotEqual(yeasts[0].comparable_yeasts, [])
+
+    def test_measure(self):
+        hops = [make_hop(i) for i in range(0, 100)]
+        for name, function, inputs in get_operations(Hop, hops) :
+            result = measure(function, inputs)
+            self.assertGreater(result.seconds, 0, name)
+            self.assertGreater(result.retained_bytes, 0, name)
+            self.assertGreaterEqual(result.peak_bytes, result.retained_bytes, name)
+
+        self.assertEqual(measure(len, hops, trace=False).peak_bytes, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from datetime import datetime, timezone
+
+from ..Main import SitemapLink, cache_links, get_lastmods, is_outdated, parse_sitemap, read_links_from_cache, scrap_hops, write_hops_json_to_disk
+from ..HopScraper import HopScraper
+from ..Models.Hop import Hop
+from ..Utils.directories import Directories
+
+SITEMAP = b"""<?xml version="1.0" encoding="UTF-8"?>
+<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+<url><loc>https://beermaverick.com/hop/citra/</loc><lastmod>2023-05-04T10:00:00+00:00</lastmod></url>
+<url><loc>https://beermaverick.com/hop/mosaic/</loc></url>
+<url><loc>https://beermaverick.com/hop/simcoe/</loc><lastmod>2023-05-04</lastmod></url>
+</urlset>"""
+
+def make_hop(name : str, extracted_at : str) -> Hop :
+    hop = Hop(name=name, link=f"https://beermaverick.com/hop/{name}/")
+    hop.extracted_at = extracted_at
+    return hop
+
+
+class FakeHopScraper(HopScraper) :
+    """Records the links it's asked to scrap instead of sending any request."""
+    def __init__(self) -> None:
+        super().__init__()
+        self.scraped_links : list[str] = []
+
+    def scrap(self, links : list[str], num_threads : int = -1) -> bool :
+        self.scraped_links += links
+        self.hops = [make_hop(x.split("/")[-2], datetime.now(timezone.utc).isoformat()) for x in links]
+        return True
+
+
+class TestMainSitemap(unittest.TestCase):
+    def test_parse_sitemap(self):
+        links = parse_sitemap(SITEMAP)
+        self.assertEqual([x.link for x in links], ["https://beermaverick.com/hop/citra/", "https://beermaverick.com/hop/mosaic/", "https://beermaverick.com/hop/simcoe/"])
+        self.assertEqual(links[0].lastmod, "2023-05-04T10:00:00+00:00")
+        self.assertEqual(links[0].get_lastmod_time(), datetime(2023, 5, 4, 10, tzinfo=timezone.utc))
+        # No lastmod at all
+        self.assertIsNone(links[1].lastmod)
+        self.assertIsNone(links[1].get_lastmod_time())
+        # Date only, assumed UTC
+        self.assertEqual(links[2].get_lastmod_time(), datetime(2023, 5, 4, tzinfo=timezone.utc))
+
+        self.assertEqual(get_lastmods(links), {"https://beermaverick.com/hop/citra/" : datetime(2023, 5, 4, 10, tzinfo=timezone.utc),
+                                               "https://beermaverick.com/hop/simcoe/" : datetime(2023, 5, 4, tzinfo=timezone.utc)})
+        self.assertIsNone(SitemapLink("https://beermaverick.com/hop/citra/", "not a date").get_lastmod_time())
+
+    def test_links_cache(self):
+        with tempfile.TemporaryDirectory() as tmp_dir :
+            filepath = Path(tmp_dir).joinpath("links.json")
+            self.assertEqual(read_links_from_cache(filepath), [])
+
+            links = parse_sitemap(SITEMAP)
+            cache_links(filepath, links)
+            self.assertEqual(read_links_from_cache(filepath), links)
+
+            # Older caches only hold plain links
+            with open(filepath, "w") as file :
+                json.dump({"links" : ["https://beermaverick.com/hop/citra/", "https://beermaverick.com/hop/mosaic/"]}, file)
+            self.assertEqual(read_links_from_cache(filepath), [SitemapLink("https://beermaverick.com/hop/citra/"), SitemapLink("https://beermaverick.com/hop/mosaic/")])
+
+    def test_is_outdated(self):
+        link = "https://beermaverick.com/hop/citra/"
+        lastmods = {link : datetime(2023, 5, 4, 10, tzinfo=timezone.utc)}
+
+        self.assertTrue(is_outdated(make_hop("citra", "2023-05-01T00:00:00+00:00"), lastmods, link))
+        self.assertFalse(is_outdated(make_hop("citra", "2023-06-01T00:00:00+00:00"), lastmods, link))
+        # Extracted by an older version, extraction time is unknown
+        self.assertTrue(is_outdated(make_hop("citra", ""), lastmods, link))
+        # No lastmod information : up to date
+        self.assertFalse(is_outdated(make_hop("citra", ""), None, link))
+        self.assertFalse(is_outdated(make_hop("citra", ""), {}, link))
+
+
+class TestMainIncremental(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.extracted_dir = Directories.EXTRACTED_DIR
+        Directories.EXTRACTED_DIR = Path(self.tmp_dir.name)
+
+    def tearDown(self):
+        Directories.EXTRACTED_DIR = self.extracted_dir
+        self.tmp_dir.cleanup()
+
+    def test_only_new_or_outdated_links_are_scraped(self):
+        write_hops_json_to_disk(Directories.EXTRACTED_DIR.joinpath("hops.json"), [
+            make_hop("citra", "2023-01-01T00:00:00+00:00"),  # Page changed since
+            make_hop("mosaic", "2023-01-01T00:00:00+00:00"), # Page unchanged
+            make_hop("simcoe", ""),                          # Unknown extraction time
+            make_hop("galaxy", "2023-01-01T00:00:00+00:00")  # Vanished from sitemap
+        ])
+        links = [f"https://beermaverick.com/hop/{x}/" for x in ["citra", "mosaic", "simcoe", "cascade"]]
+        lastmods = {links[0] : datetime(2023, 5, 4, tzinfo=timezone.utc),
+                    links[1] : datetime(2022, 5, 4, tzinfo=timezone.utc),
+                    links[2] : datetime(2022, 5, 4, tzinfo=timezone.utc)}
+
+        scraper = FakeHopScraper()
+        hops = scrap_hops(links, scraper, use_threads=True, max_jobs=2, lastmods=lastmods)
+        self.assertEqual(scraper.scraped_links, [links[0], links[2], links[3]])
+        self.assertEqual(sorted(x.link for x in hops), sorted(links))
+
+        # Not incremental : cached hops are reused as they are
+        scraper = FakeHopScraper()
+        scrap_hops(links + ["https://beermaverick.com/hop/galaxy/"], scraper, use_threads=True, max_jobs=2)
+        self.assertEqual(scraper.scraped_links, ["https://beermaverick.com/hop/galaxy/"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,214 @@
+import time
+import asyncio
+import tempfile
+import unittest
+import multiprocessing
+from pathlib import Path
+from typing import Any, Optional
+from concurrent.futures import ProcessPoolExecutor
+
+import requests
+
+from ..HopScraper import HopScraper
+from ..YeastScraper import YeastScraper
+from ..Utils.http import HttpResponse
+from ..Utils.fixture_archive import FixtureArchive
+from ..Benchmarks.replay_server import ReplayServer
+from ..Benchmarks.synthetic_pages import get_hop_link, get_yeast_link, make_synthetic_archive
+
+
+class BrokenProbesYeastScraper(YeastScraper) :
+    """Comparable yeasts probes (the only requests which don't follow redirections) never get any response."""
+    def fetch(self, url : str, allow_redirects : bool = True) -> HttpResponse :
+        if not allow_redirects :
+            raise requests.ConnectionError(f"Probe of {url} failed")
+        return super().fetch(url, allow_redirects)
+
+    async def fetch_async(self, url : str, allow_redirects : bool = True) -> HttpResponse :
+        if not allow_redirects :
+            raise requests.ConnectionError(f"Probe of {url} failed")
+        return await super().fetch_async(url, allow_redirects)
+
+
+def get_comparable_content(items : list[Any]) -> list[dict[str, Any]] :
+    """Serialized items, sorted by link and without their extraction time (which is the only thing that differs between runs)."""
+    contents = [x.to_json() for x in sorted(items, key=lambda x : x.link)]
+    for content in contents :
+        del content["extractedAt"]
+    return contents
+
+
+class TestReplay(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.archive = make_synthetic_archive(Path(self.tmp_dir.name).joinpath("synthetic.zip"), 12, 12)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def run_against_server(self, server : ReplayServer, scrap) :
+        async def run() :
+            base_url = await server.start()
+            try :
+                # Threads flavor runs off the event loop, which keeps serving meanwhile
+                return await scrap(base_url)
+            finally :
+                await server.stop()
+        return asyncio.run(run())
+
+    def test_offline_scrape_and_record(self):
+        server = ReplayServer(self.archive)
+        recorder = FixtureArchive(Path(self.tmp_dir.name).joinpath("recorded.zip"))
+        hop_scraper = HopScraper()
+        yeast_scraper = YeastScraper(request_client=requests.Session())
+
+        async def scrap(base_url : str) :
+            for scraper in [hop_scraper, yeast_scraper] :
+                scraper.base_url_override = base_url
+                scraper.recorder = recorder
+            await hop_scraper.scrap_async([get_hop_link(i) for i in range(0, 12)], 4)
+            await asyncio.to_thread(yeast_scraper.scrap, [get_yeast_link(i) for i in range(0, 12)], 4)
+            yeast_scraper.shutdown()
+        self.run_against_server(server, scrap)
+
+        self.assertEqual(len(hop_scraper.hops), 12)
+        self.assertEqual(hop_scraper.error_items, [])
+        self.assertNotEqual(hop_scraper.hops[0].radar_chart.citrus, 0)
+        self.assertEqual(len(yeast_scraper.yeasts), 12)
+        yeast = next(x for x in yeast_scraper.yeasts if x.link == get_yeast_link(0))
+        self.assertEqual(yeast.comparable_yeasts[0], get_yeast_link(1))
+        self.assertEqual(server.not_found, 0)
+
+        # Responses keep their original urls, redirections are recorded as such
+        self.assertEqual(recorder.find("/hop/citra-0/").url, get_hop_link(0)) #type: ignore
+        self.assertEqual(recorder.find("/yeasts/?yid=7").status, 301) #type: ignore
+
+    def test_redirections_keep_their_location(self):
+        archive = FixtureArchive(Path(self.tmp_dir.name).joinpath("redirections.zip"))
+        redirections = {"/yeasts/?yid=1" : "/yeast/kolsch/",
+                        "/yeasts/?yid=2" : "https://beermaverick.com/yeast/kolsch/?ref=2",
+                        "/yeasts/?yid=3" : "https://example.com/yeast/"}
+        for path, location in redirections.items() :
+            archive.record(HttpResponse(url=f"https://beermaverick.com{path}", status=301, headers={"Location" : location}), allow_redirects=False)
+
+        async def probe(base_url : str) :
+            session = requests.Session()
+            return base_url, {path : (await asyncio.to_thread(session.get, base_url + path, allow_redirects=False)).headers["Location"] for path in redirections}
+        base_url, locations = self.run_against_server(ReplayServer(archive), probe)
+
+        # Relative and external ones are left untouched, absolute ones to the website only get the replay server host
+        self.assertEqual(locations["/yeasts/?yid=1"], "/yeast/kolsch/")
+        self.assertEqual(locations["/yeasts/?yid=2"], f"{base_url}/yeast/kolsch/?ref=2")
+        self.assertEqual(locations["/yeasts/?yid=3"], "https://example.com/yeast/")
+
+    def test_error_injection_and_latency(self):
+        server = ReplayServer(self.archive, latency=0.05, error_rate=1, seed=0)
+        hop_scraper = HopScraper()
+
+        async def scrap(base_url : str) :
+            hop_scraper.base_url_override = base_url
+            start = time.perf_counter()
+            await hop_scraper.scrap_async([get_hop_link(i) for i in range(0, 4)], 4)
+            return time.perf_counter() - start
+        duration = self.run_against_server(server, scrap)
+
+        self.assertEqual(len(hop_scraper.error_items), 4)
+        self.assertEqual(server.errors, 8)
+        self.assertGreaterEqual(duration, 0.05)
+
+    def test_transport_errors_only_fail_their_item(self):
+        # Nothing listens there : every request fails before getting any response
+        unreachable_url = "http://127.0.0.1:9"
+        links = [get_yeast_link(i) for i in range(0, 4)]
+
+        threaded_scraper = YeastScraper(request_client=requests.Session())
+        threaded_scraper.base_url_override = unreachable_url
+        threaded_scraper.scrap(links, 2)
+        threaded_scraper.shutdown()
+
+        async_scraper = YeastScraper()
+        async_scraper.base_url_override = unreachable_url
+        asyncio.run(async_scraper.scrap_async(links, 2))
+
+        for scraper in [threaded_scraper, async_scraper] :
+            self.assertEqual(len(scraper.error_items), 4)
+            self.assertEqual(scraper.metrics.get("failed"), 4)
+            self.assertTrue(scraper.progress.is_done())
+
+    def test_probe_errors_are_broken_links(self):
+        server = ReplayServer(self.archive)
+        links = [get_yeast_link(i) for i in range(0, 4)]
+        threaded_scraper = BrokenProbesYeastScraper(request_client=requests.Session())
+        async_scraper = BrokenProbesYeastScraper()
+
+        async def scrap(base_url : str) :
+            for scraper in [threaded_scraper, async_scraper] :
+                scraper.base_url_override = base_url
+            await asyncio.to_thread(threaded_scraper.scrap, links, 2)
+            threaded_scraper.shutdown()
+            await async_scraper.scrap_async(links, 2)
+        self.run_against_server(server, scrap)
+
+        for scraper in [threaded_scraper, async_scraper] :
+            # Yeasts are kept, failed probes only leave their yid behind and a warning
+            self.assertEqual(len(scraper.yeasts), 4)
+            self.assertEqual(scraper.error_items, [])
+            self.assertEqual(scraper.metrics.get("failed"), 0)
+            yeast = next(x for x in scraper.yeasts if x.link == get_yeast_link(0))
+            self.assertEqual(yeast.comparable_yeasts[0], "7")
+            self.assertIn("Caught broken link in comparable yeasts !", yeast.parsing_errors) #type: ignore
+
+    def test_parse_executor_matches_inline_parsing(self):
+        html_headers = {"Content-Type" : "text/html; charset=UTF-8"}
+        # Parsing this hop raises (empty cultivar id cell), this yeast only comes with warnings
+        broken_hop_link = "https://beermaverick.com/hop/broken/"
+        self.archive.record(HttpResponse(url=broken_hop_link, status=200, headers=html_headers,
+                                         content=b"<html><body><table><tr><th>Cultivar/Brand ID:</th><td></td></tr></table></body></html>"))
+        broken_yeast_link = "https://beermaverick.com/yeast/broken/"
+        self.archive.record(HttpResponse(url=broken_yeast_link, status=200, headers=html_headers, content=b"<html><body></body></html>"))
+        hop_links = [get_hop_link(i) for i in range(0, 6)] + [broken_hop_link, "https://beermaverick.com/hop/missing/"]
+        yeast_links = [get_yeast_link(i) for i in range(0, 6)] + [broken_yeast_link, "https://beermaverick.com/yeast/missing/"]
+
+        def make_scrapers(executor : Optional[ProcessPoolExecutor]) -> tuple[HopScraper, YeastScraper] :
+            hop_scraper = HopScraper(request_client=requests.Session())
+            yeast_scraper = YeastScraper(request_client=requests.Session())
+            hop_scraper.parse_executor = executor
+            yeast_scraper.parse_executor = executor
+            return hop_scraper, yeast_scraper
+
+        async def scrap_all(base_url : str, hop_scraper : HopScraper, yeast_scraper : YeastScraper) -> list[Any] :
+            """Threads then asyncio flavors, returns what each of them scraped and rejected."""
+            results : list[Any] = []
+            hop_scraper.base_url_override = base_url
+            yeast_scraper.base_url_override = base_url
+            await asyncio.to_thread(hop_scraper.scrap, hop_links, 3)
+            await asyncio.to_thread(yeast_scraper.scrap, yeast_links, 3)
+            hop_scraper.shutdown()
+            yeast_scraper.shutdown()
+            results.append((hop_scraper.hops, hop_scraper.error_items, yeast_scraper.yeasts, yeast_scraper.error_items, yeast_scraper.metrics.get("warnings")))
+            await hop_scraper.scrap_async(hop_links, 3)
+            await yeast_scraper.scrap_async(yeast_links, 3)
+            results.append((hop_scraper.hops, hop_scraper.error_items, yeast_scraper.yeasts, yeast_scraper.error_items, yeast_scraper.metrics.get("warnings")))
+            return results
+
+        inline_results = self.run_against_server(ReplayServer(self.archive), lambda base_url : scrap_all(base_url, *make_scrapers(None)))
+        with ProcessPoolExecutor(max_workers=2, mp_context=multiprocessing.get_context("spawn")) as executor :
+            offloaded_results = self.run_against_server(ReplayServer(self.archive), lambda base_url : scrap_all(base_url, *make_scrapers(executor)))
+
+        for (hops, hop_errors, yeasts, yeast_errors, yeast_warnings), reference in zip(offloaded_results, inline_results) :
+            self.assertEqual(len(hops), 6)
+            self.assertEqual(len(yeasts), 7)
+            self.assertEqual(get_comparable_content(hops), get_comparable_content(reference[0]))
+            self.assertEqual(get_comparable_content(yeasts), get_comparable_content(reference[2]))
+            # Parsing exceptions raised in worker processes reject their item, just like inline ones
+            self.assertEqual(sorted(x.link for x in hop_errors), [broken_hop_link, "https://beermaverick.com/hop/missing/"])
+            self.assertEqual(sorted(x.link for x in reference[1]), [broken_hop_link, "https://beermaverick.com/hop/missing/"])
+            self.assertEqual([x.link for x in yeast_errors], ["https://beermaverick.com/yeast/missing/"])
+            self.assertEqual([x.link for x in reference[3]], ["https://beermaverick.com/yeast/missing/"])
+            # Parsing warnings travel back from the workers as well
+            self.assertGreater(yeast_warnings, 0)
+            self.assertEqual(yeast_warnings, reference[4])
+
+
+if __name__ == '__main__':
+    unittest.main()
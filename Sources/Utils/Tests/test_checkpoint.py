@@ -0,0 +1,118 @@
+import time
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from ..checkpoint import CheckpointJournal
+from ...Models.Hop import Hop
+
+def wait_for(condition) -> bool :
+    """Checkpoints are written by the writer thread : polls until condition is met, or a few seconds went by."""
+    deadline = time.monotonic() + 5
+    while not condition() and time.monotonic() < deadline :
+        time.sleep(0.01)
+    return condition()
+
+
+class ThreadCheckingJournal(CheckpointJournal) :
+    """Keeps track of the threads checkpoints are written from."""
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.writing_threads : list[str] = []
+
+    def _write_pending(self) -> None :
+        self.writing_threads.append(threading.current_thread().name)
+        super()._write_pending()
+
+
+class TestUtilsCheckpoint(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.filepath = Path(self.tmp_dir.name).joinpath("hops.checkpoint.ndjson")
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def test_periodic_save_and_resume(self):
+        journal = CheckpointJournal(self.filepath, interval_seconds=3600, interval_items=2)
+        journal.record("https://beermaverick.com/hop/citra/", Hop(name="Citra", link="https://beermaverick.com/hop/citra/").to_json())
+        self.assertFalse(self.filepath.exists())
+
+        journal.record("https://beermaverick.com/hop/mosaic/", Hop(name="Mosaic", link="https://beermaverick.com/hop/mosaic/").to_json())
+        self.assertTrue(wait_for(lambda : self.filepath.exists() and self.filepath.read_bytes().count(b"\n") == 2))
+
+        # This one is not saved yet, it's lost if the process dies now
+        journal.record("https://beermaverick.com/hop/apollo/", Hop(name="Apollo").to_json())
+
+        resumed = CheckpointJournal(self.filepath)
+        resumed.load()
+        hops = list(resumed.get_items(Hop))
+        self.assertEqual([x.name for x in hops], ["Citra", "Mosaic"])
+
+        journal.close()
+        resumed.load()
+        self.assertEqual(len(resumed.completed), 3)
+
+    def test_checkpoints_only_append_new_entries(self):
+        journal = CheckpointJournal(self.filepath, interval_seconds=3600, interval_items=1)
+        journal.record("https://beermaverick.com/hop/citra/", Hop(name="Citra").to_json())
+        self.assertTrue(wait_for(lambda : self.filepath.exists() and self.filepath.read_bytes().count(b"\n") == 1))
+        first = self.filepath.read_bytes()
+        journal.record("https://beermaverick.com/hop/mosaic/", Hop(name="Mosaic").to_json())
+        self.assertTrue(wait_for(lambda : self.filepath.read_bytes().count(b"\n") == 2))
+        journal.close()
+        content = self.filepath.read_bytes()
+        self.assertTrue(content.startswith(first))
+
+        # Killed while writing the last entry : it's skipped
+        self.filepath.write_bytes(content + b'{"link" : "https://beermaverick.com/hop/apo')
+        resumed = CheckpointJournal(self.filepath)
+        resumed.load()
+        self.assertEqual([x.name for x in resumed.get_items(Hop)], ["Citra", "Mosaic"])
+
+        # Resumed journals are appended to, others replace what's on disk
+        resumed.record("https://beermaverick.com/hop/apollo/", Hop(name="Apollo").to_json())
+        resumed.close()
+        resumed.load()
+        self.assertEqual(len(resumed.completed), 3)
+
+        fresh = CheckpointJournal(self.filepath)
+        fresh.record("https://beermaverick.com/hop/saaz/", Hop(name="Saaz").to_json())
+        fresh.close()
+        fresh.load()
+        self.assertEqual(list(fresh.completed.keys()), ["https://beermaverick.com/hop/saaz/"])
+
+    def test_concurrent_records(self):
+        journal = ThreadCheckingJournal(self.filepath, interval_seconds=3600, interval_items=7)
+        def work(thread_index : int) :
+            for i in range(0, 100) :
+                journal.record(f"https://beermaverick.com/hop/{thread_index}-{i}/", {"name" : f"{thread_index}-{i}"})
+        threads = [threading.Thread(target=work, args=(x,)) for x in range(0, 8)]
+        for thread in threads :
+            thread.start()
+        for thread in threads :
+            thread.join()
+        journal.close()
+        # Recording threads never write themselves, only the writer thread and the final close() do
+        self.assertLessEqual(set(journal.writing_threads[:-1]), {"checkpoint-writer"})
+        self.assertEqual(journal.writing_threads[-1], threading.current_thread().name)
+
+        resumed = CheckpointJournal(self.filepath)
+        resumed.load()
+        self.assertEqual(len(resumed.completed), 800)
+        self.assertEqual(self.filepath.read_bytes().count(b"\n"), 800)
+
+    def test_clear(self):
+        journal = CheckpointJournal(self.filepath)
+        journal.record("https://beermaverick.com/hop/citra/", {})
+        journal.save()
+        journal.clear()
+        self.assertFalse(self.filepath.exists())
+
+        # Loading a missing journal is a no-op
+        journal.load()
+        self.assertEqual(journal.completed, {})
+
+
+if __name__ == "__main__" :
+    unittest.main()
@@ -0,0 +1,86 @@
+import math
+import tempfile
+import unittest
+import importlib.util
+from pathlib import Path
+
+from ..columnar import HOP_RANGES, decode_dictionary, hops_to_columns, read_columns, write_columns, yeasts_to_columns
+from ...Models.Hop import HopAttribute
+from ...Models.Yeast import Yeast
+from ...Models.Ranges import NumericRange
+from ...Benchmarks.synthetic_items import make_hop, make_yeast
+
+HAS_NUMPY = importlib.util.find_spec("numpy") != None
+if HAS_NUMPY :
+    import numpy as np
+
+
+@unittest.skipUnless(HAS_NUMPY, "numpy is not installed")
+class TestUtilsColumnar(unittest.TestCase):
+    def test_hops_columns(self):
+        hops = [make_hop(i) for i in range(0, 50)]
+        hops[3].country = "Germany"
+        columns = hops_to_columns(hops)
+
+        for name in HOP_RANGES :
+            self.assertEqual(columns[f"{name}_min"].dtype.name, "float64")
+        self.assertEqual(columns["alpha_acids_max"][7], hops[7].alpha_acids.max)
+        self.assertEqual(columns["radar_chart"].shape, (50, 9))
+        self.assertEqual(list(columns["radar_chart"][5]), list(hops[5].radar_chart.to_json().values()))
+
+        self.assertEqual(list(columns["country_categories"]), ["Germany", "United States"])
+        self.assertEqual(list(decode_dictionary(columns, "country")), [x.country for x in hops])
+        self.assertEqual(list(decode_dictionary(columns, "purpose")), [x.purpose.value for x in hops])
+        self.assertLessEqual(len(columns["purpose_categories"]), len(HopAttribute))
+
+        # Vectorised aggregation matches the per object loop
+        germany = columns["country"] == list(columns["country_categories"]).index("Germany")
+        self.assertEqual(columns["alpha_acids_max"][germany].sum(), hops[3].alpha_acids.max)
+
+    def test_yeasts_columns(self):
+        yeasts = [make_yeast(i) for i in range(0, 20)]
+        yeasts.append(Yeast(name="Unknown", alcohol_tolerance="")) #type: ignore
+        columns = yeasts_to_columns(yeasts)
+
+        self.assertEqual(columns["has_bacterias"][-1], -1)
+        self.assertTrue(math.isnan(columns["alcohol_tolerance"][-1]))
+        self.assertEqual(columns["optimal_temperature_min"][0], yeasts[0].optimal_temperature.min)
+        self.assertEqual(list(decode_dictionary(columns, "flocculation")), [x.flocculation for x in yeasts])
+
+    def test_unknown_ranges(self):
+        hops = [make_hop(i) for i in range(0, 3)]
+        # Never parsed, and a range starting at 0 which is a real value
+        hops[1].alpha_acids = NumericRange()
+        hops[2].farnesene = NumericRange(0, 1)
+        columns = hops_to_columns(hops)
+
+        self.assertTrue(math.isnan(columns["alpha_acids_min"][1]))
+        self.assertTrue(math.isnan(columns["alpha_acids_max"][1]))
+        self.assertEqual(columns["farnesene_min"][2], 0)
+        self.assertEqual(columns["farnesene_max"][2], 1)
+        # Unknown values don't drag aggregates down
+        self.assertEqual(np.nanmean(columns["alpha_acids_max"]), (hops[0].alpha_acids.max + hops[2].alpha_acids.max) / 2)
+
+        yeasts = yeasts_to_columns([Yeast(name="Unknown")])
+        self.assertTrue(math.isnan(yeasts["attenuation_min"][0]))
+        self.assertTrue(math.isnan(yeasts["optimal_temperature_max"][0]))
+
+    def test_write_read(self):
+        columns = hops_to_columns([make_hop(i) for i in range(0, 10)])
+        with tempfile.TemporaryDirectory() as tmp_dir :
+            filepath = Path(tmp_dir).joinpath("hops.npz")
+            write_columns(filepath, columns)
+            read = read_columns(filepath)
+            self.assertEqual(list(Path(tmp_dir).iterdir()), [filepath])
+
+        self.assertEqual(read.keys(), columns.keys())
+        for name in columns :
+            self.assertEqual(read[name].tolist(), columns[name].tolist(), name)
+
+    def test_empty_catalogues(self):
+        self.assertEqual(hops_to_columns([])["radar_chart"].shape, (0, 9))
+        self.assertEqual(len(yeasts_to_columns([])["brand"]), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
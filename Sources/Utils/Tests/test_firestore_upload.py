@@ -0,0 +1,70 @@
+import asyncio
+import unittest
+
+from ..firestore_upload import BulkUploader, chunk_documents
+from ...Benchmarks.fake_firestore import FakeFirestoreClient
+from ...Models.Hop import Hop
+
+
+def make_documents(count : int) -> list[tuple[str, dict]] :
+    return [(f"hop-{i}", Hop(name=f"Hop {i}", id=f"hop-{i}").to_json()) for i in range(0, count)]
+
+
+class TestUtilsFirestoreUpload(unittest.TestCase):
+    def test_chunks(self):
+        chunks = list(chunk_documents(make_documents(1001), 500))
+        self.assertEqual([len(x) for x in chunks], [500, 500, 1])
+        self.assertEqual(list(chunk_documents([], 500)), [])
+
+    def test_batched_upload(self):
+        client = FakeFirestoreClient()
+        collection = client.collection("bmHops")
+        progress : list[int] = []
+
+        report = asyncio.run(BulkUploader(client, base_delay=0).upload(collection, make_documents(1234), progress.append))
+
+        self.assertEqual(report.written, 1234)
+        self.assertEqual(report.batches, 3)
+        self.assertEqual(client.round_trips, 3)
+        self.assertEqual(sum(progress), 1234)
+        self.assertEqual(len(collection.documents), 1234)
+        self.assertEqual(collection.documents["hop-42"]["name"], "Hop 42")
+
+    def test_upload_updates_existing_documents(self):
+        client = FakeFirestoreClient()
+        collection = client.collection("bmHops")
+        collection.documents["hop-0"] = {"name" : "Old name", "legacyField" : True}
+
+        asyncio.run(BulkUploader(client).upload(collection, make_documents(1)))
+
+        # Merged, not replaced
+        self.assertEqual(collection.documents["hop-0"]["name"], "Hop 0")
+        self.assertTrue(collection.documents["hop-0"]["legacyField"])
+
+    def test_transient_errors_are_retried(self):
+        client = FakeFirestoreClient(failures_to_inject=2)
+        collection = client.collection("bmHops")
+
+        report = asyncio.run(BulkUploader(client, batch_size=100, max_concurrent_batches=1, base_delay=0).upload(collection, make_documents(300)))
+
+        self.assertEqual(report.retries, 2)
+        self.assertEqual(report.written, 300)
+        self.assertEqual(report.failed, [])
+        self.assertEqual(len(collection.documents), 300)
+
+    def test_give_up_after_max_attempts(self):
+        client = FakeFirestoreClient(failures_to_inject=3)
+        collection = client.collection("bmHops")
+        progress : list[int] = []
+
+        report = asyncio.run(BulkUploader(client, max_attempts=3, base_delay=0).upload(collection, make_documents(10), progress.append))
+
+        self.assertEqual(report.written, 0)
+        self.assertEqual(len(report.failed), 10)
+        self.assertEqual(client.commits, 3)
+        # Failed documents still count as treated, so that progress reporting ends
+        self.assertEqual(progress, [10])
+
+
+if __name__ == '__main__':
+    unittest.main()
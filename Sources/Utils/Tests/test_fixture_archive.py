@@ -0,0 +1,43 @@
+import zipfile
+import tempfile
+import unittest
+from pathlib import Path
+
+from ..fixture_archive import FixtureArchive, get_path_key, rewrite_base_url
+from ..http import HttpResponse
+
+
+class TestUtilsFixtureArchive(unittest.TestCase):
+    def test_urls(self):
+        self.assertEqual(get_path_key("https://beermaverick.com/yeasts/?yid=42"), "/yeasts/?yid=42")
+        self.assertEqual(get_path_key("https://beermaverick.com/hop/citra/"), "/hop/citra/")
+        self.assertEqual(rewrite_base_url("https://beermaverick.com/api/?hop=citra", "http://127.0.0.1:8080/"), "http://127.0.0.1:8080/api/?hop=citra")
+        self.assertEqual(rewrite_base_url("https://beermaverick.com/hop/citra/", None), "https://beermaverick.com/hop/citra/")
+
+    def test_save_load(self):
+        with tempfile.TemporaryDirectory() as tmp_dir :
+            filepath = Path(tmp_dir).joinpath("fixtures.zip")
+            archive = FixtureArchive(filepath)
+            archive.record(HttpResponse(url="https://beermaverick.com/hop/citra/", status=200, content=b"<html>Citra</html>"))
+            archive.record(HttpResponse(url="https://beermaverick.com/hop/mosaic/", status=200, content=b"<html>Citra</html>"))
+            archive.record(HttpResponse(url="https://beermaverick.com/yeasts/?yid=42", status=301, headers={"Location" : "/yeast/kolsch/"}), allow_redirects=False)
+            archive.record(HttpResponse(url="https://beermaverick.com/yeasts/?yid=42", status=200, content=b"<html>Kolsch</html>"), allow_redirects=True)
+            archive.save()
+
+            # Identical bodies are stored once
+            with zipfile.ZipFile(filepath) as content :
+                self.assertEqual(len([x for x in content.namelist() if x.startswith("bodies/")]), 3)
+
+            reloaded = FixtureArchive(filepath)
+            reloaded.load()
+            self.assertEqual(len(reloaded), 4)
+            self.assertEqual(reloaded.find("/hop/mosaic/").content, b"<html>Citra</html>") #type: ignore
+            # What the server actually sent wins over a followed redirection
+            redirection = reloaded.find("/yeasts/?yid=42")
+            self.assertEqual(redirection.status, 301) #type: ignore
+            self.assertEqual(redirection.headers["Location"], "/yeast/kolsch/") #type: ignore
+            self.assertIsNone(reloaded.find("/hop/unknown/"))
+
+
+if __name__ == '__main__':
+    unittest.main()
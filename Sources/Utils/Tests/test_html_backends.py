@@ -0,0 +1,96 @@
+import unittest
+import importlib.util
+from pathlib import Path
+from typing import Any, Callable
+
+from ..html_backends import DEFAULT_HTML_BACKEND, HTML_BACKENDS, HtmlBackend, get_html_backend
+from ...HopScraper import parse_hop_page
+from ...YeastScraper import YeastScraper, parse_yeast_page
+from ...Models.Hop import Hop
+from ...Models.Yeast import Yeast
+from ...Benchmarks.synthetic_pages import make_hop_page, make_yeast_page
+
+# Saved pages with the odd cases (missing sections, "Unknown" values, nested markup, entities...), on top of synthetic pages.
+PAGES_DIR = Path(__file__).parent.joinpath("Pages")
+HAS_SELECTOLAX = importlib.util.find_spec("selectolax") != None
+
+
+def get_tested_backends() -> list[str] :
+    return [x for x in HTML_BACKENDS.keys() if x != DEFAULT_HTML_BACKEND and (x != "selectolax" or HAS_SELECTOLAX)]
+
+def get_corpus(prefix : str, make_page : Callable[[int], str]) -> list[tuple[str, bytes]] :
+    corpus = [(x.name, x.read_bytes()) for x in sorted(PAGES_DIR.glob(f"{prefix}_*.html"))]
+    corpus += [(f"synthetic_{prefix}_{i}", make_page(i).encode()) for i in range(0, 10)]
+    return corpus
+
+def run_parser(parse : Callable[..., Any], *args : Any) -> Any :
+    # Crashes are part of the output : a page which breaks the reference parser has to break the other ones the same way
+    try :
+        return parse(*args)
+    except Exception as e :
+        return type(e)
+
+
+class TestUtilsHtmlBackends(unittest.TestCase):
+    def test_incomplete_backend(self):
+        class IncompleteBackend(HtmlBackend) :
+            name = "incomplete"
+
+        with self.assertRaises(TypeError) :
+            IncompleteBackend() #type: ignore
+
+    def test_hops_differential(self):
+        for page_name, content in get_corpus("hop", make_hop_page) :
+            hop = Hop(link=f"https://beermaverick.com/hop/{page_name}/", id="0").to_json()
+            expected = run_parser(parse_hop_page, hop, content, DEFAULT_HTML_BACKEND)
+            for backend in get_tested_backends() :
+                with self.subTest(page=page_name, backend=backend) :
+                    self.assertEqual(run_parser(parse_hop_page, hop, content, backend), expected)
+
+    def test_yeasts_differential(self):
+        for page_name, content in get_corpus("yeast", make_yeast_page) :
+            yeast = Yeast(link=f"https://beermaverick.com/yeast/{page_name}/", id="0").to_json()
+            expected = run_parser(parse_yeast_page, yeast, content, DEFAULT_HTML_BACKEND)
+            for backend in get_tested_backends() :
+                with self.subTest(page=page_name, backend=backend) :
+                    self.assertEqual(run_parser(parse_yeast_page, yeast, content, backend), expected)
+
+    def test_corpus_is_meaningful(self):
+        # Make sure the saved pages are actually parsed, and not all rejected the same way by every backend
+        hop = parse_hop_page(Hop(link="https://beermaverick.com/hop/bullion/").to_json(), PAGES_DIR.joinpath("hop_old_variety.html").read_bytes())
+        self.assertEqual(hop["name"], "Bullion")
+        self.assertEqual(hop["beerStyles"], ["Stout", "Porter"])
+        yeast, errors = parse_yeast_page(Yeast(link="https://beermaverick.com/yeast/brett-blend/").to_json(), PAGES_DIR.joinpath("yeast_unknown_values.html").read_bytes())
+        self.assertEqual(yeast["commonBeerStyles"], ["Lambic", "Flanders Red Ale", "Gueuze"])
+        self.assertEqual(yeast["description"], "A funky blend for sour beers.")
+
+    def test_canonical_link_recovery(self):
+        for backend in [DEFAULT_HTML_BACKEND] + get_tested_backends() :
+            with self.subTest(backend=backend) :
+                scraper = YeastScraper()
+                scraper.html_backend = get_html_backend(backend)
+                link = scraper.recover_comparable_yeast_link(make_yeast_page(3).encode(), {}, 200, "/yeasts/?yid=21", Yeast())
+                self.assertEqual(link, "https://beermaverick.com/yeast/kolsch-3/")
+
+    @unittest.skipUnless(HAS_SELECTOLAX, "selectolax is not installed")
+    def test_selectolax_lookups(self):
+        document = get_html_backend("selectolax").parse(b"<div class='a b'><div class='a'><p>x<b>y</b></p></div><p>z</p></div>")
+        outer = document.find("div")
+        self.assertEqual(outer.attrs["class"], ["a", "b"])
+
+        # Only descendants are matched, never the node itself
+        self.assertEqual(outer.find("div").attrs["class"], ["a"])
+        self.assertEqual(len(outer.find_all("div", attrs={"class" : "a"})), 1)
+        self.assertEqual(len(document.find_all("div", attrs={"class" : "a"})), 2)
+        self.assertEqual(len(document.find_all("div", attrs={"class" : "a b"})), 1)
+
+        first_p = outer.find("p")
+        self.assertEqual(first_p.contents[0].text, "x")
+        self.assertEqual(first_p.find_next().name, "b")
+        self.assertEqual(first_p.find_next("p").text, "z")
+        self.assertEqual(first_p.parent.find_next_sibling().text, "z")
+        self.assertEqual(first_p.find_next_sibling(), None)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+import time
+import asyncio
+import unittest
+from threading import Thread
+from ..http import HttpResponse, RequestLimiter, TokenBucket
+
+class TestUtilsHttp(unittest.TestCase):
+    def test_unlimited_bucket_never_waits(self):
+        bucket = TokenBucket(0)
+        for _ in range(0, 100) :
+            self.assertEqual(bucket.reserve(), 0)
+
+    def test_bucket_spaces_requests(self):
+        bucket = TokenBucket(rate=10, burst=2)
+        self.assertEqual(bucket.reserve(), 0)
+        self.assertEqual(bucket.reserve(), 0)
+
+        # Burst is exhausted, next ones have to wait 1/rate each
+        self.assertAlmostEqual(bucket.reserve(), 0.1, delta=0.01)
+        self.assertAlmostEqual(bucket.reserve(), 0.2, delta=0.01)
+
+    def test_buckets_are_per_host(self):
+        limiter = RequestLimiter(requests_per_second=1)
+        self.assertIs(limiter.get_bucket("https://beermaverick.com/hop/apollo/"), limiter.get_bucket("https://beermaverick.com/api/?hop=apollo"))
+        self.assertIsNot(limiter.get_bucket("https://beermaverick.com/hop/apollo/"), limiter.get_bucket("https://example.com/"))
+
+    def test_max_in_flight_threads(self):
+        limiter = RequestLimiter(max_in_flight=3)
+        in_flight = [0]
+        peak = [0]
+
+        def worker() :
+            with limiter.limit("https://beermaverick.com") :
+                in_flight[0] += 1
+                peak[0] = max(peak[0], in_flight[0])
+                time.sleep(0.01)
+                in_flight[0] -= 1
+
+        thread_list = [Thread(target=worker) for _ in range(0, 20)]
+        for thread in thread_list :
+            thread.start()
+        for thread in thread_list :
+            thread.join()
+        self.assertLessEqual(peak[0], 3)
+
+    def test_max_in_flight_async(self):
+        limiter = RequestLimiter(max_in_flight=2, requests_per_second=200, burst=5)
+        in_flight = [0]
+        peak = [0]
+
+        async def worker() :
+            async with limiter.limit_async("https://beermaverick.com") :
+                in_flight[0] += 1
+                peak[0] = max(peak[0], in_flight[0])
+                await asyncio.sleep(0.005)
+                in_flight[0] -= 1
+
+        async def run() :
+            await asyncio.gather(*[worker() for _ in range(0, 20)])
+
+        # Scrapers run one event loop per category, the limiter must survive that
+        asyncio.run(run())
+        asyncio.run(run())
+        self.assertLessEqual(peak[0], 2)
+
+    def test_response_json(self):
+        response = HttpResponse(url="https://beermaverick.com/api/?hop=apollo", status=200, content=b'{"primary" : {}}')
+        self.assertEqual(response.json(), {"primary" : {}})
+        self.assertIn("200", str(response))
+
+
+if __name__ == "__main__" :
+    unittest.main()
@@ -0,0 +1,83 @@
+import os
+import time
+import tempfile
+import unittest
+from pathlib import Path
+from ..http import HttpResponse
+from ..http_cache import CacheMode, ResponseCache, cache_mode_from_str
+
+class TestUtilsHttpCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.directory = Path(self.tmp_dir.name)
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def test_store_and_load(self):
+        cache = ResponseCache(self.directory)
+        response = HttpResponse(url="https://beermaverick.com/hop/apollo/", status=200, headers={"ETag" : "\"abc\""}, content=b"<html></html>")
+        cache.store(response)
+
+        loaded = cache.load(response.url)
+        self.assertEqual(loaded, response)
+
+        # Redirect probes are cached separately from full page loads
+        self.assertIsNone(cache.load(response.url, allow_redirects=False))
+
+    def test_conditional_headers(self):
+        cache = ResponseCache(self.directory)
+        cached = HttpResponse(url="https://beermaverick.com/", status=200, headers={"etag" : "\"abc\"", "Last-Modified" : "Wed, 21 Oct 2015 07:28:00 GMT"})
+        headers = cache.get_conditional_headers(cached)
+        self.assertEqual(headers["If-None-Match"], "\"abc\"")
+        self.assertEqual(headers["If-Modified-Since"], "Wed, 21 Oct 2015 07:28:00 GMT")
+        self.assertEqual(cache.get_conditional_headers(None), {})
+
+    def test_not_modified_yields_cached_response(self):
+        cache = ResponseCache(self.directory)
+        cached = HttpResponse(url="https://beermaverick.com/", status=200, headers={"ETag" : "\"abc\""}, content=b"cached")
+        cache.store(cached)
+
+        result = cache.update(HttpResponse(url=cached.url, status=304), cache.load(cached.url))
+        self.assertEqual(result.content, b"cached")
+        self.assertEqual(result.status, 200)
+
+    def test_read_only_does_not_write(self):
+        cache = ResponseCache(self.directory, CacheMode.ReadOnly)
+        response = HttpResponse(url="https://beermaverick.com/", status=200, content=b"content")
+        cache.update(response, None)
+        self.assertIsNone(cache.load(response.url))
+
+    def test_off_mode(self):
+        cache = ResponseCache(self.directory, cache_mode_from_str("off"))
+        self.assertIsNone(cache.load("https://beermaverick.com/"))
+        with self.assertRaises(ValueError) :
+            cache_mode_from_str("sometimes")
+
+    def test_errors_are_not_cached(self):
+        cache = ResponseCache(self.directory)
+        cache.update(HttpResponse(url="https://beermaverick.com/", status=500, content=b"oops"), None)
+        self.assertIsNone(cache.load("https://beermaverick.com/"))
+
+    def test_lru_eviction(self):
+        cache = ResponseCache(self.directory, max_size=12 * 1024)
+        for i in range(0, 5) :
+            cache.store(HttpResponse(url=f"https://beermaverick.com/{i}", status=200, content=bytes(2000)))
+
+        # Make entry 0 the most recently used one
+        for i in range(0, 5) :
+            meta_path, _ = cache._get_paths(cache.get_key(f"https://beermaverick.com/{i}"))
+            os.utime(meta_path, (time.time() - 100 + i, time.time() - 100 + i))
+        cache.load("https://beermaverick.com/0")
+
+        for i in range(5, 8) :
+            cache.store(HttpResponse(url=f"https://beermaverick.com/{i}", status=200, content=bytes(2000)))
+
+        self.assertIsNotNone(cache.load("https://beermaverick.com/0"))
+        self.assertIsNone(cache.load("https://beermaverick.com/1"))
+        self.assertIsNotNone(cache.load("https://beermaverick.com/7"))
+        self.assertLessEqual(cache._get_current_size(), 12 * 1024)
+
+
+if __name__ == "__main__" :
+    unittest.main()
@@ -0,0 +1,107 @@
+import asyncio
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from typing import Optional
+
+from ..link_resolver import LinkResolver
+
+
+class TestUtilsLinkResolver(unittest.TestCase):
+    def test_memoization(self):
+        resolver = LinkResolver()
+        calls : list[str] = []
+
+        def resolve(url : str) -> Optional[str] :
+            calls.append(url)
+            return None if "broken" in url else f"{url}/canonical"
+
+        self.assertEqual(resolver.resolve("a", resolve), "a/canonical")
+        self.assertEqual(resolver.resolve("a", resolve), "a/canonical")
+        self.assertEqual(resolver.resolve("broken", resolve), None)
+        self.assertEqual(resolver.resolve("broken", resolve), None)
+        self.assertEqual(calls, ["a", "broken"])
+        self.assertEqual((resolver.misses, resolver.hits), (2, 2))
+
+    def test_threads_coalescing(self):
+        resolver = LinkResolver()
+        release = threading.Event()
+        calls : list[str] = []
+
+        def resolve(url : str) -> Optional[str] :
+            calls.append(url)
+            release.wait(5)
+            return "canonical"
+
+        results : list[Optional[str]] = []
+        threads = [threading.Thread(target=lambda : results.append(resolver.resolve("a", resolve))) for _ in range(0, 8)]
+        for thread in threads :
+            thread.start()
+
+        # Let all threads queue up behind the first resolution before releasing it
+        while resolver.coalesced + resolver.misses < 8 :
+            threading.Event().wait(0.001)
+        release.set()
+        for thread in threads :
+            thread.join()
+
+        self.assertEqual(calls, ["a"])
+        self.assertEqual(results, ["canonical"] * 8)
+        self.assertEqual(resolver.coalesced, 7)
+
+    def test_async_coalescing(self):
+        resolver = LinkResolver()
+        calls : list[str] = []
+
+        async def resolve(url : str) -> Optional[str] :
+            calls.append(url)
+            await asyncio.sleep(0.01)
+            return f"{url}/canonical"
+
+        async def run() -> list[Optional[str]] :
+            return await asyncio.gather(*[resolver.resolve_async(x, resolve) for x in ["a", "b", "a", "a", "b"]])
+
+        self.assertEqual(asyncio.run(run()), ["a/canonical", "b/canonical", "a/canonical", "a/canonical", "b/canonical"])
+        self.assertEqual(sorted(calls), ["a", "b"])
+        self.assertEqual(resolver.coalesced, 3)
+
+    def test_failures_are_not_memoized(self):
+        resolver = LinkResolver()
+        attempts : list[str] = []
+
+        async def flaky(url : str) -> Optional[str] :
+            attempts.append(url)
+            await asyncio.sleep(0.01)
+            if len(attempts) == 1 :
+                raise ConnectionError("Connection reset")
+            return "canonical"
+
+        async def run() -> list[object] :
+            # Waiters get the owner's error
+            return await asyncio.gather(*[resolver.resolve_async("a", flaky) for _ in range(0, 3)], return_exceptions=True)
+
+        results = asyncio.run(run())
+        self.assertTrue(all(isinstance(x, ConnectionError) for x in results))
+        self.assertEqual(asyncio.run(resolver.resolve_async("a", flaky)), "canonical")
+        self.assertEqual(len(attempts), 2)
+
+    def test_persistence(self):
+        with tempfile.TemporaryDirectory() as tmp_dir :
+            filepath = Path(tmp_dir).joinpath("links.json")
+            resolver = LinkResolver(filepath)
+            resolver.resolve("a", lambda x : "a/canonical")
+            resolver.resolve("broken", lambda x : None)
+            resolver.save()
+
+            warm = LinkResolver(filepath)
+            warm.load()
+            self.assertEqual(warm.resolve("a", lambda x : "not called"), "a/canonical")
+
+            # Broken links are retried by the next run
+            self.assertEqual(warm.resolve("broken", lambda x : "fixed"), "fixed")
+            self.assertEqual((warm.hits, warm.misses), (1, 1))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+import asyncio
+import threading
+import unittest
+
+from ..metrics import PhaseTiming, ScraperMetrics
+
+
+class TestUtilsMetrics(unittest.TestCase):
+    def test_concurrent_counters(self):
+        metrics = ScraperMetrics()
+        barrier = threading.Barrier(16)
+
+        def work() :
+            barrier.wait()
+            for i in range(0, 5000) :
+                metrics.add("treated")
+                metrics.add("bytes", 10)
+                if i % 10 == 0 :
+                    metrics.add("failed")
+
+        threads = [threading.Thread(target=work) for _ in range(0, 16)]
+        for thread in threads :
+            thread.start()
+        for thread in threads :
+            thread.join()
+
+        snapshot = metrics.snapshot()
+        self.assertEqual(snapshot.get("treated"), 80000)
+        self.assertEqual(snapshot.get("bytes"), 800000)
+        self.assertEqual(snapshot.get("failed"), 8000)
+        self.assertEqual(snapshot.get("warnings"), 0)
+
+    def test_shards_are_reused(self):
+        metrics = ScraperMetrics()
+        for _ in range(0, 50) :
+            thread = threading.Thread(target=metrics.add, args=("treated",))
+            thread.start()
+            thread.join()
+        self.assertEqual(metrics.get("treated"), 50)
+        # Sequential threads usually get the same identifier, anyway there can't be more shards than threads
+        self.assertLessEqual(len(metrics._shards), 50)
+
+    def test_phase_timings(self):
+        metrics = ScraperMetrics()
+
+        async def timed(duration : float) :
+            with metrics.time("fetch") :
+                await asyncio.sleep(duration)
+
+        async def run() :
+            await asyncio.gather(timed(0.02), timed(0.04))
+        asyncio.run(run())
+
+        with metrics.time("parse") :
+            pass
+
+        phases = metrics.snapshot().phases
+        self.assertEqual(phases["fetch"].count, 2)
+        self.assertGreaterEqual(phases["fetch"].total, 0.06)
+        self.assertGreaterEqual(phases["fetch"].max, 0.04)
+        self.assertEqual(phases["parse"].count, 1)
+        self.assertIn("fetch", str(metrics.snapshot()))
+
+    def test_percentiles_and_histogram(self):
+        timing = PhaseTiming()
+        for i in range(1, 101) :
+            timing.add(i / 1000)
+
+        self.assertEqual(timing.get_percentile(50), 0.050)
+        self.assertEqual(timing.get_percentile(95), 0.095)
+        self.assertEqual(timing.get_percentile(99), 0.099)
+        self.assertEqual(timing.get_percentile(100), 0.1)
+        self.assertEqual(PhaseTiming().get_percentile(50), 0)
+
+        histogram = timing.get_histogram()
+        self.assertEqual(histogram["<=1ms"], 1)
+        self.assertEqual(histogram["<=100ms"], 50)
+        self.assertEqual(sum(histogram.values()), 100)
+
+        content = timing.to_json()
+        self.assertEqual(content["count"], 100)
+        self.assertAlmostEqual(content["p95Ms"], 95)
+
+    def test_snapshot_merges_samples(self):
+        metrics = ScraperMetrics()
+        metrics.add_time("parse", 0.01)
+        thread = threading.Thread(target=metrics.add_time, args=("parse", 0.03))
+        thread.start()
+        thread.join()
+
+        content = metrics.snapshot().to_json()
+        self.assertEqual(content["phases"]["parse"]["count"], 2)
+        self.assertAlmostEqual(content["phases"]["parse"]["p99Ms"], 30)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from threading import Thread
+from ..ndjson import NdjsonWriter, read_ndjson, json_to_ndjson, ndjson_to_json
+
+class TestUtilsNdjson(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.directory = Path(self.tmp_dir.name)
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def test_write_read(self):
+        filepath = self.directory.joinpath("hops.ndjson")
+        with NdjsonWriter(filepath) as writer :
+            writer.write({"name" : "Citra®"})
+            writer.write({"name" : "Mosaic"})
+
+        reader = read_ndjson(filepath)
+        self.assertEqual(next(reader), {"name" : "Citra®"})
+        self.assertEqual(next(reader), {"name" : "Mosaic"})
+        with self.assertRaises(StopIteration) :
+            next(reader)
+
+    def test_concurrent_writes(self):
+        filepath = self.directory.joinpath("hops.ndjson")
+        with NdjsonWriter(filepath) as writer :
+            thread_list = [Thread(target=lambda i : [writer.write({"id" : i * 100 + j}) for j in range(0, 100)], args=(i,)) for i in range(0, 8)]
+            for thread in thread_list :
+                thread.start()
+            for thread in thread_list :
+                thread.join()
+        self.assertEqual(sorted(x["id"] for x in read_ndjson(filepath)), list(range(0, 800)))
+
+    def test_truncated_line_is_skipped(self):
+        filepath = self.directory.joinpath("hops.ndjson")
+        with open(filepath, "w") as file :
+            file.write("{\"name\" : \"Citra\"}\n{\"name\" : \"Mos")
+        self.assertEqual(list(read_ndjson(filepath)), [{"name" : "Citra"}])
+        self.assertEqual(list(read_ndjson(self.directory.joinpath("missing.ndjson"))), [])
+
+    def test_conversion_round_trip(self):
+        json_filepath = self.directory.joinpath("hops.json")
+        content = {"hops" : [{"name" : "Citra"}, {"name" : "Mosaic"}]}
+        with open(json_filepath, "w") as file :
+            json.dump(content, file)
+
+        json_to_ndjson(json_filepath, self.directory.joinpath("hops.ndjson"), "hops")
+        ndjson_to_json(self.directory.joinpath("hops.ndjson"), self.directory.joinpath("hops_back.json"), "hops")
+        with open(self.directory.joinpath("hops_back.json")) as file :
+            self.assertEqual(json.load(file), content)
+
+
+if __name__ == "__main__" :
+    unittest.main()
@@ -0,0 +1,53 @@
+import unittest
+import importlib.util
+
+from ..html_backends import HTML_BACKENDS, get_html_backend
+from ..page_index import PageIndex
+
+PAGE = b"""<html><body>
+<h1>Site name</h1>
+<h1 class="entry-title post">Citra Hop</h1>
+<h2>Hop Origin</h2>
+<h2>Origin</h2>
+<h2>Origin</h2>
+<table class="basics"><tr><th>Purpose:</th><td>Aroma</td></tr><tr><th>Country:</th><td>US</td></tr></table>
+<table class="brewvalues table"><tbody>
+<tr><th>Alpha Acid % (AA)<span>?</span></th><td>11-15%</td></tr>
+<tr><th>Total Oils (mL/100g) *</th><td>1.5-3 mL</td></tr>
+<tr><th></th><td>No label</td></tr>
+<tr><th>No value</th></tr>
+</tbody></table>
+</body></html>"""
+
+def get_backends() -> list[str] :
+    return [x for x in HTML_BACKENDS.keys() if x != "selectolax" or importlib.util.find_spec("selectolax") != None]
+
+
+class TestUtilsPageIndex(unittest.TestCase):
+    def test_lookups(self):
+        for backend in get_backends() :
+            with self.subTest(backend=backend) :
+                index = PageIndex(get_html_backend(backend).parse(PAGE))
+
+                self.assertEqual(index.find_title("entry-title").text, "Citra Hop")
+                self.assertEqual(index.find_title("missing"), None)
+
+                # First header containing the name wins, like a sequential scan would do
+                self.assertEqual(list(index.headers.keys()), ["Hop Origin", "Origin"])
+                self.assertEqual(index.find_header("Origin").text, "Hop Origin")
+                self.assertEqual(index.find_header("Styles"), None)
+
+                self.assertEqual(index.get_row("Purpose:").text, "Aroma")
+                self.assertEqual(index.get_row("Purpose"), None)
+                self.assertEqual(index.get_row("No value"), None)
+
+                self.assertTrue(index.has_table("basics"))
+                self.assertTrue(index.has_table("table"))
+                self.assertFalse(index.has_table("tags"))
+                self.assertEqual(index.find_row("Alpha Acid % (AA)", "brewvalues").text, "11-15%")
+                self.assertEqual(index.find_row("Total Oils (mL/100g)", "brewvalues").text, "1.5-3 mL")
+                self.assertEqual(index.find_row("Purpose:", "brewvalues"), None)
+
+
+if __name__ == '__main__':
+    unittest.main()
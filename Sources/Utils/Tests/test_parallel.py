@@ -1,5 +1,9 @@
+import time
+import asyncio
 import unittest
-from ..parallel import spread_load_for_parallel
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from ..parallel import spread_load_for_parallel, consume_queue_async, iter_completed
 
 class TestUtilsParallel(unittest.TestCase):
     def test_load_spreading(self):
@@ -20,6 +24,76 @@ class TestUtilsParallel(unittest.TestCase):
         self.assertEqual(len(matrix[1]), 3)
         self.assertEqual(len(matrix[2]), 2)
 
+    def test_load_spreading_auto_jobs(self):
+        # 0 and -1 both mean "auto", none of them should crash
+        self.assertEqual(sum(len(x) for x in spread_load_for_parallel(list(range(10)), 0)), 10)
+        self.assertEqual(sum(len(x) for x in spread_load_for_parallel(list(range(10)), -1)), 10)
+
+    def test_iter_completed_balances_skewed_load(self):
+        # First 2 items are slow : with static partitioning, the first worker would get both of them.
+        durations = [0.2, 0.2] + [0.0] * 6
+        start = time.perf_counter()
+        with ThreadPoolExecutor(2) as executor :
+            self.assertEqual(len(list(iter_completed(executor, durations, time.sleep, 2))), 8)
+        self.assertLess(time.perf_counter() - start, 0.35)
+
+    def test_iter_completed_streams_in_completion_order(self):
+        with ThreadPoolExecutor(4) as executor :
+            completed = [x for x, _ in iter_completed(executor, [0.2, 0.0, 0.1], time.sleep, 4)]
+            self.assertEqual(completed, [0.0, 0.1, 0.2])
+            self.assertEqual(list(iter_completed(executor, [], time.sleep, 4)), [])
+
+    def test_iter_completed_bounds_pending_calls(self):
+        lock = threading.Lock()
+        running = [0, 0]
+        consumed : list[int] = []
+
+        def work(x : int) -> int :
+            with lock :
+                running[0] += 1
+                running[1] = max(running[1], running[0])
+            time.sleep(0.001)
+            with lock :
+                running[0] -= 1
+            return x * 2
+
+        def inputs() :
+            for i in range(0, 50) :
+                consumed.append(i)
+                yield i
+
+        with ThreadPoolExecutor(16) as executor :
+            results = []
+            for x, future in iter_completed(executor, inputs(), work, 3) :
+                # Inputs are pulled lazily : 3 pending calls at most, plus the one being yielded
+                self.assertLessEqual(len(consumed) - len(results), 4)
+                results.append(future.result())
+
+        self.assertEqual(sorted(results), [x * 2 for x in range(0, 50)])
+        self.assertLessEqual(running[1], 3)
+
+    def test_iter_completed_keeps_exceptions(self):
+        def work(x : int) -> int :
+            if x == 2 :
+                raise ValueError("boom")
+            return x
+
+        with ThreadPoolExecutor(2) as executor :
+            outcomes = {x : future.exception() for x, future in iter_completed(executor, range(0, 4), work, 2)}
+        self.assertIsInstance(outcomes[2], ValueError)
+        self.assertIsNone(outcomes[3])
+
+    def test_queue_async_consumes_everything(self):
+        input_list = list(range(100))
+        output_list : list[int] = []
+
+        async def worker(x : int) :
+            await asyncio.sleep(0)
+            output_list.append(x)
+
+        asyncio.run(consume_queue_async(input_list, worker, 8))
+        self.assertEqual(sorted(output_list), input_list)
+
 
 if __name__ == "__main__" :
-    unittest.main()
\ No newline at end of file
+    unittest.main()
@@ -0,0 +1,76 @@
+import time
+import asyncio
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from ..progress import ProgressTracker, report_progress
+
+
+class TestUtilsProgress(unittest.TestCase):
+    def test_concurrent_increments(self):
+        tracker = ProgressTracker(8 * 10000)
+        with ThreadPoolExecutor(8) as executor :
+            for _ in range(0, 8) :
+                executor.submit(lambda : [tracker.advance() for _ in range(0, 10000)])
+        self.assertEqual(tracker.get(), 80000)
+        self.assertTrue(tracker.is_done())
+
+        async def advance_from_tasks() :
+            async def task() :
+                await asyncio.sleep(0)
+                tracker.advance(2)
+            await asyncio.gather(*[task() for _ in range(0, 100)])
+
+        tracker.reset(200)
+        asyncio.run(advance_from_tasks())
+        self.assertEqual(tracker.get(), 200)
+
+    def test_wait_for_change(self):
+        tracker = ProgressTracker(10)
+        # Nothing happens : returns on timeout
+        self.assertEqual(tracker.wait_for_change(0, timeout=0.01), 0)
+
+        timer = threading.Timer(0.05, tracker.advance, args=(3,))
+        timer.start()
+        self.assertEqual(tracker.wait_for_change(0, timeout=5), 3)
+        timer.join()
+
+    def test_rate_and_eta(self):
+        tracker = ProgressTracker(100)
+        self.assertIsNone(tracker.get_eta())
+        self.assertTrue(tracker.get_status().endswith("ETA --:--"))
+
+        tracker.start_time -= 10
+        tracker.advance(50)
+        self.assertAlmostEqual(tracker.get_rate(), 5, delta=0.1)
+        self.assertAlmostEqual(tracker.get_eta(), 10, delta=0.5) #type: ignore
+
+    def test_report_is_throttled(self):
+        tracker = ProgressTracker(1000)
+        renders : list[int] = []
+        thread = threading.Thread(target=report_progress, args=(tracker, 0.05, 1.0, lambda x : renders.append(x.get())))
+        thread.start()
+
+        for _ in range(0, 1000) :
+            tracker.advance()
+            time.sleep(0.0002)
+        thread.join(5)
+
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(renders[-1], 1000)
+        # Way less renders than updates
+        self.assertLess(len(renders), 100)
+
+    def test_report_ends_when_closed(self):
+        tracker = ProgressTracker(10)
+        thread = threading.Thread(target=report_progress, args=(tracker, 0, 1.0, lambda x : None))
+        thread.start()
+        tracker.advance(4)
+        tracker.close()
+        thread.join(5)
+        self.assertFalse(thread.is_alive())
+
+
+if __name__ == '__main__':
+    unittest.main()
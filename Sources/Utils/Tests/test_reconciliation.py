@@ -0,0 +1,29 @@
+import unittest
+from ..reconciliation import reconcile_cache
+
+class TestUtilsReconciliation(unittest.TestCase):
+    def test_reconciliation(self):
+        links = ["a", "b", "c", "d"]
+        cached = [("b", 1), ("z", 2), ("c", 3), ("d", 4), ("b", 5)]
+
+        result = reconcile_cache(links, cached, lambda x : x[0], lambda x : x[1] == 3)
+        self.assertEqual(result.to_scrape, ["a", "c"])
+        self.assertEqual(result.to_keep, [("b", 1), ("d", 4)])
+        self.assertEqual(result.outdated, [("c", 3)])
+        self.assertEqual(result.to_evict, [("z", 2), ("b", 5)])
+
+    def test_empty_cache(self):
+        result = reconcile_cache(["a", "b", "a"], [], lambda x : x)
+        self.assertEqual(result.to_scrape, ["a", "b"])
+        self.assertEqual(len(result.to_keep), 0)
+
+    def test_scales_linearly(self):
+        # Would take ages with the list.remove() approach
+        links = [f"https://beermaverick.com/hop/{i}/" for i in range(0, 200000)]
+        result = reconcile_cache(links, list(reversed(links[1:])), lambda x : x)
+        self.assertEqual(result.to_scrape, [links[0]])
+        self.assertEqual(len(result.to_keep), len(links) - 1)
+
+
+if __name__ == "__main__" :
+    unittest.main()
@@ -0,0 +1,76 @@
+import asyncio
+import unittest
+
+from aiohttp import web
+
+from ..metrics import ScraperMetrics
+from ..request_timing import create_traced_session
+from ...HopScraper import HopScraper
+from ...Models.Hop import Hop
+from ...Benchmarks.synthetic_pages import make_hop_page
+
+
+async def serve(handler, coroutine) :
+    """Runs coroutine(base url) against a local server answering every request with handler."""
+    app = web.Application()
+    app.router.add_get("/{tail:.*}", handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = runner.addresses[0][1]
+    try :
+        return await coroutine(f"http://127.0.0.1:{port}")
+    finally :
+        await runner.cleanup()
+
+
+class TestUtilsRequestTiming(unittest.TestCase):
+    def test_trace_config(self):
+        async def handler(request : web.Request) -> web.Response :
+            await asyncio.sleep(0.02)
+            return web.Response(body=b"x" * 1000)
+
+        metrics = ScraperMetrics()
+        async def run(base_url : str) :
+            async with create_traced_session() as session :
+                for _ in range(0, 3) :
+                    async with session.get(f"{base_url}/page", trace_request_ctx=metrics) as response :
+                        await response.read()
+                # Not recorded
+                async with session.get(f"{base_url}/page") as response :
+                    await response.read()
+
+        asyncio.run(serve(handler, run))
+        phases = metrics.snapshot().phases
+        self.assertEqual(phases["request.ttfb"].count, 3)
+        self.assertGreaterEqual(phases["request.ttfb"].get_percentile(50), 0.02)
+        # Connection is kept alive : a single one is created
+        self.assertEqual(phases["request.connect"].count, 1)
+
+    def test_scraper_profile(self):
+        page = make_hop_page(1).encode()
+        async def handler(request : web.Request) -> web.Response :
+            return web.Response(body=page, content_type="text/html")
+
+        scraper = HopScraper()
+        hop = Hop(link="https://beermaverick.com/hop/test/")
+        async def run(base_url : str) :
+            scraper.async_client = scraper.create_async_session()
+            async with scraper.async_client :
+                response = await scraper.fetch_async(f"{base_url}/hop/test/")
+                await scraper.parse_page_async(hop, response.content)
+
+        asyncio.run(serve(handler, run))
+        self.assertNotEqual(hop.name, "")
+
+        content = scraper.metrics.snapshot().to_json()
+        self.assertEqual(content["counters"]["requests"], 1)
+        self.assertEqual(content["counters"]["bytes"], len(page))
+        for phase in ["fetch", "request.ttfb", "request.body", "parse", "parse.html", "parse.index", "parse.basics", "parse.hop_substitution"] :
+            self.assertEqual(content["phases"][phase]["count"], 1, phase)
+        self.assertIn("p99Ms", content["phases"]["parse"])
+
+
+if __name__ == '__main__':
+    unittest.main()
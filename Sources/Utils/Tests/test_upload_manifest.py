@@ -0,0 +1,113 @@
+import asyncio
+import tempfile
+import unittest
+from pathlib import Path
+
+from ..upload_manifest import UploadManifest, hash_content
+from ..firestore_upload import BulkUploader
+from ...Benchmarks.fake_firestore import FakeFirestoreClient
+from ...Models.Hop import Hop
+
+
+def make_documents(count : int) -> list[tuple[str, dict]] :
+    return [(f"hop-{i}", Hop(name=f"Hop {i}", id=f"hop-{i}").to_json()) for i in range(0, count)]
+
+
+class TestUtilsUploadManifest(unittest.TestCase):
+    def test_hash_ignores_key_order_and_volatile_keys(self):
+        content = Hop(name="Cascade", id="cascade").to_json()
+        reordered = dict(reversed(list(content.items())))
+        self.assertEqual(hash_content(content), hash_content(reordered))
+
+        reextracted = dict(content, extractedAt="2026-01-01T00:00:00")
+        self.assertEqual(hash_content(content), hash_content(reextracted))
+
+        modified = dict(content, name="Cascade (US)")
+        self.assertNotEqual(hash_content(content), hash_content(modified))
+
+    def test_diff(self):
+        manifest = UploadManifest(Path("unused"))
+        documents = make_documents(10)
+        diff = manifest.diff("bmHops", documents)
+        self.assertEqual(len(diff.to_write), 10)
+        manifest.record("bmHops", diff, [], [])
+
+        # Two changed, one vanished, one new
+        documents[0][1]["name"] = "Renamed"
+        documents[1][1]["purpose"] = "Aroma"
+        documents = documents[:-1] + make_documents(11)[-1:]
+        diff = manifest.diff("bmHops", documents)
+
+        self.assertEqual([x[0] for x in diff.to_write], ["hop-0", "hop-1", "hop-10"])
+        self.assertEqual(diff.unchanged, 7)
+        self.assertEqual(diff.to_delete, ["hop-9"])
+        # Collections don't mix
+        self.assertEqual(len(manifest.diff("bmYeasts", documents).to_write), 10)
+
+    def test_write_all_still_finds_vanished_documents(self):
+        manifest = UploadManifest(Path("unused"))
+        manifest.record("bmHops", manifest.diff("bmHops", make_documents(5)), [], [])
+
+        diff = manifest.diff("bmHops", make_documents(4), write_all=True)
+        self.assertEqual(len(diff.to_write), 4)
+        self.assertEqual(diff.unchanged, 0)
+        self.assertEqual(diff.to_delete, ["hop-4"])
+
+        # Not deleted this time : it's remembered for a later delete
+        manifest.record("bmHops", diff, [], [])
+        self.assertEqual(manifest.diff("bmHops", make_documents(4)).to_delete, ["hop-4"])
+
+    def test_failed_documents_are_retried_next_time(self):
+        manifest = UploadManifest(Path("unused"))
+        diff = manifest.diff("bmHops", make_documents(5))
+        manifest.record("bmHops", diff, [], ["hop-3"])
+
+        diff = manifest.diff("bmHops", make_documents(4))
+        self.assertEqual([x[0] for x in diff.to_write], ["hop-3"])
+        manifest.record("bmHops", diff, ["hop-4"], [])
+        self.assertFalse("hop-4" in manifest.collections["bmHops"])
+        self.assertEqual(manifest.diff("bmHops", make_documents(4)).to_write, [])
+
+    def test_save_load(self):
+        with tempfile.TemporaryDirectory() as tmp_dir :
+            filepath = Path(tmp_dir).joinpath("upload_manifest.json")
+            manifest = UploadManifest(filepath)
+            manifest.record("bmHops", manifest.diff("bmHops", make_documents(3)), [], [])
+            manifest.save()
+
+            reloaded = UploadManifest(filepath)
+            reloaded.load()
+            self.assertEqual(reloaded.collections, manifest.collections)
+
+            # Corrupted manifest : everything gets uploaded again
+            filepath.write_text("{not json")
+            corrupted = UploadManifest(filepath)
+            corrupted.load()
+            self.assertEqual(corrupted.collections, {})
+
+    def test_incremental_upload(self):
+        client = FakeFirestoreClient()
+        collection = client.collection("bmHops")
+        uploader = BulkUploader(client, base_delay=0)
+        manifest = UploadManifest(Path("unused"))
+
+        diff = manifest.diff("bmHops", make_documents(600))
+        asyncio.run(uploader.upload(collection, diff.to_write))
+        manifest.record("bmHops", diff, [], [])
+        self.assertEqual(client.round_trips, 2)
+
+        # Unchanged catalogue : nothing to send
+        diff = manifest.diff("bmHops", make_documents(600))
+        self.assertEqual(diff.to_write, [])
+
+        diff = manifest.diff("bmHops", make_documents(598))
+        report = asyncio.run(uploader.delete(collection, diff.to_delete))
+        self.assertEqual(report.deleted, 2)
+        self.assertEqual(report.written, 0)
+        self.assertEqual(client.round_trips, 3)
+        self.assertEqual(len(collection.documents), 598)
+        self.assertFalse("hop-599" in collection.documents)
+
+
+if __name__ == '__main__':
+    unittest.main()
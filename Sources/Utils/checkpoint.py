@@ -0,0 +1,146 @@
+import os
+import json
+import time
+import traceback
+import threading
+from pathlib import Path
+from typing import Any, Callable, Iterator, Optional, TypeVar
+
+from .ndjson import read_ndjson
+
+
+T = TypeVar("T")
+
+class CheckpointJournal :
+    """Keeps track of completed links and their serialized items during a crawl, and periodically appends them to disk.
+       The journal is an NDJSON file, one {"link", "item"} entry per line : a checkpoint only writes the entries recorded since the
+       previous one, so its cost doesn't grow with the crawl. A crash while writing only loses the truncated last line (skipped on load).
+       A checkpoint is taken every interval_seconds or every interval_items new items, whichever comes first.
+       Checkpoints are written (and synced) by a dedicated writer thread : recording threads, or the event loop in async mode,
+       never wait on the disk. Call close() (or clear()) once done, to write what's left and stop the writer thread."""
+    filepath : Path
+    interval_seconds : float
+    interval_items : int
+    completed : dict[str, dict[str, Any]]
+
+    def __init__(self, filepath : Path, interval_seconds : float = 5, interval_items : int = 50) -> None:
+        self.filepath = filepath
+        self.interval_seconds = interval_seconds
+        self.interval_items = interval_items
+        self.completed = {}
+        # Guards completed and the pending lines
+        self._lock = threading.Lock()
+        # Guards the file, a single checkpoint is written at a time
+        self._write_lock = threading.Lock()
+        self._last_save = time.monotonic()
+        self._pending_lines : list[str] = []
+        # A journal left by a previous run is replaced, unless it was loaded to be resumed
+        self._truncate = True
+        # Started on the first due checkpoint, woken up by record()
+        self._writer : Optional[threading.Thread] = None
+        self._wake = threading.Event()
+
+    def load(self) -> None :
+        """Loads the journal left on disk by a previous run, if any. New entries are appended to it."""
+        completed = {entry["link"] : entry["item"] for entry in read_ndjson(self.filepath)}
+        self._drop_truncated_line()
+        with self._lock :
+            self.completed = completed
+            self._truncate = False
+
+    def get_items(self, factory : Callable[[], T]) -> Iterator[T] :
+        """Deserializes the items recorded in the journal. factory creates an empty item, populated with its from_json() method."""
+        for content in list(self.completed.values()) :
+            item = factory()
+            item.from_json(content) #type: ignore
+            yield item
+
+    def record(self, link : str, content : dict[str, Any]) -> None :
+        """Records a completed link with its serialized item. Safe to call from several threads."""
+        line = json.dumps({"link" : link, "item" : content}, ensure_ascii=False) + "\n"
+        with self._lock :
+            self.completed[link] = content
+            self._pending_lines.append(line)
+            due = len(self._pending_lines) >= self.interval_items or time.monotonic() - self._last_save >= self.interval_seconds
+        if due :
+            self._wake_writer()
+
+    def save(self) -> None :
+        """Writes pending entries right away, on the calling thread."""
+        with self._write_lock :
+            self._write_pending()
+
+    def close(self) -> None :
+        """Stops the writer thread and writes what's left. Recording again starts a new writer thread."""
+        with self._lock :
+            writer = self._writer
+            wake = self._wake
+            self._writer = None
+        if writer != None :
+            wake.set()
+            writer.join()
+        self.save()
+
+    def clear(self) -> None :
+        """Called once the crawl is over and its results safely written elsewhere."""
+        self.close()
+        with self._write_lock, self._lock :
+            self.completed = {}
+            self._pending_lines = []
+            self._truncate = True
+            self.filepath.unlink(missing_ok=True)
+
+    def _drop_truncated_line(self) -> None :
+        """Removes what's left of an entry the previous run was killed writing, so that new entries don't get appended to it."""
+        if not self.filepath.exists() :
+            return
+        with open(self.filepath, "rb+") as file :
+            content = file.read()
+            if content == b"" or content.endswith(b"\n") :
+                return
+            file.truncate(content.rfind(b"\n") + 1)
+
+    def _wake_writer(self) -> None :
+        with self._lock :
+            if self._writer == None :
+                # Each writer thread has its own event, so that a stopping writer can't miss its last wake up
+                self._wake = threading.Event()
+                self._writer = threading.Thread(target=self._run_writer, args=(self._wake,), name="checkpoint-writer", daemon=True)
+                self._writer.start()
+            wake = self._wake
+        wake.set()
+
+    def _run_writer(self, wake : threading.Event) -> None :
+        while True :
+            wake.wait()
+            wake.clear()
+            # Stopped by close()
+            if self._writer is not threading.current_thread() :
+                return
+            try :
+                with self._write_lock :
+                    self._write_pending()
+            except OSError :
+                # Entries are kept pending, next checkpoint gives it another try
+                traceback.print_exc()
+
+    def _write_pending(self) -> None :
+        """Appends pending entries to the journal, the write lock must be held."""
+        with self._lock :
+            lines = self._pending_lines
+            self._pending_lines = []
+            self._last_save = time.monotonic()
+            mode = "w" if self._truncate else "a"
+            self._truncate = False
+
+        try :
+            with open(self.filepath, mode, encoding="utf-8") as file :
+                file.write("".join(lines))
+                file.flush()
+                os.fsync(file.fileno())
+        except OSError :
+            # Written again by the next checkpoint
+            with self._lock :
+                self._pending_lines = lines + self._pending_lines
+                self._truncate = self._truncate or mode == "w"
+            raise
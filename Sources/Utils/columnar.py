@@ -0,0 +1,107 @@
+import os
+from pathlib import Path
+from dataclasses import fields
+from typing import Any
+
+from ..Models.Hop import Hop, RadarChart
+from ..Models.Yeast import Yeast
+
+# Columnar export of catalogues, for statistical analysis : one numpy array per attribute instead of one object per item,
+# so that aggregations run vectorised. Saved as .npz archives (numpy needs to be installed, it's only required for this export).
+# * ranges      : float64 <name>_min and <name>_max columns (e.g. alpha_acids_min, alpha_acids_max), NaN when unknown
+# * radar chart : (items, axes) integer matrix, axes names in radar_chart_axes
+# * categories  : dictionary encoded, <name> holds int32 codes into the (sorted) <name>_categories strings array
+# * texts       : id, name, link, ... as numpy strings. Long texts (descriptions, origin) and lists aren't exported, json files have them.
+# Example : mean alpha acids per country
+#   columns = read_columns(Path("hops.npz"))
+#   known = ~np.isnan(columns["alpha_acids_max"])
+#   means = np.bincount(columns["country"][known], weights=columns["alpha_acids_max"][known]) / np.bincount(columns["country"][known])
+#   dict(zip(columns["country_categories"], means))
+
+HOP_RANGES = ["alpha_acids", "beta_acids", "co_humulone_normalized", "total_oils", "myrcene", "humulene", "caryophyllene", "farnesene", "other_oils"]
+YEAST_RANGES = ["attenuation", "optimal_temperature"]
+RADAR_CHART_AXES = [x.name for x in fields(RadarChart)]
+
+
+def _import_numpy() -> Any :
+    # Optional dependency, only required when exporting
+    try :
+        import numpy
+    except ImportError as e :
+        raise ImportError("columnar export requires the numpy package (pip install numpy)") from e
+    return numpy
+
+def _to_float(value : Any) -> float :
+    """Unknown or unparsable values (e.g. "" for yeasts without alcohol tolerance) become NaN"""
+    try :
+        return float(value)
+    except (TypeError, ValueError) :
+        return float("nan")
+
+def _encode_dictionary(columns : dict[str, Any], name : str, values : list[str]) -> None :
+    np = _import_numpy()
+    categories, codes = np.unique(np.array(values, dtype=str), return_inverse=True)
+    columns[name] = codes.astype(np.int32)
+    columns[f"{name}_categories"] = categories
+
+def _add_ranges(columns : dict[str, Any], items : list[Any], names : list[str]) -> None :
+    np = _import_numpy()
+    for name in names :
+        min_column = np.fromiter((getattr(x, name).min for x in items), dtype=np.float64, count=len(items))
+        max_column = np.fromiter((getattr(x, name).max for x in items), dtype=np.float64, count=len(items))
+        # Ranges which couldn't be parsed keep their default (0, 0) bounds : they're unknown, not zero.
+        # A genuine "0 - 0" range can't be told apart from those in the models, it's exported as unknown as well.
+        unknown = (min_column == 0) & (max_column == 0)
+        min_column[unknown] = np.nan
+        max_column[unknown] = np.nan
+        columns[f"{name}_min"] = min_column
+        columns[f"{name}_max"] = max_column
+
+def _add_texts(columns : dict[str, Any], items : list[Any], names : list[str]) -> None :
+    np = _import_numpy()
+    for name in names :
+        columns[name] = np.array([getattr(x, name) for x in items], dtype=str)
+
+def hops_to_columns(hops : list[Hop]) -> dict[str, Any] :
+    np = _import_numpy()
+    columns : dict[str, Any] = {}
+    _add_texts(columns, hops, ["id", "name", "link", "international_code", "cultivar_id"])
+    _encode_dictionary(columns, "purpose", [x.purpose.value for x in hops])
+    _encode_dictionary(columns, "country", [x.country for x in hops])
+    _add_ranges(columns, hops, HOP_RANGES)
+    columns["alpha_beta_ratio_min"] = np.array([x.alpha_beta_ratio.min for x in hops], dtype=str)
+    columns["alpha_beta_ratio_max"] = np.array([x.alpha_beta_ratio.max for x in hops], dtype=str)
+    columns["hop_storage_index"] = np.array([_to_float(x.hop_storage_index) for x in hops], dtype=np.float64)
+    columns["radar_chart"] = np.array([[getattr(x.radar_chart, axis) for axis in RADAR_CHART_AXES] for x in hops], dtype=np.int32).reshape(len(hops), len(RADAR_CHART_AXES))
+    columns["radar_chart_axes"] = np.array(RADAR_CHART_AXES, dtype=str)
+    return columns
+
+def yeasts_to_columns(yeasts : list[Yeast]) -> dict[str, Any] :
+    np = _import_numpy()
+    columns : dict[str, Any] = {}
+    _add_texts(columns, yeasts, ["id", "name", "link"])
+    for name in ["brand", "type", "packaging", "flocculation"] :
+        _encode_dictionary(columns, name, [getattr(x, name) for x in yeasts])
+    # -1 when unknown
+    columns["has_bacterias"] = np.array([-1 if x.has_bacterias == None else int(x.has_bacterias) for x in yeasts], dtype=np.int8)
+    columns["alcohol_tolerance"] = np.array([_to_float(x.alcohol_tolerance) for x in yeasts], dtype=np.float64)
+    _add_ranges(columns, yeasts, YEAST_RANGES)
+    return columns
+
+def decode_dictionary(columns : dict[str, Any], name : str) -> Any :
+    """Values of a dictionary encoded column, as a strings array."""
+    return columns[f"{name}_categories"][columns[name]]
+
+def write_columns(filepath : Path, columns : dict[str, Any]) -> None :
+    np = _import_numpy()
+    filepath.parent.mkdir(parents=True, exist_ok=True)
+    # Written through a file object : numpy would append .npz to the temporary file name otherwise
+    tmp_path = filepath.with_name(f"{filepath.name}.tmp")
+    with open(tmp_path, "wb") as file :
+        np.savez_compressed(file, **columns)
+    os.replace(tmp_path, filepath)
+
+def read_columns(filepath : Path) -> dict[str, Any] :
+    np = _import_numpy()
+    with np.load(filepath, allow_pickle=False) as content :
+        return {name : content[name] for name in content.files}
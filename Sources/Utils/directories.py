@@ -6,6 +6,7 @@ class Directories :
     CACHE_DIR = SCRIPT_DIR.joinpath(".cache")
     EXTRACTED_DIR = CACHE_DIR.joinpath("extracted")
     PROCESSED_DIR = CACHE_DIR.joinpath("processed")
+    HTTP_CACHE_DIR = CACHE_DIR.joinpath("http")
 
     # Secrets directory resides at workspace folder
     SECRETS_DIR = SCRIPT_DIR.joinpath("../.secrets")
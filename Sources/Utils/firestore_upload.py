@@ -0,0 +1,131 @@
+import time
+import random
+import asyncio
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterable, Iterator, Optional
+
+from google.api_core import exceptions as gexceptions #type: ignore
+
+
+# Transient errors worth another try, anything else (permission denied, invalid argument, ...) won't get any better
+RETRYABLE_ERRORS = (gexceptions.Aborted,
+                    gexceptions.DeadlineExceeded,
+                    gexceptions.InternalServerError,
+                    gexceptions.ResourceExhausted,
+                    gexceptions.ServiceUnavailable)
+
+# Firestore refuses batches with more than 500 writes
+MAX_BATCH_SIZE = 500
+
+
+@dataclass
+class UploadReport :
+    written : int = 0
+    deleted : int = 0
+    batches : int = 0
+    retries : int = 0
+    failed : list[str] = field(default_factory=list)
+    duration : float = 0
+
+    def get_rate(self) -> float :
+        """Written (or deleted) documents per second."""
+        return (self.written + self.deleted) / self.duration if self.duration > 0 else 0
+
+    def __str__(self) -> str :
+        return (f"{self.written} documents written, {self.deleted} deleted in {self.batches} batches ({self.get_rate():.1f} docs/s), "
+                f"{self.retries} retried batches, {len(self.failed)} failed documents.")
+
+
+# Document id and its content, no content means the document has to be deleted
+WriteOp = tuple[str, Optional[dict[str, Any]]]
+
+def chunk_documents(documents : Iterable[WriteOp], size : int) -> Iterator[list[WriteOp]] :
+    chunk : list[WriteOp] = []
+    for document in documents :
+        chunk.append(document)
+        if len(chunk) == size :
+            yield chunk
+            chunk = []
+    if len(chunk) != 0 :
+        yield chunk
+
+
+class BulkUploader :
+    """Uploads documents to a Firestore collection with batched writes : one round trip per batch of (up to) 500 documents,
+       instead of a get() and an update() per document.
+       * Documents are written with set(merge=True) : a single write op which creates the document or updates it, no need to read it first.
+       * Up to max_concurrent_batches batches are committed at once.
+       * Batches failing with a transient error are retried with exponential backoff (and some jitter), up to max_attempts times.
+         Documents of batches which still fail are reported in UploadReport.failed.
+       Works with anything exposing the async Firestore api used here (client.batch(), collection.document(), batch.set(), batch.commit()) :
+       the real client (which also targets the emulator when FIRESTORE_EMULATOR_HOST is set) or an in-memory fake."""
+    client : Any
+    batch_size : int
+    max_concurrent_batches : int
+    max_attempts : int
+    base_delay : float
+
+    def __init__(self, client : Any, batch_size : int = MAX_BATCH_SIZE, max_concurrent_batches : int = 8,
+                 max_attempts : int = 5, base_delay : float = 0.5) -> None:
+        self.client = client
+        self.batch_size = max(1, min(batch_size, MAX_BATCH_SIZE))
+        self.max_concurrent_batches = max(1, max_concurrent_batches)
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+
+    async def upload(self, collection : Any, documents : Iterable[tuple[str, dict[str, Any]]],
+                     on_progress : Optional[Callable[[int], None]] = None) -> UploadReport :
+        """Writes (document id, content) pairs to collection. on_progress is called with the size of each batch once it's done (written or failed)."""
+        return await self._run(collection, documents, on_progress)
+
+    async def delete(self, collection : Any, document_ids : Iterable[str],
+                     on_progress : Optional[Callable[[int], None]] = None) -> UploadReport :
+        """Deletes documents from collection, same batching and retry policy as upload()."""
+        return await self._run(collection, ((x, None) for x in document_ids), on_progress)
+
+    async def _run(self, collection : Any, operations : Iterable[WriteOp], on_progress : Optional[Callable[[int], None]]) -> UploadReport :
+        report = UploadReport()
+        semaphore = asyncio.Semaphore(self.max_concurrent_batches)
+        start = time.perf_counter()
+
+        async def commit(chunk : list[WriteOp]) :
+            async with semaphore :
+                await self._commit_with_retry(collection, chunk, report)
+            if on_progress :
+                on_progress(len(chunk))
+
+        async with asyncio.TaskGroup() as tg :
+            for chunk in chunk_documents(operations, self.batch_size) :
+                tg.create_task(commit(chunk))
+
+        report.duration = time.perf_counter() - start
+        return report
+
+    async def _commit_with_retry(self, collection : Any, chunk : list[WriteOp], report : UploadReport) -> None :
+        for attempt in range(1, self.max_attempts + 1) :
+            # A committed (or failed) batch can't be reused, a new one is built for every attempt
+            batch = self.client.batch()
+            for document_id, content in chunk :
+                if content == None :
+                    batch.delete(collection.document(document_id))
+                else :
+                    batch.set(collection.document(document_id), content, merge=True)
+
+            try :
+                await batch.commit()
+                num_deleted = sum(1 for x in chunk if x[1] == None)
+                report.deleted += num_deleted
+                report.written += len(chunk) - num_deleted
+                report.batches += 1
+                return
+            except RETRYABLE_ERRORS as e :
+                if attempt == self.max_attempts :
+                    print(f"Giving up on a batch of {len(chunk)} documents after {attempt} attempts : {e}")
+                    break
+                report.retries += 1
+                await asyncio.sleep(self.base_delay * (2 ** (attempt - 1)) * random.uniform(0.5, 1.5))
+            except Exception as e :
+                print(f"Caught non recoverable error while writing a batch of {len(chunk)} documents : {e}")
+                break
+
+        report.failed += [x[0] for x in chunk]
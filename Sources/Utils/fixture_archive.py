@@ -0,0 +1,93 @@
+import os
+import json
+import hashlib
+import zipfile
+import threading
+from pathlib import Path
+from dataclasses import dataclass
+from typing import Optional
+from urllib.parse import urlsplit
+
+from .http import HttpResponse
+
+# Recorded http responses (pages, api calls, redirections, ...), so that scrapers can be run offline against a replay server.
+# Archive is a single zip file :
+# * index.json : list of entries (url, whether redirections were followed, status, headers, body file)
+# * bodies/<sha1> : response bodies, stored once however many responses share them
+
+
+def get_path_key(url : str) -> str :
+    """Path and query of url : the replay server doesn't care about scheme and host."""
+    parts = urlsplit(url)
+    return parts.path + (f"?{parts.query}" if parts.query else "")
+
+def rewrite_base_url(url : str, base_url : Optional[str]) -> str :
+    """Sends url to base_url (scheme://host:port, e.g. a replay server) instead of its own host. No base url, no change."""
+    if base_url == None :
+        return url
+    return base_url.rstrip("/") + get_path_key(url)
+
+
+@dataclass
+class ArchiveEntry :
+    url : str
+    allow_redirects : bool
+    response : HttpResponse
+
+
+class FixtureArchive :
+    """Records responses as they are fetched (thread safe), save() writes them all at once.
+       A response fetched without following redirections (e.g. a 301 and its Location header) is what the server actually sent :
+       it takes precedence over a followed one for the same url, see find()."""
+    filepath : Path
+    entries : dict[tuple[str, bool], ArchiveEntry]
+
+    def __init__(self, filepath : Path) -> None:
+        self.filepath = filepath
+        self.entries = {}
+        self._lock = threading.Lock()
+
+    def record(self, response : HttpResponse, allow_redirects : bool = True) -> None :
+        with self._lock :
+            self.entries[(get_path_key(response.url), allow_redirects)] = ArchiveEntry(response.url, allow_redirects, response)
+
+    def find(self, path : str) -> Optional[HttpResponse] :
+        entry = self.entries.get((path, False)) or self.entries.get((path, True))
+        return entry.response if entry else None
+
+    def __len__(self) -> int :
+        return len(self.entries)
+
+    def save(self) -> None :
+        with self._lock :
+            entries = list(self.entries.values())
+
+        self.filepath.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.filepath.with_name(f"{self.filepath.name}.tmp")
+        index : list[dict] = []
+        with zipfile.ZipFile(tmp_path, "w", compression=zipfile.ZIP_DEFLATED) as archive :
+            written : set[str] = set()
+            for entry in entries :
+                body_name = f"bodies/{hashlib.sha1(entry.response.content).hexdigest()}"
+                if not body_name in written :
+                    archive.writestr(body_name, entry.response.content)
+                    written.add(body_name)
+                index.append({
+                    "url" : entry.url,
+                    "allowRedirects" : entry.allow_redirects,
+                    "status" : entry.response.status,
+                    "headers" : entry.response.headers,
+                    "body" : body_name
+                })
+            archive.writestr("index.json", json.dumps(index, indent=1))
+        os.replace(tmp_path, self.filepath)
+
+    def load(self) -> None :
+        with zipfile.ZipFile(self.filepath, "r") as archive :
+            index = json.loads(archive.read("index.json"))
+            bodies : dict[str, bytes] = {}
+            for item in index :
+                if not item["body"] in bodies :
+                    bodies[item["body"]] = archive.read(item["body"])
+                response = HttpResponse(url=item["url"], status=item["status"], headers=item["headers"], content=bodies[item["body"]])
+                self.record(response, item["allowRedirects"])
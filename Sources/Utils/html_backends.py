@@ -0,0 +1,169 @@
+from abc import ABC, abstractmethod
+from typing import Any, Iterator, Optional
+
+import bs4
+
+# Html parser backends used by the scrapers.
+# Scrapers are written against a (very) small subset of BeautifulSoup's api : find(), find_all(), find_next(), find_all_next(),
+# find_next_sibling(), .contents, .text, .attrs, .name and .parent.
+# Each backend turns raw page content into a document which exposes this subset, so that parsing code is shared by all backends
+# and they produce the exact same Hop/Yeast objects (this is checked by the differential tests in Sources/Utils/Tests).
+# * html.parser : BeautifulSoup with python's builtin parser. Slowest, but no extra dependency. That's the historical behavior.
+# * lxml        : BeautifulSoup with lxml's tree builder. Same traversal code, much faster tree building.
+# * selectolax  : lexbor engine from selectolax, queried with css selectors. Fastest one, but needs the optional selectolax package.
+
+
+class HtmlBackend(ABC) :
+    name : str = ""
+
+    @abstractmethod
+    def parse(self, content : str | bytes) -> Any :
+        """Parses a whole page and returns the document node, with a BeautifulSoup like api."""
+
+
+class BeautifulSoupBackend(HtmlBackend) :
+    features : str
+
+    def __init__(self, features : str) -> None:
+        self.name = features
+        self.features = features
+
+    def parse(self, content : str | bytes) -> bs4.BeautifulSoup :
+        return bs4.BeautifulSoup(content, self.features)
+
+
+# Attributes BeautifulSoup parses as a list of values instead of a single string (subset of bs4's multi valued attributes
+# which is relevant to our pages)
+_MULTI_VALUED_ATTRIBUTES = ["class", "rel"]
+
+def _build_selector(name : Optional[str | list[str]], attrs : Optional[dict[str, str]]) -> str :
+    """Converts BeautifulSoup find() arguments to the equivalent css selector.
+       Like bs4, a single word looked up in a multi valued attribute matches any of its values ("~="),
+       whereas a value made of several words has to match the whole attribute string.
+       A list of names becomes a selector group, which lexbor still matches in document order."""
+    attributes_selector = ""
+    for key, value in (attrs or {}).items() :
+        escaped = value.replace("\\", "\\\\").replace("\"", "\\\"")
+        if key in _MULTI_VALUED_ATTRIBUTES and len(value.split()) == 1 :
+            attributes_selector += f"[{key}~=\"{escaped}\"]"
+        else :
+            attributes_selector += f"[{key}=\"{escaped}\"]"
+
+    names = name if isinstance(name, list) else [name if name else "*"]
+    return ", ".join(f"{x}{attributes_selector}" for x in names)
+
+
+class SelectolaxNode :
+    """Wraps a selectolax (lexbor) node behind the few BeautifulSoup Tag methods used by the scrapers."""
+    __slots__ = ["node"]
+
+    def __init__(self, node : Any) -> None:
+        self.node = node
+
+    @property
+    def name(self) -> Optional[str] :
+        # Text and comment nodes are named "-text" and "-comment" by lexbor, bs4 strings don't have any name.
+        return self.node.tag if self.node.is_element_node else None
+
+    @property
+    def text(self) -> str :
+        return self.node.text(deep=True)
+
+    @property
+    def attrs(self) -> dict[str, Any] :
+        attributes : dict[str, Any] = {}
+        for key, value in self.node.attributes.items() :
+            value = value if value != None else ""
+            attributes[key] = value.split() if key in _MULTI_VALUED_ATTRIBUTES else value
+        return attributes
+
+    @property
+    def parent(self) -> Optional["SelectolaxNode"] :
+        parent = self.node.parent
+        return SelectolaxNode(parent) if parent != None else None
+
+    @property
+    def contents(self) -> list["SelectolaxNode"] :
+        return [SelectolaxNode(x) for x in self.node.iter(include_text=True)]
+
+    def find_all(self, name : Optional[str | list[str]] = None, attrs : Optional[dict[str, str]] = None) -> list["SelectolaxNode"] :
+        # Lexbor includes the node itself in its css matches, bs4 only looks at descendants.
+        # A node always comes first in document order, so there's only the first result to check
+        matches = self.node.css(_build_selector(name, attrs))
+        if len(matches) != 0 and matches[0].mem_id == self.node.mem_id :
+            matches = matches[1:]
+        return [SelectolaxNode(x) for x in matches]
+
+    def find(self, name : Optional[str | list[str]] = None, attrs : Optional[dict[str, str]] = None) -> Optional["SelectolaxNode"] :
+        # css_first() may return the node itself as well, falling back on find_all() only in that (rare) case
+        match = self.node.css_first(_build_selector(name, attrs))
+        if match != None and match.mem_id == self.node.mem_id :
+            matches = self.find_all(name, attrs)
+            return matches[0] if len(matches) != 0 else None
+        return SelectolaxNode(match) if match != None else None
+
+    def find_next_sibling(self, name : Optional[str] = None) -> Optional["SelectolaxNode"] :
+        sibling = self.node.next
+        while sibling != None :
+            if sibling.is_element_node and (name == None or sibling.tag == name) :
+                return SelectolaxNode(sibling)
+            sibling = sibling.next
+        return None
+
+    def _iter_next_elements(self) -> Iterator[Any] :
+        """Walks all elements coming after this one in document order (depth first), like bs4's next_elements."""
+        node = self.node
+        while node != None :
+            if node.child != None :
+                node = node.child
+            else :
+                while node != None and node.next == None :
+                    node = node.parent
+                if node == None :
+                    return
+                node = node.next
+            if node.is_element_node :
+                yield node
+
+    def find_next(self, name : Optional[str] = None) -> Optional["SelectolaxNode"] :
+        for node in self._iter_next_elements() :
+            if name == None or node.tag == name :
+                return SelectolaxNode(node)
+        return None
+
+    def find_all_next(self, name : Optional[str] = None) -> list["SelectolaxNode"] :
+        return [SelectolaxNode(x) for x in self._iter_next_elements() if name == None or x.tag == name]
+
+    def __eq__(self, other : object) -> bool :
+        return isinstance(other, SelectolaxNode) and self.node.mem_id == other.node.mem_id
+
+    def __hash__(self) -> int :
+        return self.node.mem_id
+
+
+class SelectolaxBackend(HtmlBackend) :
+    name = "selectolax"
+
+    def parse(self, content : str | bytes) -> SelectolaxNode :
+        # Optional dependency, only required when this backend is actually used
+        try :
+            from selectolax.lexbor import LexborHTMLParser
+        except ImportError as e :
+            raise ImportError("selectolax html backend requires the selectolax package (pip install selectolax)") from e
+
+        tree = LexborHTMLParser(content)
+        # Whole document is wrapped, so that the <html> node can be found as well (like with bs4)
+        return SelectolaxNode(tree.root.parent)
+
+
+HTML_BACKENDS : dict[str, HtmlBackend] = {
+    "html.parser" : BeautifulSoupBackend("html.parser"),
+    "lxml" : BeautifulSoupBackend("lxml"),
+    "selectolax" : SelectolaxBackend()
+}
+DEFAULT_HTML_BACKEND = "html.parser"
+
+def get_html_backend(name : str = DEFAULT_HTML_BACKEND) -> HtmlBackend :
+    if not name in HTML_BACKENDS :
+        raise ValueError(f"Unknown html backend : {name}. Expected one of {list(HTML_BACKENDS.keys())}")
+    return HTML_BACKENDS[name]
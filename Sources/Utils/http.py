@@ -0,0 +1,122 @@
+import time
+import json
+import asyncio
+import weakref
+import threading
+from contextlib import contextmanager, asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Iterator, Optional
+from urllib.parse import urlparse
+
+
+@dataclass
+class HttpResponse :
+    """Transport agnostic http response, so that scrapers don't need to care whether data came from requests or aiohttp."""
+    url : str = field(default_factory=str)
+    status : int = 0
+    headers : dict[str, str] = field(default_factory=dict)
+    content : bytes = field(default_factory=bytes)
+
+    def json(self) -> Any :
+        return json.loads(self.content)
+
+    def __str__(self) -> str :
+        return f"<HttpResponse [{self.status}] {self.url}>"
+
+
+class TokenBucket :
+    """Classic token bucket : refills at rate tokens per second, up to burst tokens.
+       A rate of 0 (or less) disables the limitation."""
+    rate : float
+    burst : float
+    tokens : float
+    last_refill : float
+
+    def __init__(self, rate : float = 0, burst : float = 1) -> None:
+        self.rate = rate
+        self.burst = max(1.0, burst)
+        self.tokens = self.burst
+        self.last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float :
+        """Takes one token from the bucket and returns how long (in seconds) the caller has to wait before using it.
+           Tokens can go negative, which queues up callers fairly without needing to poll the bucket."""
+        if self.rate <= 0 :
+            return 0
+
+        with self._lock :
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.last_refill) * self.rate)
+            self.last_refill = now
+            self.tokens -= 1
+            if self.tokens >= 0 :
+                return 0
+            return -self.tokens / self.rate
+
+
+class RequestLimiter :
+    """Shared budget for all http traffic : a global limit on concurrent (in-flight) requests and a per-host token bucket.
+       Works both for threads (limit()) and asyncio tasks (limit_async()), so the same object can be shared by all scrapers.
+       * max_in_flight : maximum number of concurrent requests, 0 means unlimited
+       * requests_per_second : maximum sustained request rate per host, 0 means unlimited
+       * burst : how many requests can be fired at once for a host before the rate limitation kicks in"""
+    max_in_flight : int
+    requests_per_second : float
+    burst : float
+
+    def __init__(self, max_in_flight : int = 0, requests_per_second : float = 0, burst : float = 1) -> None:
+        self.max_in_flight = max_in_flight
+        self.requests_per_second = requests_per_second
+        self.burst = burst
+        self._buckets : dict[str, TokenBucket] = {}
+        self._buckets_lock = threading.Lock()
+        self._thread_semaphore = threading.BoundedSemaphore(max_in_flight) if max_in_flight > 0 else None
+
+        # asyncio primitives are bound to the loop they are first used in, and scrapers run one asyncio.run() per category.
+        # So we need one semaphore per event loop.
+        self._async_semaphores : weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore] = weakref.WeakKeyDictionary()
+
+    def get_bucket(self, url : str) -> TokenBucket :
+        host = urlparse(url).netloc
+        with self._buckets_lock :
+            if not host in self._buckets :
+                self._buckets[host] = TokenBucket(self.requests_per_second, self.burst)
+            return self._buckets[host]
+
+    def _get_async_semaphore(self) -> Optional[asyncio.Semaphore] :
+        if self.max_in_flight <= 0 :
+            return None
+        loop = asyncio.get_running_loop()
+        if not loop in self._async_semaphores :
+            self._async_semaphores[loop] = asyncio.Semaphore(self.max_in_flight)
+        return self._async_semaphores[loop]
+
+    @contextmanager
+    def limit(self, url : str) -> Iterator[None] :
+        """Blocks the calling thread until the request to url is allowed to go."""
+        if self._thread_semaphore :
+            self._thread_semaphore.acquire()
+        try :
+            delay = self.get_bucket(url).reserve()
+            if delay > 0 :
+                time.sleep(delay)
+            yield
+        finally :
+            if self._thread_semaphore :
+                self._thread_semaphore.release()
+
+    @asynccontextmanager
+    async def limit_async(self, url : str) -> AsyncIterator[None] :
+        """Suspends the calling task until the request to url is allowed to go."""
+        semaphore = self._get_async_semaphore()
+        if semaphore :
+            await semaphore.acquire()
+        try :
+            delay = self.get_bucket(url).reserve()
+            if delay > 0 :
+                await asyncio.sleep(delay)
+            yield
+        finally :
+            if semaphore :
+                semaphore.release()
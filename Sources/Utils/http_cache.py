@@ -0,0 +1,192 @@
+import os
+import json
+import time
+import hashlib
+import threading
+from enum import Enum
+from pathlib import Path
+from typing import Any, Optional
+
+from .http import HttpResponse
+
+
+class CacheMode(Enum) :
+    Off = "off"             # Cache is not used at all
+    ReadOnly = "read-only"  # Cached responses are served without contacting the server, nothing new is written
+    Refresh = "refresh"     # Cached responses are revalidated with conditional GETs, new responses are written to disk
+
+
+def cache_mode_from_str(input : str) -> CacheMode :
+    for mode in CacheMode :
+        if mode.value == input.lower() :
+            return mode
+    raise ValueError(f"Unknown cache mode : {input}. Expected one of {[x.value for x in CacheMode]}")
+
+
+def get_header(headers : dict[str, str], name : str) -> Optional[str] :
+    """Case insensitive header lookup, as servers are free to use any casing they want."""
+    lowered = name.lower()
+    for key, value in headers.items() :
+        if key.lower() == lowered :
+            return value
+    return None
+
+
+class ResponseCache :
+    """On-disk http response cache, addressed by the sha256 of the request url.
+       Each entry is made of two files sitting next to each other :
+       * <hash>.json : url, status, headers and validators (ETag / Last-Modified)
+       * <hash>.body : raw response body
+       Entries modification times are used to track recency : when the total size goes above max_size bytes,
+       least recently used entries are evicted."""
+    directory : Path
+    mode : CacheMode
+    max_size : int
+
+    # Only those responses are worth caching : 200 for pages and api calls, 301 for yeast redirections
+    CACHEABLE_STATUSES = [200, 301]
+
+    def __init__(self, directory : Path, mode : CacheMode = CacheMode.Refresh, max_size : int = 512 * 1024 * 1024) -> None:
+        self.directory = directory
+        self.mode = mode
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._current_size : Optional[int] = None
+
+    def enabled(self) -> bool :
+        return self.mode != CacheMode.Off
+
+    def get_key(self, url : str, allow_redirects : bool = True) -> str :
+        # The same url yields a redirection or the final page depending on allow_redirects, so both are cached separately.
+        raw = url if allow_redirects else f"{url}#no-redirect"
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def _get_paths(self, key : str) -> tuple[Path, Path] :
+        # Fan out in sub directories so that we don't end up with one huge flat directory
+        subdir = self.directory.joinpath(key[0:2])
+        return subdir.joinpath(f"{key}.json"), subdir.joinpath(f"{key}.body")
+
+    def load(self, url : str, allow_redirects : bool = True) -> Optional[HttpResponse] :
+        if not self.enabled() :
+            return None
+
+        meta_path, body_path = self._get_paths(self.get_key(url, allow_redirects))
+        try :
+            with open(meta_path, "r") as file :
+                meta : dict[str, Any] = json.load(file)
+            with open(body_path, "rb") as file :
+                content = file.read()
+        except (OSError, ValueError) :
+            return None
+
+        self._touch(meta_path)
+        return HttpResponse(url=meta["url"], status=meta["status"], headers=meta["headers"], content=content)
+
+    def get_conditional_headers(self, cached : Optional[HttpResponse]) -> dict[str, str] :
+        """Builds the request headers which turn a GET into a conditional GET, using cached validators."""
+        headers : dict[str, str] = {}
+        if cached == None :
+            return headers
+
+        etag = get_header(cached.headers, "ETag")
+        if etag :
+            headers["If-None-Match"] = etag
+        last_modified = get_header(cached.headers, "Last-Modified")
+        if last_modified :
+            headers["If-Modified-Since"] = last_modified
+        return headers
+
+    def update(self, response : HttpResponse, cached : Optional[HttpResponse], allow_redirects : bool = True) -> HttpResponse :
+        """Reconciles a fresh network response with what's in the cache and returns the response that shall be used by the caller.
+           A 304 Not Modified response yields the cached one."""
+        if response.status == 304 and cached != None :
+            return cached
+
+        if self.mode == CacheMode.Refresh and response.status in self.CACHEABLE_STATUSES :
+            self.store(response, allow_redirects)
+        return response
+
+    def store(self, response : HttpResponse, allow_redirects : bool = True) -> None :
+        meta_path, body_path = self._get_paths(self.get_key(response.url, allow_redirects))
+        meta_path.parent.mkdir(parents=True, exist_ok=True)
+        previous_size = self._get_entry_size(meta_path, body_path)
+
+        meta = {
+            "url" : response.url,
+            "status" : response.status,
+            "headers" : response.headers,
+            "storedAt" : time.time()
+        }
+
+        # Body first, then metadata : an entry is only visible once its metadata is there.
+        # Temp file + rename so that a concurrent reader never sees a half written file.
+        self._write_atomic(body_path, response.content)
+        self._write_atomic(meta_path, json.dumps(meta).encode())
+
+        with self._lock :
+            self._current_size = self._get_current_size() - previous_size + self._get_entry_size(meta_path, body_path)
+            if self._current_size > self.max_size :
+                self._evict()
+
+    def clear(self) -> None :
+        with self._lock :
+            for meta_path, body_path, _ , _ in self._list_entries() :
+                meta_path.unlink(missing_ok=True)
+                body_path.unlink(missing_ok=True)
+            self._current_size = 0
+
+    def _write_atomic(self, path : Path, content : bytes) -> None :
+        tmp_path = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+        with open(tmp_path, "wb") as file :
+            file.write(content)
+        os.replace(tmp_path, path)
+
+    def _touch(self, meta_path : Path) -> None :
+        try :
+            os.utime(meta_path)
+        except OSError :
+            pass
+
+    def _get_entry_size(self, meta_path : Path, body_path : Path) -> int :
+        size = 0
+        for path in [meta_path, body_path] :
+            try :
+                size += path.stat().st_size
+            except OSError :
+                pass
+        return size
+
+    def _list_entries(self) -> list[tuple[Path, Path, float, int]] :
+        """Lists (metadata path, body path, last access time, size) for all entries."""
+        entries : list[tuple[Path, Path, float, int]] = []
+        if not self.directory.exists() :
+            return entries
+
+        for meta_path in self.directory.glob("*/*.json") :
+            body_path = meta_path.with_suffix(".body")
+            try :
+                last_access = meta_path.stat().st_mtime
+            except OSError :
+                continue
+            entries.append((meta_path, body_path, last_access, self._get_entry_size(meta_path, body_path)))
+        return entries
+
+    def _get_current_size(self) -> int :
+        # Lazily computed once, then maintained incrementally
+        if self._current_size == None :
+            self._current_size = sum(x[3] for x in self._list_entries())
+        return self._current_size
+
+    def _evict(self) -> None :
+        """Drops least recently used entries until cache size goes back under 90% of max_size.
+           Going a bit lower than the cap avoids scanning the whole cache again on the very next store."""
+        entries = sorted(self._list_entries(), key=lambda x : x[2])
+        current_size = sum(x[3] for x in entries)
+        target_size = int(self.max_size * 0.9)
+        for meta_path, body_path, _, size in entries :
+            if current_size <= target_size :
+                break
+            meta_path.unlink(missing_ok=True)
+            body_path.unlink(missing_ok=True)
+            current_size -= size
+        self._current_size = current_size
@@ -0,0 +1,121 @@
+import os
+import json
+import asyncio
+import threading
+from pathlib import Path
+from concurrent.futures import Future
+from typing import Awaitable, Callable, Optional
+
+
+class LinkResolver :
+    """Memoized short url -> canonical url mapping, meant to be shared by all threads and tasks of a crawl.
+       * Every distinct url is resolved once per crawl. Lookups of an url which is already being resolved wait for
+         the pending resolution (request coalescing) instead of sending their own request.
+       * Resolved links can be persisted to disk, so that warm runs don't need to send any request at all.
+         Failed resolutions (None) are only remembered for the current crawl : they are retried by the next one.
+       Pending resolutions are tracked with concurrent.futures.Future, which can be waited on by threads and asyncio tasks alike."""
+    filepath : Optional[Path]
+    links : dict[str, Optional[str]]
+
+    # Lookups served from memory, lookups which waited for a pending resolution and actual resolutions
+    hits : int
+    coalesced : int
+    misses : int
+
+    def __init__(self, filepath : Optional[Path] = None) -> None:
+        self.filepath = filepath
+        self.links = {}
+        self.hits = 0
+        self.coalesced = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._pending : dict[str, Future[Optional[str]]] = {}
+
+    def load(self) -> None :
+        """Loads links resolved by previous runs, if any."""
+        if self.filepath == None or not self.filepath.exists() :
+            return
+        try :
+            with open(self.filepath, "r") as file :
+                content = json.load(file)
+        except (OSError, ValueError) :
+            return
+        with self._lock :
+            self.links.update(content["links"])
+
+    def save(self) -> None :
+        if self.filepath == None :
+            return
+        with self._lock :
+            resolved = {key : value for key, value in self.links.items() if value != None}
+
+        self.filepath.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.filepath.with_name(f"{self.filepath.name}.tmp")
+        with open(tmp_path, "w") as file :
+            json.dump({"links" : resolved}, file, indent=4)
+        os.replace(tmp_path, self.filepath)
+
+    def _lookup(self, url : str) -> tuple[Optional[str], Optional[Future[Optional[str]]], bool] :
+        """Returns (value, future, owner) :
+           * known url : its value, no future
+           * url being resolved : the pending future, to be waited on
+           * unknown url : a brand new future, owned by the caller which has to resolve the url then call _complete() or _fail()"""
+        with self._lock :
+            if url in self.links :
+                self.hits += 1
+                return self.links[url], None, False
+
+            pending = self._pending.get(url)
+            if pending != None :
+                self.coalesced += 1
+                return None, pending, False
+
+            self.misses += 1
+            owned : Future[Optional[str]] = Future()
+            self._pending[url] = owned
+            return None, owned, True
+
+    def _complete(self, url : str, future : Future[Optional[str]], value : Optional[str]) -> None :
+        with self._lock :
+            self.links[url] = value
+            del self._pending[url]
+        future.set_result(value)
+
+    def _fail(self, url : str, future : Future[Optional[str]], error : BaseException) -> None :
+        # Nothing is memoized, so the next lookup gives it another try. Current waiters get the same error as the owner.
+        with self._lock :
+            del self._pending[url]
+        future.set_exception(error)
+
+    def resolve(self, url : str, resolver : Callable[[str], Optional[str]]) -> Optional[str] :
+        """Resolves url with resolver, unless it's already known or being resolved (threads flavor)."""
+        value, future, owner = self._lookup(url)
+        if future == None :
+            return value
+        if not owner :
+            return future.result()
+
+        try :
+            value = resolver(url)
+        except BaseException as e :
+            self._fail(url, future, e)
+            raise
+        self._complete(url, future, value)
+        return value
+
+    async def resolve_async(self, url : str, resolver : Callable[[str], Awaitable[Optional[str]]]) -> Optional[str] :
+        """Resolves url with resolver, unless it's already known or being resolved (asyncio flavor).
+           Pending resolutions might be owned by another thread as well, waiting on them doesn't block the event loop."""
+        value, future, owner = self._lookup(url)
+        if future == None :
+            return value
+        if not owner :
+            return await asyncio.wrap_future(future)
+
+        try :
+            value = await resolver(url)
+        except BaseException as e :
+            self._fail(url, future, e)
+            raise
+        self._complete(url, future, value)
+        return value
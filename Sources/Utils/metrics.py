@@ -0,0 +1,148 @@
+import math
+import time
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Iterator
+
+# Upper bounds (in ms) of the buckets of exported histograms, last bucket catches everything above
+HISTOGRAM_BUCKETS_MS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000]
+
+
+@dataclass
+class PhaseTiming :
+    count : int = 0
+    total : float = 0
+    max : float = 0
+    # Every single duration, for percentiles. A float per request or page section is affordable at this site's scale.
+    samples : list[float] = field(default_factory=list)
+
+    def add(self, duration : float) -> None :
+        self.count += 1
+        self.total += duration
+        self.max = max(self.max, duration)
+        self.samples.append(duration)
+
+    def merge(self, other : "PhaseTiming") -> None :
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+        self.samples += other.samples
+
+    def get_mean(self) -> float :
+        return self.total / self.count if self.count > 0 else 0
+
+    def get_percentile(self, percentile : float) -> float :
+        """Nearest rank percentile (0-100) of the recorded durations."""
+        if len(self.samples) == 0 :
+            return 0
+        ordered = sorted(self.samples)
+        rank = max(1, math.ceil(percentile * len(ordered) / 100))
+        return ordered[min(rank, len(ordered)) - 1]
+
+    def get_histogram(self) -> dict[str, int] :
+        histogram = {f"<={x}ms" : 0 for x in HISTOGRAM_BUCKETS_MS}
+        histogram[f">{HISTOGRAM_BUCKETS_MS[-1]}ms"] = 0
+        for duration in self.samples :
+            duration_ms = duration * 1000
+            bucket = next((f"<={x}ms" for x in HISTOGRAM_BUCKETS_MS if duration_ms <= x), f">{HISTOGRAM_BUCKETS_MS[-1]}ms")
+            histogram[bucket] += 1
+        return histogram
+
+    def to_json(self) -> dict[str, Any] :
+        return {
+            "count" : self.count,
+            "totalMs" : self.total * 1000,
+            "meanMs" : self.get_mean() * 1000,
+            "maxMs" : self.max * 1000,
+            "p50Ms" : self.get_percentile(50) * 1000,
+            "p95Ms" : self.get_percentile(95) * 1000,
+            "p99Ms" : self.get_percentile(99) * 1000,
+            "histogram" : self.get_histogram()
+        }
+
+
+@dataclass
+class MetricsSnapshot :
+    counters : dict[str, int] = field(default_factory=dict)
+    phases : dict[str, PhaseTiming] = field(default_factory=dict)
+
+    def get(self, name : str) -> int :
+        return self.counters.get(name, 0)
+
+    def __str__(self) -> str :
+        lines = [", ".join(f"{name} : {value}" for name, value in sorted(self.counters.items()))]
+        for name, timing in sorted(self.phases.items()) :
+            lines.append(f"  {name:<24} {timing.count:>7} calls, {timing.total:>8.2f} s total, {timing.get_mean() * 1000:>8.2f} ms mean, "
+                         f"{timing.get_percentile(95) * 1000:>8.2f} ms p95, {timing.max * 1000:>8.2f} ms max")
+        return "\n".join(lines)
+
+    def to_json(self) -> dict[str, Any] :
+        return {
+            "counters" : dict(sorted(self.counters.items())),
+            "phases" : {name : timing.to_json() for name, timing in sorted(self.phases.items())}
+        }
+
+
+class _Shard :
+    """Counters written by a single thread"""
+    def __init__(self) -> None:
+        self.counters : dict[str, int] = {}
+        self.phases : dict[str, PhaseTiming] = {}
+
+
+class ScraperMetrics :
+    """Counters (treated, failed, warnings, bytes, ...) and per-phase timings of a scraper.
+       Each thread writes to its own shard, so that recording a value never waits on a lock, even with lots of threads.
+       Shards are keyed by thread identifier : a short lived thread (e.g. from a per item pool) hands its shard over to the next thread
+       reusing its identifier, instead of leaving one more shard behind.
+       Shards are merged on read : reading is the expensive part, it's meant for reports, not for hot loops.
+       Asyncio tasks all run on the event loop thread and share its shard, which is safe as they don't run at the same time.
+       Time spent in a phase is wall-clock time : for asyncio tasks it includes time spent awaiting."""
+    def __init__(self) -> None:
+        self._shards : dict[int, _Shard] = {}
+        # Only taken when a shard is created (and on read)
+        self._lock = threading.Lock()
+
+    def _get_shard(self) -> _Shard :
+        thread_id = threading.get_ident()
+        shard = self._shards.get(thread_id)
+        if shard == None :
+            with self._lock :
+                shard = self._shards.setdefault(thread_id, _Shard())
+        return shard
+
+    def add(self, name : str, value : int = 1) -> None :
+        counters = self._get_shard().counters
+        counters[name] = counters.get(name, 0) + value
+
+    def add_time(self, phase : str, duration : float) -> None :
+        phases = self._get_shard().phases
+        timing = phases.get(phase)
+        if timing == None :
+            timing = phases[phase] = PhaseTiming()
+        timing.add(duration)
+
+    @contextmanager
+    def time(self, phase : str) -> Iterator[None] :
+        start = time.perf_counter()
+        try :
+            yield
+        finally :
+            self.add_time(phase, time.perf_counter() - start)
+
+    def get(self, name : str) -> int :
+        return self.snapshot().get(name)
+
+    def snapshot(self) -> MetricsSnapshot :
+        """Merged view of all shards. Values being recorded meanwhile may or may not be part of it."""
+        snapshot = MetricsSnapshot()
+        with self._lock :
+            shards = list(self._shards.values())
+        for shard in shards :
+            # Copies, as the owning thread might be adding entries meanwhile
+            for name, value in list(shard.counters.items()) :
+                snapshot.counters[name] = snapshot.counters.get(name, 0) + value
+            for name, timing in list(shard.phases.items()) :
+                snapshot.phases.setdefault(name, PhaseTiming()).merge(timing)
+        return snapshot
@@ -0,0 +1,104 @@
+import sys
+import json
+import argparse
+import threading
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, Optional, TextIO, TypeVar
+
+# NDJSON (newline delimited json) : one json document per line.
+# Contrary to a big {"hops" : [...]} document, it can be written item by item as they come
+# and read back lazily : no whole document (nor its serialized string) is built in memory, and an interrupted write
+# only loses the last line. Callers still decide what they keep : Main.py holds whole catalogues anyway,
+# as the catalogue index, the upload and the exports need all the items at once.
+
+T = TypeVar("T")
+
+class NdjsonWriter :
+    """Appends json documents to a file, one per line. Safe to use from several threads.
+       Each line is flushed right away so that a crash only loses the item being written."""
+    filepath : Path
+    file : Optional[TextIO] = None
+
+    def __init__(self, filepath : Path, append : bool = False) -> None:
+        self.filepath = filepath
+        self._lock = threading.Lock()
+        self.file = open(filepath, "a" if append else "w", encoding="utf-8")
+
+    def write(self, content : dict[str, Any]) -> None :
+        line = json.dumps(content, ensure_ascii=False) + "\n"
+        with self._lock :
+            self.file.write(line) #type: ignore
+            self.file.flush()     #type: ignore
+
+    def close(self) -> None :
+        with self._lock :
+            if self.file :
+                self.file.close()
+                self.file = None
+
+    def __enter__(self) -> "NdjsonWriter" :
+        return self
+
+    def __exit__(self, *args : Any) -> None :
+        self.close()
+
+
+def read_ndjson(filepath : Path) -> Iterator[dict[str, Any]] :
+    """Lazily yields json documents from an NDJSON file.
+       A truncated last line (crash while writing it) is silently skipped."""
+    if not filepath.exists() :
+        return
+    with open(filepath, "r", encoding="utf-8") as file :
+        for line in file :
+            line = line.strip()
+            if line == "" :
+                continue
+            try :
+                yield json.loads(line)
+            except json.JSONDecodeError :
+                continue
+
+def read_ndjson_items(filepath : Path, factory : Callable[[], T]) -> Iterator[T] :
+    """Lazily yields deserialized items (Hop, Yeast, ...) from an NDJSON file.
+       factory creates an empty item which is then populated with its from_json() method."""
+    for content in read_ndjson(filepath) :
+        item = factory()
+        item.from_json(content) #type: ignore
+        yield item
+
+def write_ndjson(filepath : Path, contents : Iterable[dict[str, Any]]) -> None :
+    with NdjsonWriter(filepath) as writer :
+        for content in contents :
+            writer.write(content)
+
+def json_to_ndjson(json_filepath : Path, ndjson_filepath : Path, key : str) -> None :
+    """Converts a legacy {key : [...]} document (e.g. {"hops" : [...]}) to NDJSON"""
+    with open(json_filepath, "r") as file :
+        content = json.load(file)
+    write_ndjson(ndjson_filepath, content[key])
+
+def ndjson_to_json(ndjson_filepath : Path, json_filepath : Path, key : str) -> None :
+    """Converts an NDJSON file back to the legacy {key : [...]} document (e.g. {"hops" : [...]})"""
+    json_content = {
+        key : list(read_ndjson(ndjson_filepath))
+    }
+    with open(json_filepath, "w") as file :
+        json.dump(json_content, file, indent=4)
+
+
+def main(args : list[str]) -> int :
+    parser = argparse.ArgumentParser(description="Converts extracted/processed catalogues between the json and ndjson formats.")
+    parser.add_argument("direction", choices=["to-ndjson", "to-json"], help="Conversion direction")
+    parser.add_argument("input", help="Input file path")
+    parser.add_argument("output", help="Output file path")
+    parser.add_argument("-k", "--key", required=True, help="Name of the catalogue list in json documents, e.g. \"hops\" or \"yeasts\"")
+    params = parser.parse_args(args[1:])
+
+    if params.direction == "to-ndjson" :
+        json_to_ndjson(Path(params.input), Path(params.output), params.key)
+    else :
+        ndjson_to_json(Path(params.input), Path(params.output), params.key)
+    return 0
+
+if __name__ == "__main__" :
+    exit(main(sys.argv))
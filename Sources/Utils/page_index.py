@@ -0,0 +1,82 @@
+from typing import Any, Optional
+
+
+class PageIndex :
+    """Lookup tables built out of a single walk over a parsed page (any document from html_backends).
+       Section parsers used to run find_all("h2") / find_all("th") over the whole page for every section they read,
+       now they look things up in there instead :
+       * titles : <h1> nodes, in document order
+       * headers : <h2> text -> <h2> node, in document order. When several headers share the same text, the first one is kept.
+       * rows : <th> label -> <td> of the same row, for all tables of the page. Like sequential parsing, the last row wins.
+       * tables : table class -> (<th> label -> <td>), to restrict a lookup to a single table (e.g. "brewvalues")"""
+    titles : list[Any]
+    headers : dict[str, Any]
+    rows : dict[str, Any]
+    tables : dict[str, dict[str, Any]]
+
+    def __init__(self, document : Any) -> None:
+        self.titles = []
+        self.headers = {}
+        self.rows = {}
+        self.tables = {}
+
+        # Single traversal, nodes come in document order whatever the backend
+        for node in document.find_all(["h1", "h2", "table", "th"]) :
+            if node.name == "h1" :
+                self.titles.append(node)
+            elif node.name == "h2" :
+                self.headers.setdefault(node.text, node)
+            elif node.name == "table" :
+                for table_class in node.attrs.get("class", []) :
+                    self.tables.setdefault(table_class, {})
+            else :
+                self._index_row(node)
+
+    def _index_row(self, th : Any) -> None :
+        # Labels are read from the first child only, as labels are sometimes followed by some extra markup (tooltips, etc.)
+        if len(th.contents) == 0 or th.parent == None :
+            return
+        label = th.contents[0].text
+        td = th.parent.find("td")
+        if td == None :
+            return
+        self.rows[label] = td
+
+        # Rows are attached to their closest table (there might be a <tbody> in between)
+        table = th.parent.parent
+        while table != None and table.name != "table" :
+            table = table.parent
+        if table != None :
+            for table_class in table.attrs.get("class", []) :
+                self.tables.setdefault(table_class, {})[label] = td
+
+    def find_title(self, css_class : str) -> Optional[Any] :
+        for title in self.titles :
+            if css_class in title.attrs.get("class", []) :
+                return title
+        return None
+
+    def find_header(self, name : str) -> Optional[Any] :
+        """First header which text contains name. Only a handful of headers per page, so a linear scan is fine."""
+        for text, header in self.headers.items() :
+            if name in text :
+                return header
+        return None
+
+    def has_table(self, css_class : str) -> bool :
+        return css_class in self.tables
+
+    def get_row(self, label : str) -> Optional[Any] :
+        """Exact label lookup, across all tables."""
+        return self.rows.get(label)
+
+    def find_row(self, label : str, table_class : str) -> Optional[Any] :
+        """Label lookup within a single table. Falls back on the first label containing the requested one,
+           as some labels come with extra text around them."""
+        rows = self.tables.get(table_class, {})
+        if label in rows :
+            return rows[label]
+        for text, td in rows.items() :
+            if label in text :
+                return td
+        return None
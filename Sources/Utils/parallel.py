@@ -1,18 +1,26 @@
 import os
-from typing import Generic, TypeVar
+import asyncio
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, wait
+from typing import Awaitable, Callable, Generic, Iterable, Iterator, TypeVar
 
 
 T = TypeVar("T")
+U = TypeVar("U")
 
-def spread_load_for_parallel(input_list : list[T], num_jobs : int = -1) -> list[list[T]] :
-    if num_jobs == 1 :
-        return [input_list]
-    
+def resolve_num_jobs(num_jobs : int = -1) -> int :
+    """Converts the "auto" values (-1 or 0) to an actual number of jobs."""
     # Default to number of cores, even if it's not really a good metric in Python ecosystem (GIL)
     # It's just there to provide a default when upper layers of code don't know (or don't care) about how much jobs can be done in parallel.
     # Furthermore, as this function is used in the context of I/O bound computation, we won't be leveraging multiple cores efficiently anyway.
-    if num_jobs == -1:
-        num_jobs = os.cpu_count()
+    if num_jobs <= 0:
+        return os.cpu_count() or 1
+    return num_jobs
+
+def spread_load_for_parallel(input_list : list[T], num_jobs : int = -1) -> list[list[T]] :
+    if num_jobs == 1 :
+        return [input_list]
+
+    num_jobs = resolve_num_jobs(num_jobs)
 
     remainder = len(input_list) % num_jobs
     item_per_list = len(input_list) // num_jobs
@@ -27,8 +35,53 @@ def spread_load_for_parallel(input_list : list[T], num_jobs : int = -1) -> list[
             remainder -= 1
 
         output_matrix.append(input_list[start_index:end_index])
-        
+
         # Next start is previous end
         start_index = end_index
 
-    return output_matrix
\ No newline at end of file
+    return output_matrix
+
+def iter_completed(executor : Executor, inputs : Iterable[T], function : Callable[[T], U], max_pending : int) -> Iterator[tuple[T, "Future[U]"]] :
+    """Runs function on every input in executor and yields (input, future) pairs as soon as each call completes, in completion order.
+       At most max_pending calls are submitted at once, the next input is submitted whenever one completes : inputs are consumed lazily
+       and a bounded number of results is held at any time, however many inputs there are.
+       Exceptions are not raised here, they are kept in the yielded futures (future.result() raises them)."""
+    iterator = iter(inputs)
+    pending : dict[Future[U], T] = {}
+
+    def submit_next() -> None :
+        for item in iterator :
+            pending[executor.submit(function, item)] = item
+            return
+
+    for _ in range(0, max(1, max_pending)) :
+        submit_next()
+
+    while len(pending) != 0 :
+        done, _ = wait(pending.keys(), return_when=FIRST_COMPLETED)
+        for future in done :
+            item = pending.pop(future)
+            submit_next()
+            yield item, future
+
+async def consume_queue_async(input_list : list[T], worker : Callable[[T], Awaitable[None]], num_jobs : int = -1) -> None :
+    """Runs worker on every item of input_list, using num_jobs tasks which pull their next item from a shared asyncio.Queue.
+       Contrary to spread_load_for_parallel, no static partitioning is done : a task that's done with a quick item
+       immediately picks up the next one, so a few slow items can't hold a whole chunk of work hostage.
+       Threads flavor is iter_completed(), on a bounded executor."""
+    work_queue : asyncio.Queue[T] = asyncio.Queue()
+    for item in input_list :
+        work_queue.put_nowait(item)
+
+    async def consumer() :
+        while True :
+            try :
+                item = work_queue.get_nowait()
+            except asyncio.QueueEmpty :
+                return
+            await worker(item)
+
+    num_jobs = min(resolve_num_jobs(num_jobs), len(input_list))
+    async with asyncio.TaskGroup() as tg :
+        for _ in range(0, num_jobs) :
+            tg.create_task(consumer())
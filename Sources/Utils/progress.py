@@ -0,0 +1,94 @@
+import time
+import threading
+from typing import Callable, Optional
+
+from ..ProgressBar import draw_progress_bar, print_buffer
+
+
+class ProgressTracker :
+    """Thread safe counter of treated items, with a condition variable so that whoever displays progress sleeps until something changes
+       (instead of polling the counter in a loop).
+       advance() can be called from any thread and from asyncio tasks (the lock is only held for an increment).
+       Work offloaded to other processes (e.g. parse workers) is counted by the parent process, once it gets the results back."""
+    total : int
+    count : int
+    closed : bool
+    start_time : float
+
+    def __init__(self, total : int = 0) -> None:
+        self.condition = threading.Condition()
+        self.reset(total)
+
+    def reset(self, total : int = 0) -> None :
+        with self.condition :
+            self.total = total
+            self.count = 0
+            self.closed = False
+            self.start_time = time.perf_counter()
+            self.condition.notify_all()
+
+    def advance(self, count : int = 1) -> None :
+        with self.condition :
+            self.count += count
+            self.condition.notify_all()
+
+    def close(self) -> None :
+        """No more progress will be made (work is done, or aborted) : wakes up and releases waiters."""
+        with self.condition :
+            self.closed = True
+            self.condition.notify_all()
+
+    def get(self) -> int :
+        return self.count
+
+    def is_done(self) -> bool :
+        return self.closed or self.count >= self.total
+
+    def wait_for_change(self, last_count : int, timeout : Optional[float] = None) -> int :
+        """Blocks until the counter differs from last_count, progress is done or timeout expires. Returns the current count."""
+        with self.condition :
+            self.condition.wait_for(lambda : self.count != last_count or self.is_done(), timeout)
+            return self.count
+
+    def get_rate(self) -> float :
+        """Treated items per second since the last reset."""
+        elapsed = time.perf_counter() - self.start_time
+        return self.count / elapsed if elapsed > 0 else 0
+
+    def get_eta(self) -> Optional[float] :
+        """Estimated remaining time in seconds, None until the rate is known."""
+        rate = self.get_rate()
+        if rate == 0 :
+            return None
+        return max(0, self.total - self.count) / rate
+
+    def get_status(self) -> str :
+        eta = self.get_eta()
+        eta_str = "--:--" if eta == None else time.strftime("%M:%S" if eta < 3600 else "%H:%M:%S", time.gmtime(eta))
+        return f"{self.count}/{self.total} {self.get_rate():.1f} it/s ETA {eta_str}"
+
+
+def draw_tracker(tracker : ProgressTracker) -> None :
+    percentage = round(tracker.get() * 100 / tracker.total) if tracker.total > 0 else 100
+    print_buffer(draw_progress_bar(min(percentage, 100), tracker.get_status()))
+
+def report_progress(tracker : ProgressTracker, min_interval : float = 0.2, refresh_interval : float = 1.0,
+                    render : Callable[[ProgressTracker], None] = draw_tracker) -> None :
+    """Renders progress until tracker is done, meant to run on its own thread.
+       Sleeps until the counter changes, renders at most once every min_interval seconds however fast items come in,
+       and at least once every refresh_interval seconds so that rate and ETA keep moving."""
+    rendered_count = -1
+    last_render = 0.0
+    while not tracker.is_done() :
+        tracker.wait_for_change(rendered_count, refresh_interval)
+        since_last_render = time.perf_counter() - last_render
+        if since_last_render < min_interval :
+            time.sleep(min_interval - since_last_render)
+
+        rendered_count = tracker.get()
+        render(tracker)
+        last_render = time.perf_counter()
+
+    # Final state, then leave the progress line
+    render(tracker)
+    print("")
@@ -0,0 +1,60 @@
+from dataclasses import dataclass, field
+from typing import Callable, Generic, Iterable, Optional, TypeVar
+
+
+T = TypeVar("T")
+
+@dataclass
+class CacheReconciliation(Generic[T]) :
+    """Outcome of the comparison between the links advertised by the website and the items found in the local cache.
+       * to_scrape : links that need to be scraped (not cached yet or outdated), in the original links order
+       * to_keep   : cached items that are still valid and can be reused as is
+       * outdated  : cached items whose page changed since they were extracted (their link is part of to_scrape)
+       * to_evict  : stale cached items, their link is no longer advertised by the website"""
+    to_scrape : list[str] = field(default_factory=list)
+    to_keep : list[T]     = field(default_factory=list)
+    outdated : list[T]    = field(default_factory=list)
+    to_evict : list[T]    = field(default_factory=list)
+
+    def report(self, category : str) -> str :
+        return (f"{category} cache : {len(self.to_keep)} kept, {len(self.outdated)} outdated, "
+                f"{len(self.to_evict)} stale (evicted), {len(self.to_scrape)} to scrap")
+
+
+def reconcile_cache(links : list[str],
+                    cached_items : Iterable[T],
+                    get_link : Callable[[T], str],
+                    is_outdated : Optional[Callable[[T], bool]] = None) -> CacheReconciliation[T] :
+    """Computes what needs to be scraped, kept or evicted in linear time, regardless of the item type.
+       Duplicated cached items (same link) are only kept once."""
+    result = CacheReconciliation[T]()
+    links_set = set(links)
+    reusable_links : set[str] = set()
+
+    for item in cached_items :
+        link = get_link(item)
+        if not link in links_set :
+            result.to_evict.append(item)
+            continue
+
+        # Duplicates are dropped as well, first one wins
+        if link in reusable_links :
+            result.to_evict.append(item)
+            continue
+
+        if is_outdated != None and is_outdated(item) :
+            result.outdated.append(item)
+            continue
+
+        reusable_links.add(link)
+        result.to_keep.append(item)
+
+    # Preserve original ordering, and also deduplicate the links in passing
+    seen : set[str] = set()
+    for link in links :
+        if link in reusable_links or link in seen :
+            continue
+        seen.add(link)
+        result.to_scrape.append(link)
+
+    return result
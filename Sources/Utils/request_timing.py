@@ -0,0 +1,59 @@
+import time
+from types import SimpleNamespace
+from typing import Any, Optional
+
+import aiohttp
+
+from .metrics import ScraperMetrics
+
+# Per request timings, recorded as metrics phases :
+# * request.dns     : host name resolution (aiohttp only, cached resolutions and reused connections don't have any)
+# * request.connect : connection creation, TLS handshake included (aiohttp only, reused connections don't have any)
+# * request.ttfb    : from the moment the request is issued until response headers are received
+# * request.body    : reading the response body
+# The requests library doesn't expose dns/connect timings : its response.elapsed (headers received) is used as ttfb.
+
+
+def _get_metrics(trace_config_ctx : SimpleNamespace) -> Optional[ScraperMetrics] :
+    return trace_config_ctx.trace_request_ctx if isinstance(trace_config_ctx.trace_request_ctx, ScraperMetrics) else None
+
+async def _on_request_start(session : aiohttp.ClientSession, trace_config_ctx : SimpleNamespace, params : Any) -> None :
+    trace_config_ctx.start = time.perf_counter()
+
+async def _on_dns_resolvehost_start(session : aiohttp.ClientSession, trace_config_ctx : SimpleNamespace, params : Any) -> None :
+    trace_config_ctx.dns_start = time.perf_counter()
+
+async def _on_dns_resolvehost_end(session : aiohttp.ClientSession, trace_config_ctx : SimpleNamespace, params : Any) -> None :
+    metrics = _get_metrics(trace_config_ctx)
+    if metrics and hasattr(trace_config_ctx, "dns_start") :
+        metrics.add_time("request.dns", time.perf_counter() - trace_config_ctx.dns_start)
+
+async def _on_connection_create_start(session : aiohttp.ClientSession, trace_config_ctx : SimpleNamespace, params : Any) -> None :
+    trace_config_ctx.connect_start = time.perf_counter()
+
+async def _on_connection_create_end(session : aiohttp.ClientSession, trace_config_ctx : SimpleNamespace, params : Any) -> None :
+    metrics = _get_metrics(trace_config_ctx)
+    if metrics and hasattr(trace_config_ctx, "connect_start") :
+        metrics.add_time("request.connect", time.perf_counter() - trace_config_ctx.connect_start)
+
+async def _on_request_end(session : aiohttp.ClientSession, trace_config_ctx : SimpleNamespace, params : Any) -> None :
+    # Fired once response headers are in, the body is read afterwards
+    metrics = _get_metrics(trace_config_ctx)
+    if metrics and hasattr(trace_config_ctx, "start") :
+        metrics.add_time("request.ttfb", time.perf_counter() - trace_config_ctx.start)
+
+def make_trace_config() -> aiohttp.TraceConfig :
+    """aiohttp tracing hooks recording dns, connect and ttfb timings. Metrics to record into are given per request,
+       as trace_request_ctx : a single session can be shared by several scrapers. Requests without it aren't recorded."""
+    trace_config = aiohttp.TraceConfig()
+    trace_config.on_request_start.append(_on_request_start)
+    trace_config.on_dns_resolvehost_start.append(_on_dns_resolvehost_start)
+    trace_config.on_dns_resolvehost_end.append(_on_dns_resolvehost_end)
+    trace_config.on_connection_create_start.append(_on_connection_create_start)
+    trace_config.on_connection_create_end.append(_on_connection_create_end)
+    trace_config.on_request_end.append(_on_request_end)
+    return trace_config
+
+def create_traced_session(**kwargs : Any) -> aiohttp.ClientSession :
+    """aiohttp session whose requests can be timed, see make_trace_config()."""
+    return aiohttp.ClientSession(trace_configs=[make_trace_config()], **kwargs)
@@ -0,0 +1,82 @@
+import os
+import json
+import hashlib
+from pathlib import Path
+from dataclasses import dataclass, field
+from typing import Any, Iterable
+
+
+# Those change on every scrape without the item actually changing, they must not make an item look modified
+VOLATILE_KEYS = ["extractedAt"]
+
+def hash_content(content : dict[str, Any]) -> str :
+    """Stable hash of a serialized item : keys are sorted, volatile keys are left out."""
+    stable = {key : value for key, value in content.items() if not key in VOLATILE_KEYS}
+    return hashlib.sha256(json.dumps(stable, sort_keys=True, separators=(",", ":")).encode()).hexdigest()
+
+
+@dataclass
+class UploadDiff :
+    to_write : list[tuple[str, dict[str, Any]]] = field(default_factory=list)
+    hashes : dict[str, str] = field(default_factory=dict)
+    unchanged : int = 0
+    to_delete : list[str] = field(default_factory=list)
+
+    def report(self, category : str) -> str :
+        return f"{category} : {len(self.to_write)} new or changed, {self.unchanged} unchanged, {len(self.to_delete)} no longer in the catalogue."
+
+
+class UploadManifest :
+    """Content hashes of the documents as they were last uploaded, per collection : collection name -> document id -> hash.
+       Comparing a fresh catalogue against it tells which documents actually need to be written (or deleted).
+       Only reflects what this tool uploaded : documents modified remotely by someone else go unnoticed (do a full upload then)."""
+    filepath : Path
+    collections : dict[str, dict[str, str]]
+
+    def __init__(self, filepath : Path) -> None:
+        self.filepath = filepath
+        self.collections = {}
+
+    def load(self) -> None :
+        if not self.filepath.exists() :
+            return
+        try :
+            with open(self.filepath, "r") as file :
+                content = json.load(file)
+        except (OSError, ValueError) :
+            return
+        self.collections = content["collections"]
+
+    def save(self) -> None :
+        self.filepath.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.filepath.with_name(f"{self.filepath.name}.tmp")
+        with open(tmp_path, "w") as file :
+            json.dump({"collections" : self.collections}, file)
+        os.replace(tmp_path, self.filepath)
+
+    def diff(self, collection : str, documents : Iterable[tuple[str, dict[str, Any]]], write_all : bool = False) -> UploadDiff :
+        """write_all : every document is written, whether it changed or not. Vanished documents are still found out."""
+        uploaded = self.collections.get(collection, {})
+        diff = UploadDiff()
+        for document_id, content in documents :
+            content_hash = hash_content(content)
+            diff.hashes[document_id] = content_hash
+            if not write_all and uploaded.get(document_id) == content_hash :
+                diff.unchanged += 1
+            else :
+                diff.to_write.append((document_id, content))
+
+        diff.to_delete = [x for x in uploaded.keys() if not x in diff.hashes]
+        return diff
+
+    def record(self, collection : str, diff : UploadDiff, deleted : Iterable[str], failed : Iterable[str]) -> None :
+        """Records the outcome of an upload : written documents take their new hash, deleted ones are forgotten.
+           Failed documents keep their previous state, so that they are picked up again by the next upload."""
+        uploaded = self.collections.setdefault(collection, {})
+        failed_ids = set(failed)
+        for document_id, _ in diff.to_write :
+            if not document_id in failed_ids :
+                uploaded[document_id] = diff.hashes[document_id]
+        for document_id in deleted :
+            if not document_id in failed_ids :
+                uploaded.pop(document_id, None)
@@ -1,16 +1,20 @@
-import uuid
 import requests
 import asyncio
 import aiohttp
 import datetime
-from typing import Optional
+from typing import Any, Optional
 import traceback
-from threading import Thread
 
 import bs4
 
 from .BaseScraper import BaseScraper, ItemPair
+from .Utils.http import RequestLimiter
+from .Utils.http_cache import ResponseCache
+from .Utils.html_backends import DEFAULT_HTML_BACKEND, get_html_backend
+from .Utils.page_index import PageIndex
+from .Utils.link_resolver import LinkResolver
 from .Models.Yeast import Yeast
+from .Models.Catalogue import make_stable_id
 from .Models.Ranges import NumericRange
 from .Utils import parallel
 
@@ -18,9 +22,16 @@ class YeastScraper(BaseScraper[Yeast]) :
     yeasts : list[Yeast]
     error_items : list[ItemPair[str]]
 
+    # Comparable yeasts short urls -> canonical links. Lots of yeasts share the same comparable yeasts,
+    # so each short url is only resolved once (and can be persisted between runs, see LinkResolver)
+    link_resolver : LinkResolver
+
     def __init__(self, async_client: Optional[aiohttp.ClientSession] = None,
-                 request_client: Optional[requests.Session] = None) :
-        super().__init__(async_client, request_client)
+                 request_client: Optional[requests.Session] = None,
+                 limiter: Optional[RequestLimiter] = None,
+                 response_cache: Optional[ResponseCache] = None) :
+        super().__init__(async_client, request_client, limiter, response_cache)
+        self.link_resolver = LinkResolver()
         self.reset()
 
     def reset(self) :
@@ -35,7 +46,6 @@ class YeastScraper(BaseScraper[Yeast]) :
             print("/!\\ Warning : no session found for synchronous http requests, creating a new one.")
             self.request_client = requests.Session()
 
-        matrix = parallel.spread_load_for_parallel(links, num_threads)
         if num_threads == 1 :
             start = datetime.datetime.now()
             print(f"Retrieving hops, running synchronously. Starting at : {self.get_formatted_time()}")
@@ -46,7 +56,7 @@ class YeastScraper(BaseScraper[Yeast]) :
                 if len(error_list) > 0 :
                     print("Caught some issues while retrieving hops from website.")
 
-                self.hops = item_list
+                self.yeasts = item_list
             except Exception as e :
                 print(f"Caught exception while scraping hops : {e}")
 
@@ -54,46 +64,18 @@ class YeastScraper(BaseScraper[Yeast]) :
             print(f"Total execution time : {self.get_duration_formatted(start)}")
             return True
 
-        error_item_collection : list[list[Yeast]] = []
-        output_item_collection : list[list[Yeast]] = []
-
-        print(f"Spawning {num_threads} new threads ...")
-        thread_list : list[Thread] = []
-        for sublist in matrix :
-            # Empty list happen when we request e.g. 40 concurrent tasks but we only have 20 items to scrap
-            # -> Some tasks have nothing to do ! So skip them.
-            # Note : a break instruction might have done it here, but that only works on the assumption that empty lists are contiguous and the last
-            # ones of the matrix. It's probably always true, but a continue does it just as well and takes care of unordered lists whereas the break does not.
-            if len(sublist) == 0:
-                continue
-
-            # Prepare output data lists and store them in both collections
-            error_item_list = []
-            output_item_list = []
-
-            # Now that both collection contain the two lists created above,
-            # our thread will work on them (with side effects) and when the thread is joined, new values will be populated within each corresponding list in both collections
-            error_item_collection.append(error_item_list)
-            output_item_collection.append(output_item_list)
-
-            new_thread = Thread(target=self.atomic_scrap, args=(sublist, error_item_list, output_item_list)) #type: ignore
-            new_thread.start()
-            thread_list.append(new_thread)
-
-        joined_threads  : list[int] = []
-
+        num_threads = parallel.resolve_num_jobs(num_threads)
+        print(f"Scraping with {num_threads} threads ...")
         start_time = datetime.datetime.now()
-        while len(joined_threads) != num_threads :
-            for thread in thread_list :
-                if not thread.is_alive() and not thread.ident in joined_threads:
-                    thread.join()
-                    joined_threads.append(thread.ident)  #type: ignore
+
+        error_item_list : list[Yeast] = []
+        output_item_list : list[Yeast] = []
+        self.scrap_links_threaded(links, error_item_list, output_item_list, num_threads)
 
         print(f"All threads returned, time : {self.get_duration_formatted(start_time)}")
 
-        # Flattening returned items yeast collection
-        self.yeasts : list[Yeast] = [item for sublist in output_item_collection for item in sublist]
-        self.error_items = [item for sublist in error_item_collection for item in sublist] #type: ignore
+        self.yeasts = output_item_list
+        self.error_items = error_item_list #type: ignore
 
         # Alert for errors
         if len(self.error_items) > 0 :
@@ -117,9 +99,9 @@ class YeastScraper(BaseScraper[Yeast]) :
         self.reset()
         if self.async_client == None :
             print("/!\\ Warning : no session found for async http requests, creating a new one.")
-            self.async_client = aiohttp.ClientSession()
+            self.async_client = self.create_async_session()
         elif self.async_client.closed :
-            self.async_client = aiohttp.ClientSession()
+            self.async_client = self.create_async_session()
 
 
         # retry_strategy = Retry(
@@ -131,7 +113,6 @@ class YeastScraper(BaseScraper[Yeast]) :
         # self.async_client.
         # self.request_client.mount("https://", HTTPAdapter(max_retries=retry_strategy))
 
-        matrix = parallel.spread_load_for_parallel(links, num_tasks)
         if num_tasks == 1 :
             start = datetime.datetime.now()
             print(f"Retrieving Yeasts, running synchronously. Starting at : {self.get_formatted_time()}")
@@ -148,38 +129,19 @@ class YeastScraper(BaseScraper[Yeast]) :
 
             print(f"Successfully retrieved Yeasts ! Finished at {self.get_formatted_time()}")
             print(f"Total execution time : {self.get_duration_formatted(start)}")
+            await self.async_client.close()
             return True
 
-        error_item_collection : list[list[Yeast]] = []
-        output_item_collection : list[list[Yeast]] = []
-
         print(f"Spawning {num_tasks} new async tasks ...")
         start_time = datetime.datetime.now()
-        async with asyncio.TaskGroup() as tg :
-            for sublist in matrix :
-                # Empty list happen when we request e.g. 40 concurrent tasks but we only have 20 items to scrap
-                # -> Some tasks have nothing to do ! So skip them.
-                # Note : a break instruction might have done it here, but that only works on the assumption that empty lists are contiguous and the last
-                # ones of the matrix. It's probably always true, but a continue does it just as well and takes care of unordered lists whereas the break does not.
-                if len(sublist) == 0:
-                    continue
-
-                # Prepare output data lists and store them in both collections
-                error_item_list = []
-                output_item_list = []
-
-                # Now that both collection contain the two lists created above,
-                # our thread will work on them (with side effects) and when the thread is joined, new values will be populated within each corresponding list in both collections
-                error_item_collection.append(error_item_list)
-                output_item_collection.append(output_item_list)
-
-                tg.create_task(coro=self.atomic_scrap_async(sublist, error_item_list, output_item_list))
+        error_item_list : list[Yeast] = []
+        output_item_list : list[Yeast] = []
+        await parallel.consume_queue_async(links, lambda link : self.scrap_single_async(link, error_item_list, output_item_list), num_tasks)
         await self.async_client.close()
         print(f"All tasks returned, time : {self.get_duration_formatted(start_time)}")
 
-        # Flattening returned items yeast collection
-        self.yeasts : list[Yeast] = [item for sublist in output_item_collection for item in sublist]
-        self.error_items = [item for sublist in error_item_collection for item in sublist] #type: ignore
+        self.yeasts = output_item_list
+        self.error_items = error_item_list #type: ignore
 
         # Alert for errors
         if len(self.error_items) > 0 :
@@ -199,70 +161,131 @@ class YeastScraper(BaseScraper[Yeast]) :
            * out_error_item_list : list of rejected objects (caused by a hard issue, like http connection failing/etc)
            * out_item_list : list of item that could be parsed. Check for the internal error list to see non-critical parsing warnings"""
         for link in links :
-            error_list : list[str] = []
+            await self.scrap_single_async(link, out_error_item_list, out_item_list, monothread)
+
+    async def scrap_single_async(self, link : str, out_error_item_list : list[Yeast], out_item_list : list[Yeast], monothread : bool = False) -> None :
+        """Scraps a single yeast page and appends the result to one of the output lists (asyncio flavor)."""
+        error_list : list[str] = []
 
-            new_yeast = Yeast(link=link, id=str(uuid.uuid4()))
+        new_yeast = Yeast(link=link, id=make_stable_id(link))
+        new_yeast.mark_extracted()
 
+        if monothread :
+            print(f"Parsing link : {link}")
+
+        # A transport error (once retries are exhausted) only fails this yeast
+        try :
+            response = await self.fetch_async(link)
+        except : # Exception as e :
+            out_error_item_list.append(new_yeast)
+            traceback.print_exc()
             if monothread :
-                print(f"Parsing link : {link}")
+                print("-> Failed.")
+            self.mark_treated(failed=True)
+            return
 
-            # Critical error, reject data
-            response = await self.async_client.get(link) #type: ignore
-            if response.status != 200 :
-                new_yeast.add_parsing_error(str(response))
-                out_error_item_list.append(new_yeast)
+        # Critical error, reject data
+        if response.status != 200 :
+            new_yeast.add_parsing_error(str(response))
+            out_error_item_list.append(new_yeast)
 
-                if monothread :
-                    print("-> Failed.")
-                self.treated_item += 1
-                continue
+            if monothread :
+                print("-> Failed.")
+            self.mark_treated(failed=True)
+            return
 
-            try:
-                parser = bs4.BeautifulSoup(await response.content.read(), "html.parser")
-                self.parse_yeast_item_from_page(parser, new_yeast, error_list)
-                out_item_list.append(new_yeast)
-
-                if len(new_yeast.comparable_yeasts) > 0 :
-                    for i in range(0, len(new_yeast.comparable_yeasts)) :
-                        url = f"https://beermaverick.com{new_yeast.comparable_yeasts[i]}"
-
-                        # This call is being redirected by server, we just want to map the redirected address in lieu and place of
-                        # the short url; so that we can use the unique url as a key later to replace each yeast per a unique id in the catalogue.
-                        response = await self.async_client.get(url, allow_redirects=False) #type: ignore
-                        new_yeast.comparable_yeasts[i] = self.recover_comparable_yeast_link(await response.content.read(),
-                                                                                            response.headers, #type: ignore
-                                                                                            response.status,
-                                                                                            new_yeast.comparable_yeasts[i],
-                                                                                            new_yeast)
-                if monothread :
-                    print("-> Success.")
-                self.treated_item += 1
-
-            except : # Exception as e :
-                out_error_item_list.append(new_yeast)
-                traceback.print_exc()
-                self.treated_item += 1
+        try:
+            await self.parse_page_async(new_yeast, response.content, error_list)
+            await self.resolve_comparable_yeasts_async(new_yeast)
 
-    def recover_comparable_yeast_link(self, content : str | bytes, headers : dict[str, str], status_code : int, comparable_yeast : str, yeast : Yeast) -> str:
+            # Only listed once fully resolved : a failure above rejects the yeast as a whole
+            out_item_list.append(new_yeast)
+            if monothread :
+                print("-> Success.")
+            self.notify_item_scraped(new_yeast)
+            self.mark_treated(warnings=len(error_list))
+
+        except : # Exception as e :
+            out_error_item_list.append(new_yeast)
+            traceback.print_exc()
+            self.mark_treated(failed=True)
+
+    def get_comparable_yeast_urls(self, yeast : Yeast) -> list[str] :
+        # Those short urls are redirected by the server, we just want to map the redirected address in lieu and place of
+        # the short url; so that we can use the unique url as a key later to replace each yeast per a unique id in the catalogue.
+        return [f"https://beermaverick.com{x}" for x in yeast.comparable_yeasts]
+
+    def apply_comparable_yeast_links(self, yeast : Yeast, canonical_links : list[Optional[str]]) -> None :
+        for i, canonical_link in enumerate(canonical_links) :
+            candidate = self.use_canonical_link(canonical_link, yeast.comparable_yeasts[i], yeast)
+
+            # Reject empty candidates, happens sometimes on some yeasts (the error actually comes from the website!)
+            # E.g : https://beermaverick.com/yeast/wy2487-hella-bock-lager-wyeast/  -> Has an empty string
+            if candidate != "" :
+                yeast.comparable_yeasts[i] = candidate
+
+    def probe_comparable_yeast(self, url : str) -> Optional[str] :
+        response = self.fetch(url, allow_redirects=False)
+        return self.get_canonical_link(response.content, response.headers, response.status)
+
+    async def probe_comparable_yeast_async(self, url : str) -> Optional[str] :
+        response = await self.fetch_async(url, allow_redirects=False)
+        return self.get_canonical_link(response.content, response.headers, response.status)
+
+    def resolve_comparable_yeast(self, url : str) -> Optional[str] :
+        # A failed probe (transport error, unexpected page) is a broken link of this yeast, not a failure of the whole yeast.
+        # Failures aren't memoized by the link resolver, other yeasts pointing to the same url give it another try.
+        try :
+            return self.link_resolver.resolve(url, self.probe_comparable_yeast)
+        except Exception :
+            traceback.print_exc()
+            return None
+
+    async def resolve_comparable_yeast_async(self, url : str) -> Optional[str] :
+        try :
+            return await self.link_resolver.resolve_async(url, self.probe_comparable_yeast_async)
+        except Exception :
+            traceback.print_exc()
+            return None
+
+    def resolve_comparable_yeasts(self, yeast : Yeast) -> None :
+        """Resolves comparable yeasts short urls (threads flavor). Unknown ones are probed concurrently, see map_per_item()."""
+        with self.metrics.time("resolve") :
+            canonical_links = self.map_per_item(self.resolve_comparable_yeast, self.get_comparable_yeast_urls(yeast))
+        self.apply_comparable_yeast_links(yeast, canonical_links)
+
+    async def resolve_comparable_yeasts_async(self, yeast : Yeast) -> None :
+        """Resolves comparable yeasts short urls (asyncio flavor). Unknown ones are probed concurrently, see map_per_item_async()."""
+        with self.metrics.time("resolve") :
+            canonical_links = await self.map_per_item_async(self.resolve_comparable_yeast_async, self.get_comparable_yeast_urls(yeast))
+        self.apply_comparable_yeast_links(yeast, canonical_links)
+
+    def get_canonical_link(self, content : str | bytes, headers : dict[str, str], status_code : int) -> Optional[str] :
+        """Reads the canonical link out of a comparable yeast probe response. Returns None for broken links.
+           Only depends on the response, so the result can be shared by all yeasts pointing to the same comparable yeast."""
         if status_code == 301 :
             location = headers["Location"]
-            url = f"https://beermaverick.com{location}"
-            return url
+            return f"https://beermaverick.com{location}"
 
         # Some of them are not redirected an land on the realpage ... for some reason
         elif status_code == 200 :
-            soup = bs4.BeautifulSoup(content, "html.parser")
+            # Canonical link sits in the page head, no need to build the tree of the whole page
+            head_end = content.find(b"</head>" if isinstance(content, bytes) else "</head>") #type: ignore
+            soup = self.html_backend.parse(content[:head_end] if head_end != -1 else content)
             raw_link = soup.find("link", attrs={"rel" : "canonical"})
             # We also have false positives here !
             if raw_link.attrs["href"] !=  "https://beermaverick.com/yeasts/" :#type: ignore
-                url =  raw_link.attrs["href"] #type: ignore
-                return url #type: ignore
-            else :
-                yeast.add_parsing_error("Caught broken link in comparable yeasts !")
-                return comparable_yeast.split("yid=")[-1]
-        else :
+                return raw_link.attrs["href"] #type: ignore
+        return None
+
+    def use_canonical_link(self, canonical_link : Optional[str], comparable_yeast : str, yeast : Yeast) -> str :
+        if canonical_link == None :
             yeast.add_parsing_error("Caught broken link in comparable yeasts !")
             return comparable_yeast.split("yid=")[-1]
+        return canonical_link
+
+    def recover_comparable_yeast_link(self, content : str | bytes, headers : dict[str, str], status_code : int, comparable_yeast : str, yeast : Yeast) -> str:
+        return self.use_canonical_link(self.get_canonical_link(content, headers, status_code), comparable_yeast, yeast)
 
     def atomic_scrap(self, links: list[str], out_error_item_list : list[Yeast], out_item_list : list[Yeast], monothread : bool = False) -> None:
         """Atomic function used by asynchronous executers (threads).
@@ -270,58 +293,85 @@ class YeastScraper(BaseScraper[Yeast]) :
            * out_error_item_list : list of rejected objects (caused by a hard issue, like http connection failing/etc)
            * out_item_list : list of item that could be parsed. Check for the internal error list to see non-critical parsing warnings"""
         for link in links :
-            error_list : list[str] = []
+            self.scrap_single(link, out_error_item_list, out_item_list, monothread)
+
+    def scrap_single(self, link : str, out_error_item_list : list[Yeast], out_item_list : list[Yeast], monothread : bool = False) -> None :
+        """Scraps a single yeast page and appends the result to one of the output lists (threads flavor)."""
+        error_list : list[str] = []
+
+        new_yeast = Yeast(link=link, id=make_stable_id(link))
+        new_yeast.mark_extracted()
 
-            new_yeast = Yeast(link=link, id=str(uuid.uuid4()))
+        if monothread :
+            print(f"Parsing link : {link}")
 
+        # A transport error (once retries are exhausted) only fails this yeast
+        try :
+            response = self.fetch(link)
+        except : # Exception as e :
+            out_error_item_list.append(new_yeast)
+            traceback.print_exc()
             if monothread :
-                print(f"Parsing link : {link}")
+                print("-> Failed.")
+            self.mark_treated(failed=True)
+            return
 
-            # Critical error, reject data
-            response = self.request_client.get(link) #type: ignore
-            if response.status_code != 200 :
-                new_yeast.add_parsing_error(str(response))
-                out_error_item_list.append(new_yeast)
+        # Critical error, reject data
+        if response.status != 200 :
+            new_yeast.add_parsing_error(str(response))
+            out_error_item_list.append(new_yeast)
 
-                if monothread :
-                    print("-> Failed.")
-                self.treated_item += 1
-                continue
+            if monothread :
+                print("-> Failed.")
+            self.mark_treated(failed=True)
+            return
 
-            try:
-                parser = bs4.BeautifulSoup(response.content, "html.parser")
-                self.parse_yeast_item_from_page(parser, new_yeast, error_list)
-                out_item_list.append(new_yeast)
-
-                if len(new_yeast.comparable_yeasts) > 0 :
-                    for i in range(0, len(new_yeast.comparable_yeasts)) :
-                        url = f"https://beermaverick.com{new_yeast.comparable_yeasts[i]}"
-
-                        # This call is being redirected by server, we just want to map the redirected address in lieu and place of
-                        # the short url; so that we can use the unique url as a key later to replace each yeast per a unique id in the catalogue.
-                        response = self.request_client.get(url, allow_redirects=False) #type: ignore
-                        candidate = self.recover_comparable_yeast_link(response.content,
-                                                                                            response.headers, #type: ignore
-                                                                                            response.status_code,
-                                                                                            new_yeast.comparable_yeasts[i],
-                                                                                            new_yeast)
-
-                        # Reject empty candidates, happens sometimes on some yeasts (the error actually comes from the website!)
-                        # E.g : https://beermaverick.com/yeast/wy2487-hella-bock-lager-wyeast/  -> Has an empty string
-                        if candidate != "" :
-                            new_yeast.comparable_yeasts[i] = candidate
-                if monothread :
-                    print("-> Success.")
-                self.treated_item += 1
-
-            except : # Exception as e :
-                out_error_item_list.append(new_yeast)
-                traceback.print_exc()
-                self.treated_item += 1
+        try:
+            self.parse_page(new_yeast, response.content, error_list)
+            self.resolve_comparable_yeasts(new_yeast)
 
+            # Only listed once fully resolved : a failure above rejects the yeast as a whole
+            out_item_list.append(new_yeast)
+            if monothread :
+                print("-> Success.")
+            self.notify_item_scraped(new_yeast)
+            self.mark_treated(warnings=len(error_list))
+
+        except : # Exception as e :
+            out_error_item_list.append(new_yeast)
+            traceback.print_exc()
+            self.mark_treated(failed=True)
+
+
+    def parse_page(self, yeast : Yeast, content : bytes, error_list : list[str]) -> None :
+        """Parses raw page content into yeast, either in place or in the parse executor (threads flavor)."""
+        with self.metrics.time("parse") :
+            if self.parse_executor != None :
+                yeast_content, errors = self.parse_executor.submit(parse_yeast_page, yeast.to_json(), content, self.html_backend.name).result()
+                yeast.from_json(yeast_content)
+                error_list += errors
+                return
+
+            with self.metrics.time("parse.html") :
+                parser = self.html_backend.parse(content)
+            self.parse_yeast_item_from_page(parser, yeast, error_list)
+
+    async def parse_page_async(self, yeast : Yeast, content : bytes, error_list : list[str]) -> None :
+        """Parses raw page content into yeast (asyncio flavor). With a parse executor, the event loop keeps serving other requests while parsing happens."""
+        if self.parse_executor != None :
+            with self.metrics.time("parse") :
+                yeast_content, errors = await asyncio.get_running_loop().run_in_executor(self.parse_executor, parse_yeast_page, yeast.to_json(), content, self.html_backend.name)
+            yeast.from_json(yeast_content)
+            error_list += errors
+            return
+
+        self.parse_page(yeast, content, error_list)
 
     def parse_yeast_item_from_page(self, parser : bs4.BeautifulSoup, yeast : Yeast, error_list : list[str]) -> None :
-        name_node = parser.find("h1", attrs={"class" : "entry-title"})
+        # Page is walked once, sections are then read from the index
+        with self.metrics.time("parse.index") :
+            index = PageIndex(parser)
+        name_node = index.find_title("entry-title")
         if not name_node:
             error_list.append(f"Could not retrieve Yeast name for link {yeast.link}")
             # retrieving name from the link itself
@@ -330,18 +380,18 @@ class YeastScraper(BaseScraper[Yeast]) :
             yeast.name = self.format_text(name_node.text)
 
         success = True
-        success &= self.parse_basics_section(parser, yeast, error_list)
-        success &= self.parse_description_section(parser, yeast, error_list)
-        success &= self.parse_brewing_properties(parser, yeast, error_list)
-        success &= self.parse_beer_style(parser, yeast, error_list)
-        success &= self.parse_comparable_yeast(parser, yeast, error_list)
+        success &= self.parse_section("basics", self.parse_basics_section, index, yeast, error_list)
+        success &= self.parse_section("description", self.parse_description_section, index, yeast, error_list)
+        success &= self.parse_section("brewing_properties", self.parse_brewing_properties, index, yeast, error_list)
+        success &= self.parse_section("beer_style", self.parse_beer_style, index, yeast, error_list)
+        success &= self.parse_section("comparable_yeast", self.parse_comparable_yeast, index, yeast, error_list)
 
         if not success :
             error_list.append("Some parts of this Yeast failed to be read")
 
-    def parse_comparable_yeast(self, parser : bs4.BeautifulSoup, yeast : Yeast, error_list : list[str]) -> bool :
+    def parse_comparable_yeast(self, index : PageIndex, yeast : Yeast, error_list : list[str]) -> bool :
         header_name = "Comparable Beer Yeast"
-        header = self.find_header_by_name(parser, header_name)
+        header = index.find_header(header_name)
         if not header :
             error_list.append(f"Could not find {header_name} header")
             return False
@@ -354,9 +404,9 @@ class YeastScraper(BaseScraper[Yeast]) :
 
         return True
 
-    def parse_beer_style(self, parser : bs4.BeautifulSoup, yeast : Yeast, error_list : list[str]) -> bool :
+    def parse_beer_style(self, index : PageIndex, yeast : Yeast, error_list : list[str]) -> bool :
         header_name = "Common Beer Styles"
-        header = self.find_header_by_name(parser, header_name)
+        header = index.find_header(header_name)
         if not header :
             error_list.append(f"Could not find {header_name} header")
             return False
@@ -375,13 +425,6 @@ class YeastScraper(BaseScraper[Yeast]) :
 
         return True
 
-    def find_header_by_name(self, parser : bs4.BeautifulSoup, name : str) -> Optional[bs4.Tag] :
-        headers : list[bs4.Tag] = parser.find_all("h2")
-        header = [x for x in headers if name in x.text]
-        if len(header) == 0 :
-            return None
-        return header[0]
-
     def parse_numeric_range(self, node : bs4.Tag, range : NumericRange, unit_char : str = "%") -> bool :
         values = node.contents[0].text.rstrip(unit_char).split("-")
 
@@ -390,11 +433,11 @@ class YeastScraper(BaseScraper[Yeast]) :
 
         try :
             if len(values) == 1 :
-                range.min.value = float(values[0].strip())
-                range.max.value = range.min.value
+                range.min = float(values[0].strip())
+                range.max = range.min
             if len(values) == 2 :
-                range.min.value = float(values[0].strip())
-                range.max.value = float(values[1].strip())
+                range.min = float(values[0].strip())
+                range.max = float(values[1].strip())
         # Might fail if one of the values is not convertible to float (happens with some default values)
         # In some cases, numerical values are replaced by the "Unknown" keyword, which makes parsing more difficult
         except :
@@ -407,26 +450,22 @@ class YeastScraper(BaseScraper[Yeast]) :
     def farenheit_to_degrees(self, farenheit : float) -> float :
         return (farenheit - 32) * 5/9
 
-    def parse_brewing_properties(self, parser : bs4.BeautifulSoup, yeast : Yeast, error_list : list[str]) -> bool :
-        table = parser.find("table", attrs={"class" : "brewvalues"})
-        if not table :
+    def parse_brewing_properties(self, index : PageIndex, yeast : Yeast, error_list : list[str]) -> bool :
+        table_class = "brewvalues"
+        if not index.has_table(table_class) :
             error_list.append("Could not parse brewing values")
             return False
 
-        tr_nodes :list[bs4.Tag] = table.find_all("tr") #type: ignore
-        for node in tr_nodes :                         #type: ignore
-            th : bs4.Tag = node.find("th")             #type: ignore
-            td : bs4.Tag = node.find("td")             #type: ignore
-
-            if not th or not td :
+        for label in ["Alcohol Tolerance", "Attenuation", "Flocculation", "Optimal Temperature"] :
+            td : Optional[bs4.Tag] = index.find_row(label, table_class)
+            if td == None :
                 continue
 
-            text = th.contents[0].text
             value_node : Optional[bs4.Tag] = td.find("small", attrs={"class" : "text-muted bold"}) #type: ignore
             if value_node == None :
                 continue
 
-            if  "Alcohol Tolerance" in text :
+            if  "Alcohol Tolerance" == label :
                 value = value_node.text.replace("%", "")
                 if "Unknown" == value :
                     yeast.add_parsing_error("No available values for alcohol tolerance.")
@@ -438,7 +477,7 @@ class YeastScraper(BaseScraper[Yeast]) :
                     except :
                         yeast.add_parsing_error(f"Cannot convert value to float : {value}")
 
-            elif  "Attenuation" in text:
+            elif  "Attenuation" == label :
                 value = value_node.text.replace("%", "")
                 if "Unknown" == value :
                     yeast.add_parsing_error("No available values for attenuation.")
@@ -446,15 +485,15 @@ class YeastScraper(BaseScraper[Yeast]) :
                     if not self.parse_percentage_value(value_node, yeast.attenuation):
                         error_list.append("Caught unexpected content for attenutation")
 
-            elif "Flocculation" in text:
+            elif "Flocculation" == label :
                 yeast.flocculation = value_node.text
 
-            elif "Optimal Temperature" in text:
+            elif "Optimal Temperature" == label :
                 if not self.parse_numeric_range(value_node, yeast.optimal_temperature, "° F") :
                     error_list.append("Caught unexpected content for optimal temperatures")
                     continue
-                yeast.optimal_temperature.max.value = round(self.farenheit_to_degrees(yeast.optimal_temperature.max.value))
-                yeast.optimal_temperature.min.value = round(self.farenheit_to_degrees(yeast.optimal_temperature.min.value))
+                yeast.optimal_temperature.max = round(self.farenheit_to_degrees(yeast.optimal_temperature.max))
+                yeast.optimal_temperature.min = round(self.farenheit_to_degrees(yeast.optimal_temperature.min))
 
         return True
 
@@ -464,9 +503,9 @@ class YeastScraper(BaseScraper[Yeast]) :
         return False
 
 
-    def parse_description_section(self, parser : bs4.BeautifulSoup, yeast : Yeast, error_list : list[str]) -> bool :
+    def parse_description_section(self, index : PageIndex, yeast : Yeast, error_list : list[str]) -> bool :
         header_name = "Description"
-        header = self.find_header_by_name(parser, header_name)
+        header = index.find_header(header_name)
         if not header :
             error_list.append(f"Could not find {header_name} header")
             return False
@@ -489,42 +528,43 @@ class YeastScraper(BaseScraper[Yeast]) :
 
         return True
 
-    def parse_basics_section(self, parser : bs4.BeautifulSoup, yeast : Yeast, error_list : list[str]) -> bool :
-        all_th : list[bs4.Tag] = parser.find_all("th")
-        required = [
-            "Brand:",
-            "Type:",
-            "Packet:",
-            "Species:",
-            "Contains Bacteria?"
-        ]
-
-        for th in all_th :
-            content = th.contents[0].text
-            if not content in required :
-                continue
-
-            parent_node = th.parent
-            td_node : bs4.Tag = parent_node.find("td") #type: ignore
-            if content == "Brand:" :
-                yeast.brand = self.format_text(td_node.contents[0].text)
-
-            elif content == "Type:" :
-                yeast.type = self.format_text(td_node.contents[0].text)
-
-            elif content == "Packet:" :
-                yeast.packaging = self.format_text(td_node.contents[0].text)
+    def parse_basics_section(self, index : PageIndex, yeast : Yeast, error_list : list[str]) -> bool :
+        td_node : Optional[bs4.Tag] = index.get_row("Brand:")
+        if td_node != None :
+            yeast.brand = self.format_text(td_node.contents[0].text)
+
+        td_node = index.get_row("Type:")
+        if td_node != None :
+            yeast.type = self.format_text(td_node.contents[0].text)
+
+        td_node = index.get_row("Packet:")
+        if td_node != None :
+            yeast.packaging = self.format_text(td_node.contents[0].text)
+
+        td_node = index.get_row("Species:")
+        if td_node != None :
+            yeast.species = []
+            splitted = td_node.contents[0].text.split(",")
+            for item in splitted :
+                yeast.species.append(item.strip())
+
+        td_node = index.get_row("Contains Bacteria?")
+        if td_node != None :
+            if td_node.contents[0].text == "Yes" :
+                yeast.has_bacterias = True
+            else :
+                yeast.has_bacterias = False
 
-            elif content == "Species:" :
-                yeast.species = []
-                splitted = td_node.contents[0].text.split(",")
-                for item in splitted :
-                    yeast.species.append(item.strip())
+        return True
 
-            elif content == "Contains Bacteria?" :
-                if td_node.contents[0].text == "Yes" :
-                    yeast.has_bacterias = True
-                else :
-                    yeast.has_bacterias = False
 
-        return True
\ No newline at end of file
+def parse_yeast_page(yeast_content : dict[str, Any], page_content : bytes, html_backend : str = DEFAULT_HTML_BACKEND) -> tuple[dict[str, Any], list[str]] :
+    """Parse executor entry point : module level so that it can be pickled and sent to worker processes.
+       Takes and returns serialized yeasts, as they are much cheaper to transfer than the objects (and don't need the http clients).
+       Html backend is passed by name, worker processes look it up on their side."""
+    yeast = Yeast()
+    yeast.from_json(yeast_content)
+    error_list : list[str] = []
+    parser = get_html_backend(html_backend).parse(page_content)
+    YeastScraper().parse_yeast_item_from_page(parser, yeast, error_list)
+    return yeast.to_json(), error_list